@@ -0,0 +1,101 @@
+from typing import NamedTuple, Optional
+
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from api.cache import membership_cache
+from api.models import Project, Contributor
+
+
+class ProjectAccess(NamedTuple):
+    """Access of the request user to a project, resolved once per request."""
+
+    project: Project
+    is_author: bool
+    role: Optional[str]
+
+    @property
+    def is_contributor(self):
+        """Is the user registered as a contributor of the project?"""
+        return self.role is not None
+
+    @property
+    def has_access(self):
+        """Can the user access the project and its issues/contributors/comments?"""
+        return self.is_author or self.is_contributor
+
+
+def get_access_cache(request):
+    """Returns the ProjectAccess already resolved for the request, by project pk."""
+
+    cache = getattr(request, "_project_access", None)
+    if cache is None:
+        cache = request._project_access = {}
+    return cache
+
+
+def get_project_access(request, project_pk):
+    """
+    Returns the ProjectAccess of the request user to the project.
+    The project is fetched with a query and the contributor role of the user is read from the membership cache, which
+    on a miss runs a second query, the union of the contributions and of the authored projects of the user. Both are
+    then stored on the request so that permissions, viewsets and serializers share the same result.
+    Raises Http404 if the project does not exist.
+    """
+
+    cache = get_access_cache(request)
+    project_pk = str(project_pk)
+    if project_pk not in cache:
+        project = get_object_or_404(Project, pk=project_pk)
+        cache[project_pk] = ProjectAccess(
+            project=project,
+            is_author=(project.author_user_id == request.user.pk),
+            role=membership_cache.get(request.user.pk).role(project.pk),
+        )
+    return cache[project_pk]
+
+
+async def aget_project_access(request, project_pk):
+    """
+    Async counterpart of get_project_access(), fetching the project and the memberships with the async ORM.
+    """
+
+    cache = get_access_cache(request)
+    project_pk = str(project_pk)
+    if project_pk not in cache:
+        try:
+            project = await Project.objects.aget(pk=project_pk)
+        except Project.DoesNotExist:
+            raise Http404
+        memberships = await membership_cache.aget(request.user.pk)
+        cache[project_pk] = ProjectAccess(
+            project=project,
+            is_author=(project.author_user_id == request.user.pk),
+            role=memberships.role(project.pk),
+        )
+    return cache[project_pk]
+
+
+def get_member_ids(project):
+    """Returns the ids of the author and of the contributors of a project, fetched with a single query."""
+
+    member_ids = set(Contributor.objects.filter(project=project).values_list("user_id", flat=True))
+    member_ids.add(project.author_user_id)
+    return member_ids
+
+
+def accessible_by(user_pk, project="project"):
+    """
+    Returns the filter of the objects whose project the user can access, as its author or one of its contributors,
+    evaluated by the database. project is the path of the project from the filtered model, None to filter projects.
+    The projects of the user are looked up by the indexes on Project.author_user and on Contributor.user, instead of
+    checking every project.
+    """
+
+    if project is None:
+        author, project_id = "author_user_id", "pk"
+    else:
+        author, project_id = f"{project}__author_user_id", f"{project}_id"
+    contributions = Contributor.objects.filter(user_id=user_pk).values("project_id")
+    return Q(**{author: user_pk}) | Q(**{f"{project_id}__in": contributions})
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+from api.database import configure_sqlite_connection
+from api.instrumentation import install_query_recorder
+from api.metrics import track_connection
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        # Registers the signal receivers
+        from api import signals  # noqa: F401
+
+        # Tunes the journaling, caching and locking of SQLite connections
+        connection_created.connect(configure_sqlite_connection)
+        # Measures the queries of sampled requests on every database connection
+        connection_created.connect(install_query_recorder)
+        # Keeps track of the database connections in the metrics
+        connection_created.connect(track_connection)
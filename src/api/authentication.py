@@ -0,0 +1,124 @@
+import time
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from api.cache import token_denylist
+from api.metrics import observe_authentication
+from api.models import CustomUser
+
+
+class ClaimsUser:
+    """
+    User authenticated by a JWT, built from the claims of the token without querying the database.
+    The CustomUser is only fetched, once, when an attribute which is not a claim of the token is read, e.g. the name
+    of the user.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    # The tokens of deactivated users are revoked by api.signals, whether they are saved or updated through the ORM
+    # (see CustomUserQuerySet). Users deactivated with raw SQL must have their tokens revoked with revoke_tokens.
+    is_active = True
+
+    # Attributes of CustomUser added to the tokens by MyTokenObtainPairSerializer
+    claims = ("email", "staff", "admin")
+
+    def __init__(self, token):
+        self.token = token
+        self.pk = self.user_id = token[api_settings.USER_ID_CLAIM]
+        self._user = None
+
+    def __getattr__(self, name):
+        # Only called for the attributes which are not set on the instance or its class
+        if name in self.claims and name in self.token:
+            return self.token[name]
+        return getattr(self.user, name)
+
+    def __str__(self):
+        return str(self.user)
+
+    @property
+    def user(self):
+        """The CustomUser, fetched on the first access."""
+        if self._user is None:
+            self._user = CustomUser.objects.get(pk=self.pk)
+        return self._user
+
+    @property
+    def is_staff(self):
+        """Is the user a member of staff?"""
+        return self.staff
+
+    @property
+    def is_admin(self):
+        """Is the user an admin member?"""
+        return self.admin
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    Stateless JWT authentication, which can also authenticate the requests of the async views. The user of the
+    request is a ClaimsUser built from the claims of the token, unless the token or the tokens of the user have been
+    revoked in the token denylist. The duration of the authentications is recorded in the metrics.
+    """
+
+    def authenticate(self, request):
+        """Authenticates the request, recording the duration of the authentication."""
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            result = super().authenticate(request)
+            outcome = "anonymous" if result is None else "authenticated"
+            return result
+        finally:
+            observe_authentication(outcome, time.perf_counter() - start)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate()."""
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            result = await self.aauthenticate_token(request)
+            outcome = "anonymous" if result is None else "authenticated"
+            return result
+        finally:
+            observe_authentication(outcome, time.perf_counter() - start)
+
+    async def aauthenticate_token(self, request):
+        """Async counterpart of the authenticate() of simplejwt."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        """Returns the ClaimsUser of a token which is not revoked."""
+        self.check_claims(validated_token)
+        if token_denylist.is_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return ClaimsUser(validated_token)
+
+    async def aget_user(self, validated_token):
+        """Async counterpart of get_user()."""
+        self.check_claims(validated_token)
+        if await token_denylist.ais_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return ClaimsUser(validated_token)
+
+    @staticmethod
+    def check_claims(validated_token):
+        """Raises InvalidToken if the token has no user id or no jti."""
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if api_settings.JTI_CLAIM not in validated_token:
+            raise InvalidToken(_("Token has no id"))
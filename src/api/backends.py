@@ -0,0 +1,51 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import _clean_credentials, backends, get_user_model, load_backend
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+
+UserModel = get_user_model()
+
+
+class ModelBackend(backends.ModelBackend):
+    """ModelBackend which can also authenticate users with the async ORM and the password hashing pool."""
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """Async counterpart of authenticate()."""
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget(**{UserModel.USERNAME_FIELD: username})
+        except UserModel.DoesNotExist:
+            # Hashes the password anyway, so that the response time does not tell whether the user exists
+            await UserModel().aset_password(password)
+            return None
+        if await user.acheck_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
+async def aauthenticate(request=None, **credentials):
+    """
+    Async counterpart of django.contrib.auth.authenticate(), awaiting the backends which support it and running the
+    other ones in a thread.
+    """
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        try:
+            if hasattr(backend, "aauthenticate"):
+                user = await backend.aauthenticate(request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is not None:
+            user.backend = backend_path
+            return user
+
+    await sync_to_async(user_login_failed.send)(
+        sender=__name__, credentials=_clean_credentials(credentials), request=request,
+    )
+    return None
@@ -0,0 +1,420 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import CharField, F, Q, Value
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.metrics import observe_cache_lookup
+from api.models import Project, Contributor, Issue, Comment
+
+
+class LRUCache(BaseCache):
+    """
+    In-process cache backend evicting the least recently used entries once MAX_ENTRIES is reached.
+    Unlike the locmem backend, reads refresh the position of an entry and eviction removes a single entry instead of
+    culling a fraction of the cache.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._set(key, value, timeout)
+                return True
+            return False
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                return default
+            self._cache.move_to_end(key)
+            return pickle.loads(self._cache[key][0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._set(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                return False
+            self._cache[key] = (self._cache[key][0], self.get_backend_timeout(timeout))
+            return True
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            return not self._has_expired(key)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    # Entries are in memory, so that the async methods do not need to run the sync ones in a thread
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.add(key, value, timeout, version)
+
+    async def aget(self, key, default=None, version=None):
+        return self.get(key, default, version)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.set(key, value, timeout, version)
+
+    async def atouch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.touch(key, timeout, version)
+
+    async def adelete(self, key, version=None):
+        return self.delete(key, version)
+
+    async def ahas_key(self, key, version=None):
+        return self.has_key(key, version)
+
+    async def aclear(self):
+        return self.clear()
+
+    def _set(self, key, value, timeout):
+        self._cache[key] = (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self.get_backend_timeout(timeout))
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def _has_expired(self, key):
+        """Returns True if the key is missing or expired. Expired keys are removed."""
+        if key not in self._cache:
+            return True
+        expiry = self._cache[key][1]
+        if expiry is not None and expiry <= time.time():
+            del self._cache[key]
+            return True
+        return False
+
+
+class Memberships(NamedTuple):
+    """Projects a user authors and contributor roles the user holds, indexed by project id."""
+
+    authored: frozenset
+    roles: dict
+
+    def role(self, project_id) -> Optional[str]:
+        """Returns the contributor role of the user in the project, None if the user is not a contributor."""
+        return self.roles.get(project_id)
+
+    def has_access(self, project_id) -> bool:
+        """Is the user author or contributor of the project?"""
+        return project_id in self.authored or project_id in self.roles
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Builds the memberships from (project id, role) rows, with a null role for the projects the user authors."""
+        authored, roles = set(), {}
+        for project_id, role in rows:
+            if role is None:
+                authored.add(project_id)
+            else:
+                roles[project_id] = role
+        return cls(authored=frozenset(authored), roles=roles)
+
+
+class MembershipCache:
+    """
+    Cross-request cache of the memberships of users, stored in the cache settings.MEMBERSHIP_CACHE_ALIAS.
+    The memberships of a user are loaded in a single query the first time they are needed, and invalidated by the
+    signals of api.signals whenever a Contributor or a Project of the user is saved or deleted.
+    """
+
+    key_prefix = "membership"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        """Cache backend storing the memberships."""
+        return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+    def key(self, user_id):
+        """Cache key of the memberships of a user."""
+        return f"{self.key_prefix}:{user_id}"
+
+    def get(self, user_id) -> Memberships:
+        """Returns the memberships of a user, loading them from the database on a cache miss."""
+        memberships = self.cache.get(self.key(user_id))
+        if memberships is not None:
+            self.hits += 1
+            observe_cache_lookup("membership", hit=True)
+            return memberships
+
+        self.misses += 1
+        observe_cache_lookup("membership", hit=False)
+        memberships = self.load(user_id)
+        self.cache.set(self.key(user_id), memberships)
+        return memberships
+
+    async def aget(self, user_id) -> Memberships:
+        """Async counterpart of get(), loading the memberships with the async ORM."""
+        memberships = await self.cache.aget(self.key(user_id))
+        if memberships is not None:
+            self.hits += 1
+            observe_cache_lookup("membership", hit=True)
+            return memberships
+
+        self.misses += 1
+        observe_cache_lookup("membership", hit=False)
+        memberships = await self.aload(user_id)
+        await self.cache.aset(self.key(user_id), memberships)
+        return memberships
+
+    def get_queryset(self, user_id):
+        """
+        Returns the (project id, role) rows of a user, with a null role for the projects the user authors.
+        They are read from the primary, so that memberships older than the last write are not cached from a replica.
+        """
+        contributions = Contributor.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id) \
+            .values_list("project_id", "role")
+        authorships = Project.objects.using(DEFAULT_DB_ALIAS).filter(author_user_id=user_id) \
+            .annotate(role=Value(None, output_field=CharField())) \
+            .values_list("project_id", "role")
+        return contributions.union(authorships, all=True)
+
+    def load(self, user_id) -> Memberships:
+        """Loads the projects authored by a user and the user's contributor roles in one query."""
+        return Memberships.from_rows(self.get_queryset(user_id))
+
+    async def aload(self, user_id) -> Memberships:
+        """Async counterpart of load()."""
+        # aiterator() of Django 4.1 runs the query of values_list() querysets in the event loop
+        return Memberships.from_rows([row async for row in self.get_queryset(user_id)])
+
+    def invalidate(self, user_id):
+        """Removes the cached memberships of a user."""
+        self.cache.delete(self.key(user_id))
+
+    def invalidate_on_commit(self, *user_ids):
+        """
+        Removes the cached memberships of users now, and again once the current transaction is committed, so that a
+        request reading them before the commit cannot keep them cached from the data preceding it.
+        """
+        keys = [self.key(user_id) for user_id in set(user_ids) if user_id is not None]
+        self.cache.delete_many(keys)
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+    def stats(self):
+        """Returns the hit and miss counters of the current process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+membership_cache = MembershipCache()
+
+
+class ResponseCache:
+    """
+    Cache of rendered responses, stored in the cache settings.RESPONSE_CACHE_ALIAS.
+    Keys contain the version of the project the response belongs to, so that any write in the project, which bumps
+    its version through the signals of api.signals, makes its cached responses unreachable until they expire or
+    are evicted.
+    """
+
+    key_prefix = "response"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @property
+    def cache(self):
+        """Cache backend storing the responses."""
+        return caches[settings.RESPONSE_CACHE_ALIAS]
+
+    def key(self, project, *parts):
+        """Cache key of a response of a project, identified by the given parts."""
+        digest = hashlib.md5("|".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+        return f"{self.key_prefix}:{project.pk}:{project.version}:{digest}"
+
+    def get(self, key):
+        """Returns the (content, content type) of a cached response, or None."""
+        return self.count(self.cache.get(key))
+
+    async def aget(self, key):
+        """Async counterpart of get()."""
+        return self.count(await self.cache.aget(key))
+
+    def count(self, cached):
+        """Counts the lookup of a cached response, None on a miss, and returns it."""
+        if cached is None:
+            self.misses += 1
+            observe_cache_lookup("response", hit=False)
+        else:
+            self.hits += 1
+            self.bytes_saved += len(cached[0])
+            observe_cache_lookup("response", hit=True, size=len(cached[0]))
+        return cached
+
+    def set(self, key, content, content_type):
+        """Caches the content of a response, unless it is larger than settings.RESPONSE_CACHE_MAX_ITEM_SIZE."""
+        if len(content) <= settings.RESPONSE_CACHE_MAX_ITEM_SIZE:
+            self.cache.set(key, (content, content_type))
+
+    async def aset(self, key, content, content_type):
+        """Async counterpart of set()."""
+        if len(content) <= settings.RESPONSE_CACHE_MAX_ITEM_SIZE:
+            await self.cache.aset(key, (content, content_type))
+
+    def stats(self):
+        """Returns the hit and miss counters and the bytes served from the cache by the current process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+response_cache = ResponseCache()
+
+
+class TokenDenylist:
+    """
+    Revoked JWTs, stored in the cache settings.TOKEN_DENYLIST_CACHE_ALIAS: single tokens by their jti, and all the
+    tokens of a user issued before a time. Entries expire with the last token they revoke, so that the denylist stays
+    small and can be checked on every request.
+    """
+
+    key_prefix = "denylist"
+
+    @property
+    def cache(self):
+        """Cache backend storing the revocations."""
+        return caches[settings.TOKEN_DENYLIST_CACHE_ALIAS]
+
+    def token_key(self, jti):
+        """Cache key of the revocation of a token."""
+        return f"{self.key_prefix}:token:{jti}"
+
+    def user_key(self, user_id):
+        """Cache key of the revocation of the tokens of a user."""
+        return f"{self.key_prefix}:user:{user_id}"
+
+    def keys(self, token):
+        """Cache keys of the revocations which can apply to a token."""
+        return [
+            self.token_key(token[jwt_settings.JTI_CLAIM]),
+            self.user_key(token[jwt_settings.USER_ID_CLAIM]),
+        ]
+
+    def revoke_token(self, token):
+        """Revokes a token until it expires."""
+        self.cache.set(self.token_key(token[jwt_settings.JTI_CLAIM]), True, max(token["exp"] - time.time(), 1))
+
+    def revoke_user(self, user_id):
+        """Revokes the access and refresh tokens of a user issued until now."""
+        lifetime = max(jwt_settings.ACCESS_TOKEN_LIFETIME, jwt_settings.REFRESH_TOKEN_LIFETIME)
+        # The "iat" claim is in seconds: tokens issued during the current second, e.g. on a login following a
+        # password change, stay valid
+        self.cache.set(self.user_key(user_id), int(time.time()), lifetime.total_seconds())
+
+    def is_revoked(self, token):
+        """Is the token, or are the tokens of its user, revoked?"""
+        return self.check(token, self.cache.get_many(self.keys(token)))
+
+    async def ais_revoked(self, token):
+        """Async counterpart of is_revoked()."""
+        return self.check(token, await self.cache.aget_many(self.keys(token)))
+
+    def check(self, token, revocations):
+        """Returns whether the revocations read from the cache apply to the token."""
+        token_key, user_key = self.keys(token)
+        revoked_at = revocations.get(user_key)
+        return token_key in revocations or (revoked_at is not None and token.get("iat", 0) < revoked_at)
+
+
+token_denylist = TokenDenylist()
+
+
+def bump_project_versions(*args, **filters):
+    """
+    Increments the version and updates the modification time of the projects matching the filters, with a single
+    query, so that the validators of conditional requests on these projects change.
+    """
+    Project.objects.filter(*args, **filters).update(version=F("version") + 1, modified_time=timezone.now())
+
+
+_pending_versions = threading.local()
+
+
+def bump_project_versions_on_commit(project_id=None, issue_id=None, user_id=None):
+    """
+    Bumps the version of a project, of the project of an issue, or of the projects whose responses can embed a user,
+    once the current transaction is committed.
+    All the projects written in a transaction, e.g. by a cascading deletion, are bumped by a single query.
+    Projects left pending by a rolled back transaction are bumped with the next committed ones, which is harmless.
+    """
+    if not hasattr(_pending_versions, "project_ids"):
+        _pending_versions.project_ids, _pending_versions.issue_ids, _pending_versions.user_ids = set(), set(), set()
+    if project_id is not None:
+        _pending_versions.project_ids.add(project_id)
+    if issue_id is not None:
+        _pending_versions.issue_ids.add(issue_id)
+    if user_id is not None:
+        _pending_versions.user_ids.add(user_id)
+    transaction.on_commit(flush_project_versions)
+
+
+def get_user_projects_filter(user_ids):
+    """
+    Returns the filter of the projects whose responses can embed the users (see serializers.UserSerializer): the
+    projects they author or contribute to, and the projects of the issues and comments they author or are assigned.
+    """
+    return (
+        Q(author_user__in=user_ids)
+        | Q(pk__in=Contributor.objects.filter(user__in=user_ids).values("project_id"))
+        | Q(pk__in=Issue.objects.filter(author_user__in=user_ids).values("project_id"))
+        | Q(pk__in=Issue.objects.filter(assignee_user__in=user_ids).values("project_id"))
+        | Q(pk__in=Comment.objects.filter(author_user__in=user_ids).values("issue__project_id"))
+    )
+
+
+def flush_project_versions():
+    """Bumps the versions of the projects pending in the current thread, if any."""
+    project_ids = getattr(_pending_versions, "project_ids", None)
+    issue_ids = getattr(_pending_versions, "issue_ids", None)
+    user_ids = getattr(_pending_versions, "user_ids", None)
+    if project_ids or issue_ids or user_ids:
+        _pending_versions.project_ids, _pending_versions.issue_ids, _pending_versions.user_ids = set(), set(), set()
+        projects = Q(pk__in=project_ids) | Q(issues__in=issue_ids)
+        if user_ids:
+            projects |= get_user_projects_filter(user_ids)
+        bump_project_versions(projects)
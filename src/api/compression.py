@@ -0,0 +1,81 @@
+"""
+Compression of the responses with the best encoding the client accepts: brotli, when the brotli package is installed,
+or gzip.
+"""
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Size of the compressed chunks of streamed responses, e.g. exports, whose records are much smaller: flushing the
+# compressor after each record would make the stream barely smaller than the records
+STREAM_BUFFER_SIZE = 16 * 1024
+
+
+def available_encodings():
+    """Returns the supported content codings, by order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def parse_accept_encoding(header):
+    """Returns the quality values of the content codings of an Accept-Encoding header, by coding."""
+    qualities = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+
+def negotiate_encoding(header):
+    """Returns the supported content coding the client prefers according to its Accept-Encoding header, or None."""
+    qualities = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(content, encoding):
+    """Returns the content compressed with the content coding."""
+    if encoding == "br":
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(content) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Generates the compressed chunks of a stream, flushed every STREAM_BUFFER_SIZE bytes of content."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, flush = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+
+    buffered = 0
+    for chunk in chunks:
+        compressed = process(chunk)
+        buffered += len(chunk)
+        if buffered >= STREAM_BUFFER_SIZE:
+            compressed += flush()
+            buffered = 0
+        if compressed:
+            yield compressed
+    yield finish()
@@ -0,0 +1,15 @@
+"""
+Configuration of the database connections.
+"""
+from django.conf import settings
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Receiver of connection_created running the SQLITE_PRAGMAS on every new SQLite connection, before its first query.
+    The pragmas are run on the underlying connection so that the instrumentation does not count them.
+    """
+    if connection.vendor != "sqlite":
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,72 @@
+import datetime
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.jsonlib import get_backend
+from api.models import Contributor, Issue, Comment
+
+
+# Fields exported for each record type, also expected by the import_tracker command
+EXPORT_FIELDS = {
+    "project": ["project_id", "title", "description", "type", "author_user_id"],
+    "contributor": ["id", "project_id", "user_id", "permission", "role"],
+    "issue": [
+        "issue_id",
+        "title",
+        "description",
+        "tag",
+        "priority",
+        "status",
+        "project_id",
+        "author_user_id",
+        "assignee_user_id",
+        "created_time",
+    ],
+    "comment": ["comment_id", "description", "issue_id", "author_user_id", "created_time"],
+}
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping the microseconds of datetimes, so that they can be given back as since parameter."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def ndjson_record(record_type, values):
+    """Returns a record as a line of NDJSON bytes, of the form {"type": record_type, "data": values}."""
+    return get_backend().dumps({"type": record_type, "data": values}, ExportJSONEncoder().default) + b"\n"
+
+
+def export_project(project, since=None):
+    """
+    Generates the NDJSON lines of a project, its contributors, issues and comments.
+    Rows are read with server-side cursors in chunks of settings.EXPORT_CHUNK_SIZE, so that memory stays flat
+    whatever the size of the project.
+    If since is given, only the issues and comments created after it are exported.
+    The rows are read from the database the project was read from, the replica of the request if it used one, as the
+    response is streamed after the request has been routed.
+    """
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    database = project._state.db
+
+    yield ndjson_record("project", {field: getattr(project, field) for field in EXPORT_FIELDS["project"]})
+
+    contributors = Contributor.objects.using(database).filter(project=project).order_by("id")
+    for values in contributors.values(*EXPORT_FIELDS["contributor"]).iterator(chunk_size=chunk_size):
+        yield ndjson_record("contributor", values)
+
+    issues = Issue.objects.using(database).filter(project=project).order_by("created_time", "issue_id")
+    comments = Comment.objects.using(database).filter(issue__project=project) \
+        .order_by("issue_id", "created_time", "comment_id")
+    if since is not None:
+        issues = issues.filter(created_time__gt=since)
+        comments = comments.filter(created_time__gt=since)
+
+    for values in issues.values(*EXPORT_FIELDS["issue"]).iterator(chunk_size=chunk_size):
+        yield ndjson_record("issue", values)
+    for values in comments.values(*EXPORT_FIELDS["comment"]).iterator(chunk_size=chunk_size):
+        yield ndjson_record("comment", values)
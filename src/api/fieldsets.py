@@ -0,0 +1,175 @@
+"""
+Sparse fieldsets and expandable relations.
+
+Clients choose the fields of the resources they read with the fields query parameter, e.g. ?fields=title,status, and
+embed related resources with the expand query parameter, e.g. ?expand=author. Dotted names reach the fields and the
+relations of the embedded resources, e.g. ?fields=title,issues.title&expand=issues.assignee.
+
+The serializers declare the relations they can embed as expandable_fields (see serializers.SparseFieldsMixin), and
+get_query_plan() derives from a serializer and the requested fields the columns to load with only() and the relations
+to select or prefetch, so that neither the unrequested columns nor the unrequested relations are fetched.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from django.db.models import Prefetch
+
+# Number of (serializer, requested fields) whose query plan is kept, the requested fields being chosen by clients
+PLAN_CACHE_SIZE = 1024
+
+
+class Expansion(NamedTuple):
+    """Relation a serializer can embed: the serializer of the related objects, the relation and its cardinality."""
+
+    serializer_class: type
+    source: str
+    many: bool = False
+
+    def build(self, field_name, selection=None):
+        """Returns the read-only nested serializer embedding the relation as field_name."""
+        kwargs = {} if self.source == field_name else {'source': self.source}
+        return self.serializer_class(many=self.many, read_only=True, selection=selection, **kwargs)
+
+
+class FieldSelection(NamedTuple):
+    """
+    Fields requested for a resource: the names of its fields, None for its default fields, the relations to embed
+    besides them, and the selections of the embedded resources, as sorted (relation, FieldSelection) pairs.
+    """
+
+    fields: Optional[frozenset] = None
+    expand: frozenset = frozenset()
+    nested: tuple = ()
+
+    def get_nested(self, relation):
+        """Returns the selection of the resources embedded as relation, or None for their default fields."""
+        return dict(self.nested).get(relation)
+
+
+def split_paths(value):
+    """Returns the dotted names of a comma separated query parameter as tuples of names."""
+    return [
+        tuple(part.strip() for part in item.split('.'))
+        for item in (value or '').split(',') if item.strip()
+    ]
+
+
+def build_selection(field_paths, expand_paths):
+    """Returns the FieldSelection of the paths of the fields (None for the default fields) and expand parameters."""
+    relations = {path[0] for path in (field_paths or []) + expand_paths if len(path) > 1}
+    nested = []
+    for relation in sorted(relations):
+        nested_fields = [path[1:] for path in field_paths or [] if len(path) > 1 and path[0] == relation]
+        nested_expand = [path[1:] for path in expand_paths if len(path) > 1 and path[0] == relation]
+        nested.append((relation, build_selection(nested_fields or None, nested_expand)))
+    return FieldSelection(
+        fields=None if field_paths is None else frozenset(path[0] for path in field_paths),
+        expand=frozenset(path[0] for path in expand_paths),
+        nested=tuple(nested),
+    )
+
+
+def parse_selection(fields=None, expand=None):
+    """
+    Returns the FieldSelection of the values of the fields and expand query parameters, or None if neither is given.
+    Naming a field of a relation requests the relation, e.g. fields=issues.title implies fields=issues.
+    """
+    field_paths, expand_paths = split_paths(fields) or None, split_paths(expand)
+    if field_paths is None and not expand_paths:
+        return None
+    return build_selection(field_paths, expand_paths)
+
+
+class QueryPlan(NamedTuple):
+    """
+    Columns and relations read by a serializer: the names to load with only(), None to load every column, and the
+    (relation, QueryPlan) of the relations to select and to prefetch.
+    """
+
+    model: type
+    columns: Optional[tuple]
+    select_related: tuple = ()
+    prefetch_related: tuple = ()
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_query_plan(serializer_class, selection=None, required=()):
+    """
+    Returns the QueryPlan of a serializer for the requested fields, loading the required columns as well.
+    The columns are only restricted for a selection, and when every field reads a column, an embedded relation or an
+    annotation of the queryset, as a property of the model may read any column.
+    Raises a ValidationError if the selection names fields the serializer does not have.
+    """
+    model = serializer_class.Meta.model
+    serializer = serializer_class(selection=selection)
+    concrete_fields = {field.attname for field in model._meta.concrete_fields}
+    columns = {model._meta.pk.attname, *required}
+    restricted = selection is not None
+    select_related, prefetch_related = [], []
+    for field in serializer._readable_fields:
+        expansion = serializer.expandable_fields.get(field.field_name)
+        nested_selection = None
+        if selection is not None:
+            # The relations embedded by a restricted serializer are restricted to their default fields at least
+            nested_selection = selection.get_nested(field.field_name) or FieldSelection()
+        if expansion is not None and expansion.many:
+            relation = model._meta.get_field(expansion.source)
+            # The related rows are attached to their object through their foreign key
+            plan = get_query_plan(expansion.serializer_class, nested_selection, (relation.field.attname,))
+            prefetch_related.append((expansion.source, plan))
+        elif expansion is not None:
+            columns.add(expansion.source)
+            select_related.append((expansion.source, get_query_plan(expansion.serializer_class, nested_selection)))
+        elif field.source in concrete_fields:
+            columns.add(field.source)
+        elif field.source == '*' or hasattr(model, field.source.split('.')[0]):
+            restricted = False
+    return QueryPlan(
+        model, tuple(sorted(columns)) if restricted else None, tuple(select_related), tuple(prefetch_related)
+    )
+
+
+def get_prefetch(lookup, plan):
+    """Returns the prefetch of a relation, with a queryset restricted by the plan unless it fetches everything."""
+    if plan.columns is None and not plan.select_related and not plan.prefetch_related:
+        return lookup
+    # Covering indexes of the restricted columns could otherwise return the related objects in another order
+    queryset = plan.model._default_manager.order_by(plan.model._meta.pk.name)
+    return Prefetch(lookup, queryset=apply_plan(queryset, plan))
+
+
+def get_lookups(plan, prefix=''):
+    """
+    Returns the columns to load with only() (None for every column), and the lookups to select and to prefetch, of a
+    plan and of the plans of its selected relations, whose names are prefixed with prefix.
+    """
+    columns = None if plan.columns is None else [prefix + column for column in plan.columns]
+    select_related = []
+    prefetch_related = [get_prefetch(prefix + lookup, nested) for lookup, nested in plan.prefetch_related]
+    for lookup, nested in plan.select_related:
+        nested_columns, nested_select, nested_prefetch = get_lookups(nested, f'{prefix}{lookup}__')
+        select_related += [prefix + lookup, *nested_select]
+        prefetch_related += nested_prefetch
+        if columns is not None and nested_columns is not None:
+            columns += nested_columns
+    return columns, select_related, prefetch_related
+
+
+def apply_plan(queryset, plan, extra_columns=()):
+    """Returns the queryset loading the columns of the plan and the extra ones, and fetching its relations."""
+    columns, select_related, prefetch_related = get_lookups(plan)
+    if columns is not None:
+        queryset = queryset.only(*columns, *extra_columns)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+def get_prefetch_lookups(plan):
+    """
+    Returns the lookups fetching the relations of the plan for objects already fetched, the relations to select
+    being prefetched instead.
+    """
+    return [get_prefetch(lookup, nested) for lookup, nested in plan.select_related + plan.prefetch_related]
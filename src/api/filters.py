@@ -0,0 +1,131 @@
+"""
+Filtering and ordering of the lists of issues through the query string.
+
+The issues of a project can only be filtered by the combinations of filters backed by an index of Issue, so that a
+filtered list never reads every issue of a project: the fields compared for equality must be, in any order, the
+columns of an index between the project and created_time, issue_id. The created_time range and the ordering are
+accepted with every combination, and read the issues in the order of the index, without sorting them, except for
+status__in, which reads the range of each status and sorts the issues of these ranges.
+"""
+from itertools import takewhile
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from api.models import Issue
+
+
+class StatusFilterSerializer(serializers.Serializer):
+    """Validates the query parameters filtering a list of issues by status and ordering it."""
+
+    status = serializers.ChoiceField(choices=Issue.Status.choices, required=False)
+    status__in = serializers.CharField(required=False, help_text="Comma separated statuses.")
+    ordering = serializers.ChoiceField(choices=['created_time', '-created_time'], required=False)
+
+    def validate_status__in(self, value):
+        statuses = [status.strip() for status in value.split(',') if status.strip()]
+        invalid = [status for status in statuses if status not in Issue.Status.values]
+        if not statuses or invalid:
+            raise serializers.ValidationError(
+                f"Expected comma separated statuses among {', '.join(Issue.Status.values)}."
+            )
+        return statuses
+
+    def validate(self, attrs):
+        if 'status' in attrs and 'status__in' in attrs:
+            raise serializers.ValidationError("Filter on either status or status__in.")
+        return attrs
+
+
+class IssueFilterSerializer(StatusFilterSerializer):
+    """Validates the query parameters filtering and ordering the list of issues of a project."""
+
+    priority = serializers.ChoiceField(choices=Issue.Priority.choices, required=False)
+    tag = serializers.ChoiceField(choices=Issue.Tag.choices, required=False)
+    assignee_user = serializers.IntegerField(min_value=1, required=False)
+    created_time__gte = serializers.DateTimeField(required=False)
+    created_time__lt = serializers.DateTimeField(required=False)
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Filters and orders the list of issues with the query parameters validated by IssueFilterSerializer, rejecting
+    with a 400 response the combinations of filters no index supports.
+    """
+
+    # Query parameters compared for equality, by the model field they filter
+    equality_fields = {
+        'status': ('status', 'status__in'),
+        'priority': ('priority',),
+        'tag': ('tag',),
+        'assignee_user': ('assignee_user',),
+    }
+    default_ordering = ('created_time', 'issue_id')
+    serializer_class = IssueFilterSerializer
+
+    @classmethod
+    def get_indexed_combinations(cls):
+        """
+        Returns the sets of fields compared for equality which are the columns of an index of Issue between the
+        project and created_time, so that the filtered issues are read in their order.
+        """
+        combinations = set()
+        for index in Issue._meta.indexes:
+            if index.fields[0] != 'project':
+                continue
+            leading = list(takewhile(lambda field: field in cls.equality_fields, index.fields[1:]))
+            if index.fields[len(leading) + 1:len(leading) + 3] == ['created_time', 'issue_id']:
+                combinations.add(frozenset(leading))
+        return combinations
+
+    def get_params(self, request):
+        """Returns the validated filtering and ordering query parameters."""
+        serializer = self.serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def filter_queryset(self, request, queryset, view):
+        if view.action != 'list':
+            return queryset
+
+        params = self.get_params(request)
+        fields = frozenset(
+            field for field, names in self.equality_fields.items() if any(name in params for name in names)
+        )
+        if fields not in self.get_indexed_combinations():
+            supported = sorted(
+                ' and '.join(sorted(combination)) for combination in self.get_indexed_combinations() if combination
+            )
+            raise ValidationError(
+                f"Filtering on {' and '.join(sorted(fields))} together is not supported. "
+                f"Supported filters: {', '.join(supported)}."
+            )
+
+        return self.filter_and_order(request, queryset, view, params)
+
+    def filter_and_order(self, request, queryset, view, params):
+        """Returns the queryset filtered by the validated query parameters, in the requested order."""
+        lookups = {name: value for name, value in params.items() if name != 'ordering'}
+        if 'assignee_user' in lookups:
+            lookups['assignee_user_id'] = lookups.pop('assignee_user')
+        return queryset.filter(**lookups).order_by(*self.get_ordering(request, queryset, view))
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Returns the ordering of the issues, also used by the cursor pagination. Issues created at the same time are
+        ordered by id.
+        """
+        ordering = request.query_params.get('ordering')
+        if ordering == '-created_time':
+            return tuple(f'-{field}' for field in self.default_ordering)
+        return self.default_ordering
+
+
+class UserIssueFilterBackend(IssueFilterBackend):
+    """Filters the issues of the request user by status, and orders them, with the query parameters."""
+
+    serializer_class = StatusFilterSerializer
+
+    def filter_queryset(self, request, queryset, view):
+        return self.filter_and_order(request, queryset, view, self.get_params(request))
@@ -0,0 +1,95 @@
+"""
+Password hashers whose cost is set in the settings, and the thread pool hashing passwords.
+
+Hashing a password is slow on purpose, and under a burst of logins it takes every core of the server. Passwords are
+hashed in a pool of settings.PASSWORD_HASHING_WORKERS threads, which bounds the cores used to hash at the same time
+so that the other requests are still served. PBKDF2 and scrypt, implemented by hashlib, and Argon2, implemented by
+argon2-cffi, release the GIL while hashing, so the threads of the pool hash in parallel.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 hasher running settings.PASSWORD_PBKDF2_ITERATIONS iterations."""
+
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt hasher whose CPU and memory cost is settings.PASSWORD_SCRYPT_WORK_FACTOR."""
+
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2 hasher running settings.PASSWORD_ARGON2_TIME_COST iterations over settings.PASSWORD_ARGON2_MEMORY_COST
+    KiB of memory. Needs the argon2-cffi package.
+    """
+
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+
+
+# Hashers by their name in settings.PASSWORD_HASHER
+HASHERS = {
+    "pbkdf2": PBKDF2PasswordHasher,
+    "scrypt": ScryptPasswordHasher,
+    "argon2": Argon2PasswordHasher,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_pool():
+    """Returns the thread pool hashing passwords, None if settings.PASSWORD_HASHING_WORKERS is 0."""
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return None
+    return ThreadPoolExecutor(settings.PASSWORD_HASHING_WORKERS, thread_name_prefix="password-hashing")
+
+
+def run_in_pool(func, *args):
+    """Runs func in the password hashing pool and waits for its result."""
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+    return pool.submit(func, *args).result()
+
+
+async def arun_in_pool(func, *args):
+    """Async counterpart of run_in_pool(), which does not block the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), func, *args)
+
+
+def check_password(password, encoded):
+    """
+    Returns whether the password matches the encoded one, and whether the encoded password must be hashed again,
+    because it was hashed by another hasher than the preferred one or with another cost.
+    """
+    must_update = []
+    is_correct = hashers.check_password(password, encoded, setter=must_update.append)
+    return is_correct, bool(must_update)
+
+
+def hash_password(password):
+    """Hashes a password with the preferred hasher, in the password hashing pool."""
+    return run_in_pool(hashers.make_password, password)
+
+
+async def ahash_password(password):
+    """Async counterpart of hash_password()."""
+    return await arun_in_pool(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """Runs check_password() in the password hashing pool."""
+    return run_in_pool(check_password, password, encoded)
+
+
+async def averify_password(password, encoded):
+    """Async counterpart of verify_password()."""
+    return await arun_in_pool(check_password, password, encoded)
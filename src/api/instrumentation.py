@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestMetrics:
+    """
+    Measures of a request: its number of SQL queries and the time spent in the database. Detailed measures, taken for
+    sampled requests, also keep the SQL statements and the time spent in the named stages timed by timed() (e.g.
+    "serialize" and "render").
+    """
+
+    def __init__(self, detailed=True):
+        self.detailed = detailed
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.queries = Counter()
+        self.timings = Counter()
+        self.active_timers = set()
+
+    @property
+    def elapsed(self):
+        """Seconds since the beginning of the request."""
+        return time.perf_counter() - self.start
+
+    def repeated_queries(self, threshold):
+        """Returns the SQL statements run at least threshold times, with their count."""
+        return {sql: count for sql, count in self.queries.items() if count >= threshold}
+
+
+_current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def get_current_metrics() -> Optional[RequestMetrics]:
+    """Returns the measures of the current request, None if it is not measured."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def measure_request(detailed=True):
+    """Measures the requests handled in the context, and yields their RequestMetrics."""
+    metrics = RequestMetrics(detailed)
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """
+    Adds the time spent in the context to the named stage of the current request, if it is measured in detail.
+    Nested contexts of the same stage, e.g. the serializers of a nested serializer, are counted once.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None or not metrics.detailed or name in metrics.active_timers:
+        yield
+        return
+
+    metrics.active_timers.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - start
+        metrics.active_timers.discard(name)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting and timing the queries of measured requests."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.query_count += 1
+        if metrics.detailed:
+            metrics.queries[sql] += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Receiver of connection_created installing record_query on every database connection, including the ones the
+    async ORM opens in other threads.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
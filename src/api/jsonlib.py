@@ -0,0 +1,93 @@
+"""
+JSON encoding and decoding with the fastest available library: orjson or ujson when installed, the json module of the
+standard library otherwise. settings.API_JSON_BACKEND chooses one of them, or the first available one with "auto".
+
+Every backend encodes to compact UTF-8 bytes and calls a default function for the objects it does not support, so
+that the renderers and the exports give the same JSON whatever the backend. orjson is told to pass the datetimes to
+the default function as well, which formats them as the serializers and the exports expect.
+"""
+import json
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class JSONBackend(NamedTuple):
+    """
+    JSON library: dumps(obj, default) returns compact UTF-8 bytes, loads(bytes) the decoded object. Both raise
+    ValueError or TypeError on invalid input.
+    """
+
+    name: str
+    dumps: Callable
+    loads: Callable
+
+
+def get_orjson():
+    import orjson
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj, default):
+        return orjson.dumps(obj, default=default, option=options)
+
+    return JSONBackend("orjson", dumps, orjson.loads)
+
+
+def get_ujson():
+    import ujson
+
+    def dumps(obj, default):
+        return ujson.dumps(obj, default=default, ensure_ascii=False, escape_forward_slashes=False).encode()
+
+    return JSONBackend("ujson", dumps, ujson.loads)
+
+
+def get_stdlib_json():
+    def dumps(obj, default):
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+    return JSONBackend("json", dumps, json.loads)
+
+
+BACKENDS = {
+    "orjson": get_orjson,
+    "ujson": get_ujson,
+    "json": get_stdlib_json,
+}
+
+
+@lru_cache(maxsize=None)
+def load_backend(name):
+    """Returns the JSON backend of a name of BACKENDS or "auto", raising ImproperlyConfigured if it is not installed."""
+    if name == "auto":
+        for get_backend in BACKENDS.values():
+            try:
+                return get_backend()
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ImproperlyConfigured(f"Unknown API_JSON_BACKEND {name!r}, expected auto or one of {', '.join(BACKENDS)}.")
+    try:
+        return BACKENDS[name]()
+    except ImportError as error:
+        raise ImproperlyConfigured(f"The {name} JSON backend is not installed: {error}")
+
+
+def available_backends():
+    """Returns the names of the installed JSON backends."""
+    names = []
+    for name, get_backend in BACKENDS.items():
+        try:
+            get_backend()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend():
+    """Returns the JSON backend of settings.API_JSON_BACKEND."""
+    return load_backend(settings.API_JSON_BACKEND)
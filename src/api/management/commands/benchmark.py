@@ -0,0 +1,94 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+import benchmarks
+from benchmarks import data, runner
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(benchmarks.__file__), "baseline.json")
+
+
+class Command(BaseCommand):
+    """Command running the benchmark of every endpoint on generated data and comparing it with a baseline."""
+
+    help = (
+        "Generates deterministic data in a test database, requests every endpoint with the test client and reports "
+        "latency percentiles, requests per second and queries per request. Fails if a scenario runs more queries or "
+        "is slower than in the baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(data.SCALES), default="tiny", help="Size of the generated data.")
+        parser.add_argument("--issues", type=int, help="Number of issues, overriding the one of the scale.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the data generator.")
+        parser.add_argument("--iterations", type=int, default=50, help="Number of requests of each scenario.")
+        parser.add_argument(
+            "--scenario", action="append", choices=[scenario.name for scenario in runner.SCENARIOS],
+            help="Scenario to run, can be repeated. All of them by default.",
+        )
+        parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare the results with.")
+        parser.add_argument("--update-baseline", action="store_true", help="Store the results as the baseline.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Accepted increase of the p95 latency over the baseline, 0.25 for 25%%.",
+        )
+        parser.add_argument(
+            "--min-delta", type=float, default=2.0,
+            help="Accepted increase of the p95 latency over the baseline in milliseconds, whatever the tolerance.",
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true", help="Keep the test database and its data for the next runs.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive.")
+        scale = options["scale"]
+        sizes = dict(data.SCALES[scale])
+        if options["issues"] is not None:
+            sizes["issues"] = options["issues"]
+            scale = f"{scale}-{options['issues']}"
+
+        baseline = runner.read_baseline(options["baseline"])
+        if baseline is not None and not options["update_baseline"] and baseline["scale"] != scale:
+            raise CommandError(f"The baseline was measured at the {baseline['scale']} scale, not {scale}.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=options["verbosity"], interactive=False, keepdb=options["keepdb"])
+        try:
+            dataset = data.load() if options["keepdb"] else None
+            if dataset is None:
+                self.stdout.write(f"Generating the {scale} dataset...")
+                dataset = data.generate(sizes, seed=options["seed"], stdout=self.stdout)
+            results = runner.run(dataset, options["iterations"], options["scenario"])
+        except runner.BenchmarkFailure as error:
+            raise CommandError(str(error))
+        finally:
+            teardown_databases(old_config, verbosity=options["verbosity"], keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{'scenario':22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:22} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f} "
+                f"{result['rps']:>8.1f} {result['queries']:>8.1f}"
+            )
+
+        if options["update_baseline"]:
+            runner.write_baseline(options["baseline"], scale, options["iterations"], results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}."))
+            return
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f"No baseline in {options['baseline']} to compare with."))
+            return
+
+        regressions = runner.compare(results, baseline["results"], options["tolerance"], options["min_delta"])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f"{len(regressions)} regressions against the baseline.")
+        self.stdout.write(self.style.SUCCESS("No regression against the baseline."))
@@ -0,0 +1,78 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import hashers
+
+PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+    """Command measuring the number of password checks, the cost of a login, per core and per second."""
+
+    help = (
+        "Measures the logins per core per second of each password hasher with its configured cost, then the logins "
+        "per second of a burst of concurrent logins checked by the password hashing pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher", action="append", choices=list(hashers.HASHERS),
+            help="Hasher to measure, can be repeated. All the available ones by default.",
+        )
+        parser.add_argument("--logins", type=int, default=20, help="Number of logins of each measure.")
+        parser.add_argument(
+            "--clients", type=int, default=16, help="Number of concurrent logins of the burst, e.g. server threads.",
+        )
+
+    def handle(self, *args, **options):
+        if options["logins"] < 1 or options["clients"] < 1:
+            raise CommandError("--logins and --clients must be positive.")
+
+        workers = settings.PASSWORD_HASHING_WORKERS
+        cores = min(workers or options["clients"], os.cpu_count() or 1)
+        self.stdout.write(
+            f"{os.cpu_count()} cores, {workers} hashing threads, {options['clients']} concurrent logins"
+        )
+        self.stdout.write(
+            f"{'hasher':8} {'cost':>30} {'ms/login':>9} {'logins/s/core':>14} {'burst logins/s':>15}"
+        )
+        for name in options["hasher"] or hashers.HASHERS:
+            hasher = hashers.HASHERS[name]()
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as error:
+                self.stdout.write(f"{name:8} skipped: {error}")
+                continue
+
+            start = time.perf_counter()
+            for _ in range(options["logins"]):
+                hashers.check_password(PASSWORD, encoded)
+            per_login = (time.perf_counter() - start) / options["logins"]
+
+            with ThreadPoolExecutor(options["clients"]) as clients:
+                start = time.perf_counter()
+                futures = [
+                    clients.submit(hashers.verify_password, PASSWORD, encoded) for _ in range(options["logins"])
+                ]
+                for future in futures:
+                    future.result()
+                burst = options["logins"] / (time.perf_counter() - start)
+
+            self.stdout.write(
+                f"{name:8} {self.describe_cost(hasher):>30} {per_login * 1000:>9.1f} {1 / per_login:>14.1f} "
+                f"{burst:>15.1f}"
+            )
+        self.stdout.write(f"The burst uses at most {cores} cores.")
+
+    @staticmethod
+    def describe_cost(hasher):
+        """Returns the cost parameters of a hasher."""
+        return ", ".join(
+            f"{attribute}={getattr(hasher, attribute)}"
+            for attribute in ("iterations", "work_factor", "time_cost", "memory_cost")
+            if hasattr(hasher, attribute)
+        )
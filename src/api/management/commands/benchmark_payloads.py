@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.compression import available_encodings
+from api.jsonlib import available_backends
+from benchmarks import data
+
+
+class Command(BaseCommand):
+    """Command comparing the size and the CPU cost of the large responses by JSON backend and content coding."""
+
+    help = (
+        "Generates data in a test database, then requests the detail of a project with its issues and the export of "
+        "the project with each installed JSON backend and each content coding. Reports the bytes on the wire and the "
+        "CPU time per response, and fails if the backends give different JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(data.SCALES), default="tiny", help="Size of the generated data.")
+        parser.add_argument("--iterations", type=int, default=20, help="Number of requests of each case.")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            dataset = data.generate(options["scale"])
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(dataset.user).access_token}")
+            paths = {
+                "project-detail": f"/projects/{dataset.project.pk}/",
+                "project-export": f"/projects/{dataset.project.pk}/export/",
+            }
+            encodings = ["identity", *reversed(available_encodings())]
+
+            self.stdout.write(f"{'case':16} {'backend':8} {'encoding':9} {'bytes':>10} {'cpu ms':>8}")
+            for name, path in paths.items():
+                rendered = {}
+                for backend in available_backends():
+                    with override_settings(API_JSON_BACKEND=backend):
+                        for encoding in encodings:
+                            size, cpu, content = self.measure(client, path, encoding, options["iterations"])
+                            if encoding == "identity":
+                                rendered[backend] = content
+                            self.stdout.write(f"{name:16} {backend:8} {encoding:9} {size:>10} {cpu * 1000:>8.2f}")
+                if len(set(rendered.values())) > 1:
+                    raise CommandError(f"{name}: the JSON backends render different JSON.")
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    @staticmethod
+    def measure(client, path, encoding, iterations):
+        """
+        Returns the size of the response body, the mean CPU time to produce it, and the body, requesting the path
+        with an Accept-Encoding header of the content coding.
+        """
+        start = time.process_time()
+        for _ in range(iterations):
+            response = client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+            if response.status_code != 200:
+                raise CommandError(f"GET {path} returned {response.status_code}.")
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+        if response.get("Content-Encoding", "identity") != encoding:
+            raise CommandError(f"GET {path} was not encoded with {encoding}.")
+        return len(content), (time.process_time() - start) / iterations, content
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.renderers import JSONRenderer
+
+from api import serializers
+from api.models import Comment, Contributor, Issue, Project
+from benchmarks import data
+
+
+def get_cases(dataset, rows):
+    """Returns the (name, serializer class, queryset, many) serialized by the benchmark."""
+    issues = Issue.objects.order_by("created_time", "issue_id")
+    return [
+        ("issue-list", serializers.IssueListSerializer, issues[:rows], True),
+        ("me-issues", serializers.UserIssueSerializer, issues[:rows], True),
+        ("comment-list", serializers.CommentListSerializer, Comment.objects.order_by("comment_id")[:rows], True),
+        ("contributor-list", serializers.ContributorListSerializer, Contributor.objects.order_by("id")[:rows], True),
+        ("project-list", serializers.ProjectListSerializer, Project.objects.order_by("project_id")[:rows], True),
+        (
+            "project-detail", serializers.ProjectDetailSerializer,
+            Project.objects.filter(pk=dataset.project.pk).prefetch_related("issues", "contributors"), False,
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    """Command comparing the list serializers with and without their fast path."""
+
+    help = (
+        "Generates data in a test database, then serializes and renders pages of issues, comments, contributors and "
+        "projects, and a project with its issues, with the serializers and with the fast path of "
+        "FastListSerializer. Reports the time per page of each and fails if their JSON differs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(data.SCALES), default="tiny", help="Size of the generated data.")
+        parser.add_argument("--rows", type=int, default=100, help="Number of rows of each page.")
+        parser.add_argument("--iterations", type=int, default=20, help="Number of serializations of each page.")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["iterations"] < 1:
+            raise CommandError("--rows and --iterations must be positive.")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            dataset = data.generate(options["scale"])
+            self.stdout.write(f"{'case':18} {'serializer ms':>14} {'fast ms':>8} {'speedup':>8}")
+            for name, serializer_class, queryset, many in get_cases(dataset, options["rows"]):
+                with override_settings(API_FAST_LIST_SERIALIZERS=False):
+                    slow, slow_json = self.measure(serializer_class, queryset, many, options["iterations"])
+                with override_settings(API_FAST_LIST_SERIALIZERS=True):
+                    fast, fast_json = self.measure(serializer_class, queryset, many, options["iterations"])
+                if fast_json != slow_json:
+                    raise CommandError(f"{name}: the fast path renders another JSON than the serializer.")
+                self.stdout.write(f"{name:18} {slow * 1000:>14.2f} {fast * 1000:>8.2f} {slow / fast:>7.1f}x")
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    @staticmethod
+    def measure(serializer_class, queryset, many, iterations):
+        """
+        Returns the mean time to fetch, serialize and render the queryset, with rows fetched by values() when the
+        fast path supports the serializer, and the rendered JSON.
+        """
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if many:
+                fields = serializers.get_values_fields(serializer_class)
+                rows = queryset.values(*fields) if fields else queryset.all()
+                serialized = serializer_class(list(rows), many=True).data
+            else:
+                serialized = serializer_class(queryset.all()[0]).data
+            rendered = JSONRenderer().render(serialized)
+        return (time.perf_counter() - start) / iterations, rendered
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from benchmarks import data, runner
+
+# Small dataset, the benchmark measures the contention between the writers rather than the size of the tables
+SIZES = {"users": 10, "projects": 2, "contributors_per_project": 3, "issues": 200, "comments_per_issue": 1}
+
+
+class Command(BaseCommand):
+    """Command measuring the throughput of concurrent writers with and without the tuning of the database profile."""
+
+    help = (
+        "Creates issues and comments from concurrent threads through the API in a test database, first with the "
+        "default settings of the database (no SQLite pragmas, a connection per request), then with the configured "
+        "profile, and reports the writes per second, the latency percentiles and the failed writes of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Number of concurrent writing threads.")
+        parser.add_argument("--writes", type=int, default=50, help="Number of writes of each writer.")
+
+    def handle(self, *args, **options):
+        if options["writers"] < 1 or options["writes"] < 1:
+            raise CommandError("--writers and --writes must be positive.")
+
+        self.stdout.write(
+            f"{connection.vendor}, {options['writers']} writers of {options['writes']} issues and comments each"
+        )
+        self.stdout.write(
+            f"{'profile':10} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'failed':>7}"
+        )
+        default_profile = {"SQLITE_PRAGMAS": {}, "CONN_MAX_AGE": 0}
+        configured_profile = {
+            "SQLITE_PRAGMAS": settings.SQLITE_PRAGMAS, "CONN_MAX_AGE": connection.settings_dict["CONN_MAX_AGE"],
+        }
+        for name, profile in (("default", default_profile), ("configured", configured_profile)):
+            result = self.run_profile(profile, options["writers"], options["writes"])
+            self.stdout.write(
+                f"{name:10} {result['wps']:>9.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f} "
+                f"{result['failed']:>7}"
+            )
+
+    def run_profile(self, profile, writers, writes):
+        """Runs the writers on a new test database set up with the profile, and returns their statistics."""
+        with tempfile.TemporaryDirectory() as directory, override_settings(SQLITE_PRAGMAS=profile["SQLITE_PRAGMAS"]):
+            settings_dict = connection.settings_dict
+            old_max_age, old_test_name = settings_dict["CONN_MAX_AGE"], settings_dict["TEST"]["NAME"]
+            settings_dict["CONN_MAX_AGE"] = profile["CONN_MAX_AGE"]
+            if connection.vendor == "sqlite":
+                # In-memory databases are shared by the threads through a single cache, not through the journal
+                settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark.sqlite3")
+
+            setup_test_environment()
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                dataset = data.generate(SIZES)
+                token = str(RefreshToken.for_user(dataset.user).access_token)
+                start = time.perf_counter()
+                with ThreadPoolExecutor(writers) as pool:
+                    results = list(pool.map(lambda writer: self.write(dataset, token, writer, writes), range(writers)))
+                elapsed = time.perf_counter() - start
+            finally:
+                connections.close_all()
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+                settings_dict["CONN_MAX_AGE"], settings_dict["TEST"]["NAME"] = old_max_age, old_test_name
+
+        latencies = [latency for writer_latencies, _ in results for latency in writer_latencies]
+        failed = sum(writer_failed for _, writer_failed in results)
+        return {
+            "wps": len(latencies) / elapsed,
+            "p50": runner.percentile(latencies, 50) if latencies else 0,
+            "p95": runner.percentile(latencies, 95) if latencies else 0,
+            "p99": runner.percentile(latencies, 99) if latencies else 0,
+            "failed": failed,
+        }
+
+    @staticmethod
+    def write(dataset, token, writer, writes):
+        """
+        Creates issues of the dataset project, and comments on each of them, from the current thread. Returns the
+        latencies of the successful writes and the number of failed ones.
+        """
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        issues_path = f"/projects/{dataset.project.pk}/issues/"
+        latencies, failed, issue_id = [], 0, None
+        try:
+            for index in range(writes):
+                if index % 2 == 0 or issue_id is None:
+                    path, payload = issues_path, runner.issue_payload(dataset, writer * writes + index, None)
+                else:
+                    path, payload = f"{issues_path}{issue_id}/comments/", {"description": f"Comment {index}"}
+                start = time.perf_counter()
+                response = client.post(path, payload, format="json")
+                if response.status_code != 201:
+                    failed += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if path == issues_path:
+                    issue_id = response.json()["issue_id"]
+        finally:
+            connections.close_all()
+        return latencies, failed
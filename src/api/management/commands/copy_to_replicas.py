@@ -0,0 +1,32 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """Command copying the SQLite primary database to its replicas, standing in for replication on a local setup."""
+
+    help = (
+        "Copies the SQLite database of the default alias to the files of the replicas of settings.DATABASE_REPLICAS "
+        "with the online backup API. Run it again to bring the replicas up to date."
+    )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite":
+            raise CommandError("Only SQLite replicas can be copied, other databases replicate themselves.")
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replica configured, set DATABASE_REPLICAS.")
+
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            path = connections[alias].settings_dict["NAME"]
+            replica = sqlite3.connect(path)
+            try:
+                primary.connection.backup(replica)
+            finally:
+                replica.close()
+            self.stdout.write(f"Copied {primary.settings_dict['NAME']} to {alias} ({path}).")
@@ -0,0 +1,153 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from api import views
+from api.cache import membership_cache
+from api.filters import IssueFilterBackend
+from api.models import Comment, Contributor, CustomUser, Issue
+
+
+# (route name, viewset, action) of the endpoints whose querysets are explained
+ENDPOINTS = [
+    ("project-list", views.ProjectViewset, "list"),
+    ("project-detail", views.ProjectViewset, "retrieve"),
+    ("project-users-list", views.ContributorViewset, "list"),
+    ("project-users-detail", views.ContributorViewset, "retrieve"),
+    ("project-issues-list", views.IssueViewset, "list"),
+    ("project-issues-detail", views.IssueViewset, "retrieve"),
+    ("issue-comments-list", views.CommentViewset, "list"),
+    ("issue-comments-detail", views.CommentViewset, "retrieve"),
+    ("me-issues-list", views.UserIssueViewset, "list"),
+]
+
+# Values of the query parameters filtering the lists of issues, each indexed combination of filters being explained
+# with a created_time range in descending order
+ISSUE_FILTERS = {
+    "status": Issue.Status.TO_DO,
+    "priority": Issue.Priority.HIGH,
+    "tag": Issue.Tag.BUG,
+    "created_time__gte": "2022-01-01T00:00:00Z",
+    "ordering": "-created_time",
+}
+
+# Endpoints expected to read a whole table, with the reason why
+FULL_SCAN_ALLOWED = {}
+
+# Lines of a query plan revealing a full table scan, by database vendor
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?!CONSTANT ROW)(\w+)"),
+    "postgresql": re.compile(r"\bSeq Scan on (\w+)"),
+}
+
+
+class Command(BaseCommand):
+    """Command running EXPLAIN on the querysets of each endpoint and failing on full table scans."""
+
+    help = "Runs EXPLAIN on the querysets of each endpoint and fails when one falls back to a full table scan."
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Query plans of the {connection.vendor} database are not supported.")
+
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Small tables are sequentially scanned even when an index exists
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            sample = self.get_sample_kwargs()
+            user = CustomUser(pk=sample["user_pk"])
+            querysets = [("membership", membership_cache.get_queryset(user.pk))]
+            for name, viewset, action in ENDPOINTS:
+                querysets += [(name, queryset) for queryset in self.get_querysets(viewset, action, sample, user)]
+            querysets += self.get_filtered_issue_querysets(sample, user)
+
+            for name, queryset in querysets:
+                plan = queryset.explain()
+                scanned_tables = pattern.findall(plan)
+                if not scanned_tables:
+                    status = self.style.SUCCESS("OK")
+                elif name in FULL_SCAN_ALLOWED:
+                    status = self.style.WARNING(f"FULL SCAN of {', '.join(scanned_tables)} ({FULL_SCAN_ALLOWED[name]})")
+                else:
+                    status = self.style.ERROR(f"FULL SCAN of {', '.join(scanned_tables)}")
+                    failures.append(name)
+
+                self.stdout.write(f"{name}: {status}")
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"  {queryset.query}")
+                    self.stdout.write("\n".join(f"  | {line}" for line in plan.splitlines()))
+
+        if failures:
+            raise CommandError(f"Full table scans in: {', '.join(sorted(set(failures)))}")
+
+    @staticmethod
+    def get_sample_kwargs():
+        """Returns ids of existing objects to explain the querysets with, or placeholder ids on an empty database."""
+        sample = {"user_pk": 1, "project_pk": 1, "issue_pk": 1, "contributor_pk": 1, "comment_pk": 1}
+        comment = Comment.objects.select_related("issue").order_by().first()
+        issue = comment.issue if comment else Issue.objects.order_by().first()
+        contributor = Contributor.objects.order_by().first()
+        if issue:
+            sample.update(user_pk=issue.author_user_id, project_pk=issue.project_id, issue_pk=issue.pk)
+        if comment:
+            sample.update(comment_pk=comment.pk)
+        if contributor:
+            sample.update(contributor_pk=contributor.pk)
+        return sample
+
+    @staticmethod
+    def get_querysets(viewset, action, sample, user):
+        """Returns the querysets run by an action of a viewset, as the first page of its cursor pagination if any."""
+        pk = {
+            views.ProjectViewset: sample["project_pk"],
+            views.ContributorViewset: sample["contributor_pk"],
+            views.IssueViewset: sample["issue_pk"],
+            views.CommentViewset: sample["comment_pk"],
+        }.get(viewset)
+        kwargs = {"project_pk": sample["project_pk"], "issue_pk": sample["issue_pk"]}
+        if action == "retrieve":
+            kwargs["pk"] = pk
+
+        request = Request(RequestFactory().get("/"))
+        request.user = user
+        view = viewset(action=action, kwargs=kwargs, request=request, format_kwarg=None)
+        queryset = view.get_queryset()
+
+        if action == "list":
+            paginator = getattr(view.pagination_class, "cursor_pagination_class", view.pagination_class)()
+            if hasattr(paginator, "slice_page"):
+                queryset = queryset.order_by(*paginator.ordering)
+                queryset = paginator.slice_page(queryset, 0, paginator.page_size + 1, view)
+            return [queryset]
+
+        querysets = [queryset.filter(pk=pk)]
+        for lookup, _ in view.get_query_plan().prefetch_related:
+            relation = queryset.model._meta.get_field(lookup)
+            querysets.append(relation.related_model._default_manager.filter(**{relation.field.name: pk}))
+        return querysets
+
+    @staticmethod
+    def get_filtered_issue_querysets(sample, user):
+        """Returns the querysets of the lists of issues filtered by each combination IssueFilterBackend accepts."""
+        querysets = []
+        for combination in sorted(IssueFilterBackend.get_indexed_combinations(), key=sorted):
+            params = {**ISSUE_FILTERS, "assignee_user": sample["user_pk"]}
+            params = {
+                name: value for name, value in params.items()
+                if name not in IssueFilterBackend.equality_fields or name in combination
+            }
+            request = Request(RequestFactory().get("/", params))
+            request.user = user
+            view = views.IssueViewset(
+                action="list", kwargs={"project_pk": sample["project_pk"]}, request=request, format_kwarg=None,
+            )
+            name = f"project-issues-list?{'&'.join(sorted(combination)) or 'created_time'}"
+            querysets.append((name, view.filter_queryset(view.get_queryset())))
+        return querysets
@@ -0,0 +1,303 @@
+import csv
+import json
+import os
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.cache import membership_cache, bump_project_versions_on_commit
+from api.export import EXPORT_FIELDS
+from api.models import Comment, Contributor, CustomUser, ExternalReference, Issue, Project
+
+
+# For each kind of record: the model, the field holding the external id and the fields referencing other kinds
+KINDS = {
+    "user": {"model": CustomUser, "id": "user_id", "references": {}},
+    "project": {"model": Project, "id": "project_id", "references": {"author_user_id": "user"}},
+    "contributor": {"model": Contributor, "id": "id", "references": {"project_id": "project", "user_id": "user"}},
+    "issue": {
+        "model": Issue,
+        "id": "issue_id",
+        "references": {"project_id": "project", "author_user_id": "user", "assignee_user_id": "user"},
+    },
+    "comment": {"model": Comment, "id": "comment_id", "references": {"issue_id": "issue", "author_user_id": "user"}},
+}
+
+USER_FIELDS = ["user_id", "email", "first_name", "last_name"]
+
+
+class Command(BaseCommand):
+    """Command importing users, projects, contributors, issues and comments from another tracker."""
+
+    help = (
+        "Imports users, projects, contributors, issues and comments from an NDJSON file of {\"type\", \"data\"} "
+        "records (as produced by /projects/:project_id/export/) or from a CSV file of a single kind of records. "
+        "The file is streamed, inserted in batches and chunked transactions, and the import resumes from its "
+        "checkpoint when run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON or CSV file to import.")
+        parser.add_argument(
+            "--format", choices=["ndjson", "csv"], help="Format of the file, guessed from its extension by default."
+        )
+        parser.add_argument("--kind", choices=list(KINDS), help="Kind of the records of a CSV file.")
+        parser.add_argument("--source", default="default", help="Name of the tracker the external ids belong to.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows inserted by a single query.")
+        parser.add_argument("--chunk-size", type=int, default=10000, help="Number of rows imported per transaction.")
+        parser.add_argument("--checkpoint", help="Checkpoint file, <path>.checkpoint by default.")
+        parser.add_argument(
+            "--existing-users",
+            action="store_true",
+            help="Use the user ids which are not part of the import as ids of existing users.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        if file_format == "csv" and options["kind"] is None:
+            raise CommandError("--kind is required to import a CSV file.")
+        if options["batch_size"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--batch-size and --chunk-size must be positive.")
+
+        self.source = options["source"]
+        self.existing_users = options["existing_users"]
+        self.batch_size = options["batch_size"]
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+        checkpoint = self.read_checkpoint(checkpoint_path)
+        if checkpoint["offset"]:
+            self.stdout.write(f"Resuming from byte {checkpoint['offset']} ({checkpoint['records']} records read).")
+
+        start = time.monotonic()
+        rows, skipped = 0, 0
+        with open(path, "rb") as file:
+            if file_format == "csv":
+                records = self.read_csv(file, checkpoint["offset"], options["kind"])
+            else:
+                records = self.read_ndjson(file, checkpoint["offset"])
+            batches = self.read_batches(records)
+
+            finished = False
+            while not finished:
+                chunk_rows, offset = 0, None
+                with transaction.atomic():
+                    for kind, batch, offset in batches:
+                        imported = self.import_batch(kind, batch)
+                        rows += imported
+                        skipped += len(batch) - imported
+                        chunk_rows += len(batch)
+                        if chunk_rows >= options["chunk_size"]:
+                            break
+                    else:
+                        finished = True
+
+                if offset is not None:
+                    checkpoint = {"offset": offset, "records": checkpoint["records"] + chunk_rows}
+                    self.write_checkpoint(checkpoint_path, checkpoint)
+                    elapsed = time.monotonic() - start
+                    self.stdout.write(
+                        f"{rows} rows imported, {skipped} skipped, {rows / elapsed if elapsed else 0:.0f} rows/s"
+                    )
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Import finished: {rows} rows imported, {skipped} skipped in {elapsed:.1f}s "
+            f"({rows / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
+
+    @staticmethod
+    def read_checkpoint(path):
+        """Returns the checkpoint of a previous import of the file, or a checkpoint at its beginning."""
+        if not os.path.exists(path):
+            return {"offset": 0, "records": 0}
+        with open(path) as file:
+            return json.load(file)
+
+    @staticmethod
+    def write_checkpoint(path, checkpoint):
+        """Atomically replaces the checkpoint file."""
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(checkpoint, file)
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def read_lines(file, offset):
+        """Yields the decoded lines of a binary file from an offset, with the offset following each line."""
+        file.seek(offset)
+        for line in iter(file.readline, b""):
+            offset += len(line)
+            yield line.decode("utf-8"), offset
+
+    def read_ndjson(self, file, offset):
+        """Yields the (kind, data, offset) of the records of an NDJSON file."""
+        for line, offset in self.read_lines(file, offset):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind, data = record["type"], record["data"]
+            except (ValueError, KeyError, TypeError):
+                raise CommandError(f"Invalid record before byte {offset}: {line!r}")
+            if kind not in KINDS:
+                raise CommandError(f"Unknown record type {kind!r} before byte {offset}.")
+            yield kind, data, offset
+
+    def read_csv(self, file, offset, kind):
+        """Yields the (kind, data, offset) of the rows of a CSV file, whose first line is a header."""
+        header = file.readline().decode("utf-8")
+        lines = self.read_lines(file, max(offset, file.tell()))
+        position = {"offset": offset}
+
+        def track(lines):
+            for line, position["offset"] in lines:
+                yield line
+
+        columns = next(csv.reader([header]))
+        for row in csv.reader(track(lines)):
+            if row:
+                yield kind, dict(zip(columns, row)), position["offset"]
+
+    def read_batches(self, records):
+        """Groups consecutive records of the same kind in batches, yielding (kind, rows, offset after the batch)."""
+        kind, batch, offset = None, [], None
+        for record_kind, data, record_offset in records:
+            if batch and (record_kind != kind or len(batch) >= self.batch_size):
+                yield kind, batch, offset
+                batch = []
+            kind, offset = record_kind, record_offset
+            batch.append(data)
+        if batch:
+            yield kind, batch, offset
+
+    def get_mapping(self, kind, external_ids):
+        """Returns the primary keys of the already imported objects of a kind, by external id."""
+        references = ExternalReference.objects.filter(source=self.source, kind=kind, external_id__in=external_ids)
+        mapping = dict(references.values_list("external_id", "internal_id"))
+        if kind == "user" and self.existing_users:
+            missing_ids = {external_id for external_id in external_ids if external_id not in mapping}
+            numeric_ids = [int(external_id) for external_id in missing_ids if external_id.isdigit()]
+            for user_id in CustomUser.objects.filter(pk__in=numeric_ids).values_list("pk", flat=True):
+                mapping[str(user_id)] = user_id
+        return mapping
+
+    def import_batch(self, kind, rows):
+        """
+        Imports a batch of records of the same kind and returns the number of rows created.
+        Records already imported, or referencing objects which are not imported, are skipped. Records of objects
+        which are already in the database, or duplicates of a record of the batch, are referenced as these objects.
+        """
+        model, id_field, references = KINDS[kind]["model"], KINDS[kind]["id"], KINDS[kind]["references"]
+        fields = USER_FIELDS if kind == "user" else EXPORT_FIELDS[kind]
+        fields = [field for field in fields if field not in (id_field, "created_time") and field not in references]
+
+        # Skips the records already imported, by a previous run or earlier in the batch
+        imported_ids = self.get_mapping(kind, [str(row.get(id_field)) for row in rows])
+        new_rows = {}
+        for row in rows:
+            external_id = str(row.get(id_field))
+            if external_id not in imported_ids and external_id not in new_rows:
+                new_rows[external_id] = row
+
+        # Resolves the references with a query per referenced kind
+        mappings = {}
+        for referenced_kind in set(references.values()):
+            external_ids = {
+                str(row.get(field)) for row in new_rows.values()
+                for field, field_kind in references.items() if field_kind == referenced_kind
+            }
+            mappings[referenced_kind] = self.get_mapping(referenced_kind, list(external_ids))
+
+        objects, created_times = {}, {}
+        for external_id, row in new_rows.items():
+            try:
+                values = {field: mappings[references[field]][str(row.get(field))] for field in references}
+            except KeyError:
+                continue
+            values.update({field: row[field] for field in fields if field in row})
+            objects[external_id] = model(**values)
+            if row.get("created_time"):
+                created_times[external_id] = self.parse_created_time(row["created_time"])
+
+        existing, duplicates = self.get_existing(kind, objects)
+        new_objects = {external_id: obj for external_id, obj in objects.items() if external_id not in existing}
+        model.objects.bulk_create(new_objects.values(), batch_size=self.batch_size)
+
+        # The creation time is set on insertion, the one of the other tracker is restored afterwards
+        restored = []
+        for external_id, obj in new_objects.items():
+            if external_id in created_times:
+                obj.created_time = created_times[external_id]
+                restored.append(obj)
+        if restored:
+            model.objects.bulk_update(restored, ["created_time"], batch_size=self.batch_size)
+
+        internal_ids = {**existing, **{external_id: obj.pk for external_id, obj in new_objects.items()}}
+        internal_ids.update({external_id: internal_ids[first_id] for external_id, first_id in duplicates.items()})
+        ExternalReference.objects.bulk_create(
+            [
+                ExternalReference(source=self.source, kind=kind, external_id=external_id, internal_id=internal_id)
+                for external_id, internal_id in internal_ids.items()
+            ],
+            batch_size=self.batch_size,
+        )
+
+        # Bulk inserts do not send the signals invalidating the membership cache and bumping project versions
+        for obj in new_objects.values():
+            if kind == "project":
+                membership_cache.invalidate(obj.author_user_id)
+            elif kind == "contributor":
+                membership_cache.invalidate(obj.user_id)
+            if kind in ("contributor", "issue"):
+                bump_project_versions_on_commit(project_id=obj.project_id)
+            elif kind == "comment":
+                bump_project_versions_on_commit(issue_id=obj.issue_id)
+        return len(new_objects)
+
+    @staticmethod
+    def parse_created_time(value):
+        """Returns the datetime of a creation time, read from an ISO 8601 string in UTC if it has no time zone."""
+        created_time = parse_datetime(value) if isinstance(value, str) else value
+        if created_time is None:
+            raise CommandError(f"Invalid created_time {value!r}.")
+        if timezone.is_naive(created_time):
+            created_time = timezone.make_aware(created_time, timezone.utc)
+        return created_time
+
+    @staticmethod
+    def get_existing(kind, objects):
+        """
+        Returns the primary keys of the objects which are already in the database and cannot be inserted again, by
+        external id: users with the same email and contributors of the same user and project, and the external ids
+        of the first objects of the batch the other ones duplicate, by external id.
+        Removes from the objects the duplicates which would violate these constraints within the batch.
+        """
+        if kind == "user":
+            keys = {}
+            for external_id, obj in objects.items():
+                obj.email = CustomUser.objects.normalize_email(obj.email)
+                obj.password = make_password(None)
+                keys[external_id] = obj.email
+            pks = dict(CustomUser.objects.filter(email__in=keys.values()).values_list("email", "pk"))
+        elif kind == "contributor":
+            keys = {external_id: (obj.project_id, obj.user_id) for external_id, obj in objects.items()}
+            contributors = Contributor.objects.filter(
+                project_id__in={obj.project_id for obj in objects.values()},
+                user_id__in={obj.user_id for obj in objects.values()},
+            ).values_list("project_id", "user_id", "pk")
+            pks = {(project_id, user_id): pk for project_id, user_id, pk in contributors}
+        else:
+            return {}, {}
+
+        first_ids, duplicates = {}, {}
+        for external_id, key in keys.items():
+            if key in first_ids:
+                del objects[external_id]
+                duplicates[external_id] = first_ids[key]
+            else:
+                first_ids[key] = external_id
+        existing = {external_id: pks[key] for external_id, key in keys.items() if key in pks}
+        return existing, duplicates
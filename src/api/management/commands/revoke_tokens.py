@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from api.cache import token_denylist
+from api.models import CustomUser
+
+
+class Command(BaseCommand):
+    """Command revoking JWTs in the token denylist."""
+
+    help = "Revokes single access or refresh tokens, or all the tokens issued to users until now."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", default=[], help="Email of a user, can be repeated.")
+        parser.add_argument("--token", action="append", default=[], help="Encoded token, can be repeated.")
+
+    def handle(self, *args, **options):
+        if not options["user"] and not options["token"]:
+            raise CommandError("Give at least one --user or --token.")
+
+        for email in options["user"]:
+            user = CustomUser.objects.filter(email=email).first()
+            if user is None:
+                raise CommandError(f"No user with the email {email}.")
+            token_denylist.revoke_user(user.pk)
+            self.stdout.write(f"Revoked the tokens of {email}.")
+
+        for raw_token in options["token"]:
+            try:
+                token = UntypedToken(raw_token)
+            except TokenError as error:
+                raise CommandError(f"Invalid token: {error}")
+            token_denylist.revoke_token(token)
+            self.stdout.write(f"Revoked the token {token['jti']}.")
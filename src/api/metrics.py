@@ -0,0 +1,99 @@
+"""
+Prometheus metrics of the API, exposed by the /metrics endpoint.
+
+When the PROMETHEUS_MULTIPROC_DIR environment variable is set, prometheus_client stores the values in files of this
+directory shared by the workers of the server, and the endpoint aggregates the values of every worker. Otherwise,
+the endpoint only exposes the values of the process answering it.
+"""
+import os
+import weakref
+from collections import Counter as Tally
+
+from django.conf import settings
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# Route label of the requests which do not match any URL pattern
+UNMATCHED_ROUTE = "unmatched"
+
+REQUESTS = Counter(
+    "api_requests_total", "Requests handled, by route name, method and status code.", ["route", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds", "Duration of the requests, by route name and method.", ["route", "method"],
+)
+REQUEST_QUERIES = Histogram(
+    "api_request_queries", "Number of SQL queries run by the requests, by route name and method.",
+    ["route", "method"], buckets=(0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, float("inf")),
+)
+REQUEST_DB_DURATION = Histogram(
+    "api_request_db_duration_seconds", "Time spent by the requests in the database, by route name and method.",
+    ["route", "method"],
+)
+JWT_AUTHENTICATION_DURATION = Histogram(
+    "api_jwt_authentication_duration_seconds",
+    "Duration of the JWT authentication, by outcome: authenticated, anonymous (no token) or failed.", ["outcome"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, float("inf")),
+)
+CACHE_LOOKUPS = Counter(
+    "api_cache_lookups_total", "Lookups of the membership and response caches, by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_BYTES_SAVED = Counter(
+    "api_response_cache_bytes_saved_total", "Bytes of the responses served from the response cache.",
+)
+DB_CONNECTIONS_CREATED = Counter(
+    "api_db_connections_created_total", "Database connections opened, by database alias.", ["alias"],
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    "api_db_connections_open", "Database connections currently open, by database alias.", ["alias"],
+    multiprocess_mode="livesum",
+)
+
+# Database wrappers of the connections opened by this process, one by thread and alias
+_connections = weakref.WeakSet()
+
+
+def observe_request(request, response, request_metrics):
+    """Records a request, its duration and its queries, measured by a RequestMetrics."""
+    match = request.resolver_match
+    route = match.url_name if match is not None and match.url_name else UNMATCHED_ROUTE
+    REQUESTS.labels(route, request.method, response.status_code).inc()
+    REQUEST_DURATION.labels(route, request.method).observe(request_metrics.elapsed)
+    REQUEST_QUERIES.labels(route, request.method).observe(request_metrics.query_count)
+    REQUEST_DB_DURATION.labels(route, request.method).observe(request_metrics.db_time)
+    observe_connections()
+
+
+def observe_authentication(outcome, duration):
+    """Records the duration of a JWT authentication."""
+    JWT_AUTHENTICATION_DURATION.labels(outcome).observe(duration)
+
+
+def observe_cache_lookup(cache, hit, size=0):
+    """Records a lookup of a cache, and the size of the cached response served on a hit."""
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+    if size:
+        CACHE_BYTES_SAVED.inc(size)
+
+
+def track_connection(sender, connection, **kwargs):
+    """Receiver of connection_created counting the connections and keeping track of the open ones."""
+    DB_CONNECTIONS_CREATED.labels(connection.alias).inc()
+    _connections.add(connection)
+
+
+def observe_connections():
+    """Updates the number of connections of this process which are open, without querying the database."""
+    open_connections = Tally(wrapper.alias for wrapper in list(_connections) if wrapper.connection is not None)
+    for alias in settings.DATABASES:
+        DB_CONNECTIONS_OPEN.labels(alias).set(open_connections[alias])
+
+
+def export():
+    """Returns the metrics in the Prometheus text format, aggregated across the workers in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+
+from api.compression import compress, compress_stream, negotiate_encoding
+from api.instrumentation import measure_request, timed
+from api.metrics import observe_request
+
+
+logger = logging.getLogger("api.instrumentation")
+
+
+@sync_and_async_middleware
+def instrumentation_middleware(get_response):
+    """
+    Measures a sample of settings.INSTRUMENTATION_SAMPLE_RATE of the requests: their SQL queries and the time they
+    spend in the database, serializing and rendering. The measures are sent back in a Server-Timing header and
+    logged as JSON, with a warning when the request exceeds settings.INSTRUMENTATION_QUERY_BUDGET queries or repeats
+    the same SQL settings.INSTRUMENTATION_REPEATED_QUERY_THRESHOLD times, which usually reveals an N+1 query.
+    When settings.METRICS_ENABLED is set, every request is also counted and timed, with its number of queries, in
+    the metrics of the /metrics endpoint. Otherwise, requests which are not sampled are not measured at all.
+    """
+    metrics_enabled = settings.METRICS_ENABLED
+    sample_rate = settings.INSTRUMENTATION_SAMPLE_RATE
+    query_budget = settings.INSTRUMENTATION_QUERY_BUDGET
+    repeated_query_threshold = settings.INSTRUMENTATION_REPEATED_QUERY_THRESHOLD
+
+    def is_sampled():
+        return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+    def finish(request, response, metrics):
+        """Records the measures of a request in the metrics and, if it is sampled, reports them."""
+        if metrics_enabled:
+            observe_request(request, response, metrics)
+        if metrics.detailed:
+            report(request, response, metrics)
+
+    def report(request, response, metrics):
+        """Adds the Server-Timing header to the response and logs the measures of the request."""
+        total = metrics.elapsed
+        timings = {"db": metrics.db_time, **metrics.timings, "total": total}
+        response.headers["Server-Timing"] = ", ".join(
+            f'{name};dur={duration * 1000:.1f}' + (f';desc="{metrics.query_count} queries"' if name == "db" else "")
+            for name, duration in timings.items()
+        )
+
+        match = request.resolver_match
+        view = match.func if match is not None else None
+        view_class = getattr(view, "cls", None)
+        actions = getattr(view, "actions", None) or {}
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "route": match.url_name if match is not None else None,
+            "view": view_class.__name__ if view_class is not None else getattr(match, "view_name", None),
+            "action": actions.get(request.method.lower()),
+            "status": response.status_code,
+            "queries": metrics.query_count,
+            **{f"{name}_ms": round(duration * 1000, 1) for name, duration in timings.items()},
+        }
+
+        problems = []
+        if metrics.query_count > query_budget:
+            problems.append(f"{metrics.query_count} queries exceed the budget of {query_budget}")
+        repeated_queries = metrics.repeated_queries(repeated_query_threshold)
+        if repeated_queries:
+            record["repeated_queries"] = repeated_queries
+            problems.append(f"{len(repeated_queries)} queries repeated at least {repeated_query_threshold} times")
+
+        if problems:
+            record["problems"] = problems
+            logger.warning(json.dumps(record), extra={"instrumentation": record})
+        else:
+            logger.info(json.dumps(record), extra={"instrumentation": record})
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            sampled = is_sampled()
+            if not sampled and not metrics_enabled:
+                return await get_response(request)
+            with measure_request(detailed=sampled) as metrics:
+                response = await get_response(request)
+            finish(request, response, metrics)
+            return response
+    else:
+        def middleware(request):
+            sampled = is_sampled()
+            if not sampled and not metrics_enabled:
+                return get_response(request)
+            with measure_request(detailed=sampled) as metrics:
+                response = get_response(request)
+            finish(request, response, metrics)
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def compression_middleware(get_response):
+    """
+    Compresses the responses of at least settings.COMPRESSION_MIN_SIZE bytes, and the streamed ones, with brotli or
+    gzip according to the Accept-Encoding header of the request (see api.compression). Like Django's GZipMiddleware,
+    the compressed content is only kept if it is smaller, and the ETag is made weak.
+    """
+    if not settings.COMPRESSION_ENABLED:
+        raise MiddlewareNotUsed
+    min_size = settings.COMPRESSION_MIN_SIZE
+
+    def compress_response(request, response):
+        if response.has_header("Content-Encoding") or (not response.streaming and len(response.content) < min_size):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response.headers["Content-Length"]
+        else:
+            with timed("compress"):
+                content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            return compress_response(request, await get_response(request))
+    else:
+        def middleware(request):
+            return compress_response(request, get_response(request))
+
+    return middleware
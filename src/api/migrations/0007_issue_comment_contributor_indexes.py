@@ -0,0 +1,39 @@
+# Generated by Django 4.1.2 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_alter_contributor_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["issue", "created_time", "comment_id"],
+                name="comment_issue_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contributor",
+            index=models.Index(
+                fields=["user", "project", "role"], name="contrib_user_project_role_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "created_time", "issue_id"],
+                name="issue_project_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["assignee_user", "status"], name="issue_assignee_status_idx"
+            ),
+        ),
+    ]
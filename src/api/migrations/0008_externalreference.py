@@ -0,0 +1,34 @@
+# Generated by Django 4.1.2 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_issue_comment_contributor_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExternalReference",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=64)),
+                ("kind", models.CharField(max_length=16)),
+                ("external_id", models.CharField(max_length=64)),
+                ("internal_id", models.BigIntegerField()),
+            ],
+            options={
+                "unique_together": {("source", "kind", "external_id")},
+            },
+        ),
+    ]
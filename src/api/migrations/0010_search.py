@@ -0,0 +1,119 @@
+from django.db import migrations
+
+# Full-text index of the issues and comments, used by api.search.
+# SQLite: an FTS5 table with a row per issue (rowid 2 * issue_id) and per comment (rowid 2 * comment_id + 1), kept in
+# sync by triggers. The project column holds an "i<project_id>" token for issues and a "c<project_id>" one for comments,
+# restricting the searches to the issues or to the comments of a project.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_search USING fts5(
+        project, title, description, issue_id UNINDEXED, comment_id UNINDEXED,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER api_search_issue_insert AFTER INSERT ON api_issue BEGIN
+        INSERT INTO api_search(rowid, project, title, description, issue_id, comment_id)
+        VALUES (2 * NEW.issue_id, 'i' || NEW.project_id, NEW.title, NEW.description, NEW.issue_id, NULL);
+    END
+    """,
+    """
+    CREATE TRIGGER api_search_issue_update AFTER UPDATE OF title, description, project_id ON api_issue BEGIN
+        UPDATE api_search SET project = 'i' || NEW.project_id, title = NEW.title, description = NEW.description
+        WHERE rowid = 2 * NEW.issue_id;
+        UPDATE api_search SET project = 'c' || NEW.project_id
+        WHERE OLD.project_id != NEW.project_id
+        AND rowid IN (SELECT 2 * comment_id + 1 FROM api_comment WHERE issue_id = NEW.issue_id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_search_issue_delete AFTER DELETE ON api_issue BEGIN
+        DELETE FROM api_search WHERE rowid = 2 * OLD.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER api_search_comment_insert AFTER INSERT ON api_comment BEGIN
+        INSERT INTO api_search(rowid, project, title, description, issue_id, comment_id)
+        SELECT 2 * NEW.comment_id + 1, 'c' || project_id, NULL, NEW.description, NEW.issue_id, NEW.comment_id
+        FROM api_issue WHERE issue_id = NEW.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER api_search_comment_update AFTER UPDATE OF description, issue_id ON api_comment BEGIN
+        UPDATE api_search SET
+            project = (SELECT 'c' || project_id FROM api_issue WHERE issue_id = NEW.issue_id),
+            description = NEW.description,
+            issue_id = NEW.issue_id
+        WHERE rowid = 2 * NEW.comment_id + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER api_search_comment_delete AFTER DELETE ON api_comment BEGIN
+        DELETE FROM api_search WHERE rowid = 2 * OLD.comment_id + 1;
+    END
+    """,
+    """
+    INSERT INTO api_search(rowid, project, title, description, issue_id, comment_id)
+    SELECT 2 * issue_id, 'i' || project_id, title, description, issue_id, NULL FROM api_issue
+    """,
+    """
+    INSERT INTO api_search(rowid, project, title, description, issue_id, comment_id)
+    SELECT 2 * comment.comment_id + 1, 'c' || issue.project_id, NULL, comment.description, comment.issue_id,
+           comment.comment_id
+    FROM api_comment comment JOIN api_issue issue ON issue.issue_id = comment.issue_id
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_search_issue_insert",
+    "DROP TRIGGER IF EXISTS api_search_issue_update",
+    "DROP TRIGGER IF EXISTS api_search_issue_delete",
+    "DROP TRIGGER IF EXISTS api_search_comment_insert",
+    "DROP TRIGGER IF EXISTS api_search_comment_update",
+    "DROP TRIGGER IF EXISTS api_search_comment_delete",
+    "DROP TABLE IF EXISTS api_search",
+]
+
+# PostgreSQL: GIN indexes on the tsvector of the issues and comments, whose expressions must stay identical to the ones
+# of api.search.POSTGRESQL_QUERY for the planner to use them.
+POSTGRESQL_FORWARD = [
+    """
+    CREATE INDEX api_issue_search_idx ON api_issue USING gin (
+        to_tsvector('english'::regconfig, COALESCE(title, '') || ' ' || COALESCE(description, ''))
+    )
+    """,
+    """
+    CREATE INDEX api_comment_search_idx ON api_comment USING gin (
+        to_tsvector('english'::regconfig, COALESCE(description, ''))
+    )
+    """,
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS api_issue_search_idx",
+    "DROP INDEX IF EXISTS api_comment_search_idx",
+]
+
+
+def run(statements):
+    """Returns a RunPython function running the statements of the database vendor, if it supports full-text search."""
+
+    def run_statements(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run_statements
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_project_version_modified_time"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD}),
+            run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD}),
+        ),
+    ]
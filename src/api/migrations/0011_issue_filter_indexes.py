@@ -0,0 +1,47 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "status", "created_time", "issue_id"],
+                name="issue_project_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "priority", "created_time", "issue_id"],
+                name="issue_project_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "tag", "created_time", "issue_id"],
+                name="issue_project_tag_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=[
+                    "project",
+                    "assignee_user",
+                    "status",
+                    "created_time",
+                    "issue_id",
+                ],
+                name="issue_project_assignee_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_issue_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["assignee_user", "created_time", "issue_id"],
+                name="issue_assignee_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["author_user", "created_time", "issue_id"],
+                name="issue_author_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.2 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_issue_user_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "assignee_user", "created_time", "issue_id"],
+                name="issue_project_assign_time_idx",
+            ),
+        ),
+    ]
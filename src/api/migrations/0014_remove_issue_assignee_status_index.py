@@ -0,0 +1,17 @@
+# Generated by Django 4.1.2 on 2026-10-18 09:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_issue_project_assignee_time_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="issue",
+            name="issue_assignee_status_idx",
+        ),
+    ]
@@ -1,13 +1,38 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
 from django.db import models
+from django.dispatch import Signal
 from django.utils.translation import gettext_lazy as _
 
+from api import hashers
 from issuetracking import settings
 
 
+# Sent by CustomUserQuerySet.update(), which does not send post_save, with the pks of the updated users and the
+# updated values by field
+users_updated = Signal()
+
+
+class CustomUserQuerySet(models.QuerySet):
+    """QuerySet of users whose bulk updates send users_updated, e.g. to revoke the tokens of deactivated users."""
+
+    def update(self, **kwargs):
+        # The users are selected first, as the update can change the fields they are filtered on
+        pks = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        if pks:
+            users_updated.send(sender=self.model, pks=pks, values=kwargs)
+        return rows
+
+    update.alters_data = True
+
+
 class CustomUserManager(BaseUserManager):
     """Manager class for custom users."""
 
+    def get_queryset(self):
+        return CustomUserQuerySet(self.model, using=self._db)
+
     def create_user(self, email: str, first_name: str, last_name: str, password=None):
         """
         Creates and saves a User with the given email, first name, last name and password.
@@ -75,6 +100,38 @@ class CustomUser(AbstractBaseUser):
 
     objects = CustomUserManager()
 
+    def set_password(self, raw_password):
+        """Hashes the password in the password hashing pool."""
+        self.password = hashers.hash_password(raw_password)
+        self._password = raw_password
+
+    async def aset_password(self, raw_password):
+        """Async counterpart of set_password()."""
+        self.password = await hashers.ahash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Checks the password in the password hashing pool, and hashes it again if the preferred hasher or its cost
+        changed.
+        """
+        is_correct, must_update = hashers.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            self.set_password(raw_password)
+            # Password hash upgrades are not password changes
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
+    async def acheck_password(self, raw_password):
+        """Async counterpart of check_password()."""
+        is_correct, must_update = await hashers.averify_password(raw_password, self.password)
+        if is_correct and must_update:
+            await self.aset_password(raw_password)
+            self._password = None
+            await sync_to_async(self.save)(update_fields=["password"])
+        return is_correct
+
     def get_full_name(self):
         # The user is identified by their email address
         return f"{self.first_name} {self.last_name}"
@@ -115,7 +172,26 @@ class CustomUser(AbstractBaseUser):
         return self.admin
 
 
-class Project(models.Model):
+class LoadedMemberMixin:
+    """
+    Mixin remembering the id of the user, in member_field, an instance was loaded with, so that the cached memberships
+    of a previous user are invalidated as well when the user changes (see api.signals).
+    """
+
+    member_field = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_member_id = instance.__dict__.get(cls.member_field)
+        return instance
+
+    def get_member_ids(self):
+        """Returns the id of the current user and the one of the user the instance was loaded with."""
+        return {getattr(self, self.member_field), getattr(self, "loaded_member_id", None)}
+
+
+class Project(LoadedMemberMixin, models.Model):
     """Class managing projects."""
     class Type(models.TextChoices):
         BACK_END = 'BE', _('Back-End')
@@ -132,12 +208,29 @@ class Project(models.Model):
         on_delete=models.CASCADE,
         verbose_name="Author"
     )
+    # Incremented, with the modification time, whenever the project or one of its issues, comments or contributors
+    # is written. Used as validator of conditional requests.
+    version = models.PositiveBigIntegerField(default=0, editable=False)
+    modified_time = models.DateTimeField(auto_now=True)
+
+    member_field = "author_user_id"
 
     objects = models.Manager()
 
     def __str__(self):
         return f"{self.title}"
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the project without writing its version, which is only incremented by update queries, so that a
+        concurrent increment is not overwritten.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields if not field.primary_key and field.name != "version"
+            ]
+        super().save(*args, **kwargs)
+
 
 class Issue(models.Model):
     """Class managing issues."""
@@ -178,13 +271,36 @@ class Issue(models.Model):
     )
     created_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Issues of a project in cursor pagination order
+            models.Index(fields=["project", "created_time", "issue_id"], name="issue_project_created_idx"),
+            # Issues of a user across projects in cursor pagination order, see api.views.UserIssueViewset
+            models.Index(fields=["assignee_user", "created_time", "issue_id"], name="issue_assignee_created_idx"),
+            models.Index(fields=["author_user", "created_time", "issue_id"], name="issue_author_created_idx"),
+            # Filtered lists of a project, see api.filters.IssueFilterBackend
+            models.Index(fields=["project", "status", "created_time", "issue_id"], name="issue_project_status_idx"),
+            models.Index(
+                fields=["project", "priority", "created_time", "issue_id"], name="issue_project_priority_idx"
+            ),
+            models.Index(fields=["project", "tag", "created_time", "issue_id"], name="issue_project_tag_idx"),
+            models.Index(
+                fields=["project", "assignee_user", "created_time", "issue_id"],
+                name="issue_project_assign_time_idx",
+            ),
+            models.Index(
+                fields=["project", "assignee_user", "status", "created_time", "issue_id"],
+                name="issue_project_assignee_idx",
+            ),
+        ]
+
     objects = models.Manager()
 
     def __str__(self):
         return f"{self.title}"
 
 
-class Contributor(models.Model):
+class Contributor(LoadedMemberMixin, models.Model):
     """Class managing contributors. Represents a link between users and projects."""
 
     class Permission(models.TextChoices):
@@ -210,8 +326,14 @@ class Contributor(models.Model):
     permission = models.CharField(max_length=50, choices=Permission.choices)
     role = models.CharField(max_length=50, choices=Role.choices)
 
+    member_field = "user_id"
+
     class Meta:
         unique_together = ('user', 'project')
+        indexes = [
+            # Covers the membership lookups of a user without reading the table
+            models.Index(fields=["user", "project", "role"], name="contrib_user_project_role_idx"),
+        ]
 
     objects = models.Manager()
 
@@ -225,4 +347,24 @@ class Comment(models.Model):
     issue = models.ForeignKey(to=Issue, on_delete=models.CASCADE, related_name="comments")
     created_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Comments of an issue in cursor pagination order
+            models.Index(fields=["issue", "created_time", "comment_id"], name="comment_issue_created_idx"),
+        ]
+
+    objects = models.Manager()
+
+
+class ExternalReference(models.Model):
+    """Class managing the ids of objects imported from another tracker, mapped to their primary key."""
+
+    source = models.CharField(max_length=64)
+    kind = models.CharField(max_length=16)
+    external_id = models.CharField(max_length=64)
+    internal_id = models.BigIntegerField()
+
+    class Meta:
+        unique_together = ('source', 'kind', 'external_id')
+
     objects = models.Manager()
@@ -0,0 +1,363 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, Expression, F, Q, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, Cursor, CursorPagination, LimitOffsetPagination, _reverse_ordering,
+)
+
+# Separator of the values of the ordering fields in the position of a cursor
+POSITION_SEPARATOR = ','
+
+
+async def afetch(queryset):
+    """
+    Fetches the objects of a queryset with the async ORM.
+    Django 4.1 does not support aiterator() after prefetch_related(), so that such querysets are fetched at once.
+    """
+    if queryset._prefetch_related_lookups:
+        return [obj async for obj in queryset]
+    return [obj async for obj in queryset.aiterator()]
+
+
+def slice_page(queryset, start, stop, view=None):
+    """Returns the rows start to stop of the queryset, prepared by prepare_page()."""
+    return prepare_page(queryset[start:stop], view)
+
+
+def prepare_page(page, view=None):
+    """
+    Returns the queryset of a page as annotated by view.annotate_page(page) if the view defines it, so that
+    annotations too costly to compute for every row of the queryset are only computed for the page.
+    If view.get_page_values() returns fields, the rows are fetched as dicts of these fields and of the ordering,
+    which the cursors are read from, instead of model instances. Otherwise the page is optimized by
+    view.optimize_page(page, ordering) if the view defines it.
+    """
+    annotate_page = getattr(view, 'annotate_page', None)
+    if annotate_page is not None:
+        page = annotate_page(page)
+    get_page_values = getattr(view, 'get_page_values', None)
+    fields = get_page_values() if get_page_values is not None else None
+    optimize_page = getattr(view, 'optimize_page', None)
+    if fields:
+        ordering = [field.lstrip('-') for field in page.query.order_by if field.lstrip('-') not in fields]
+        page = page.values(*fields, *ordering)
+    elif optimize_page is not None:
+        page = optimize_page(page, [field.lstrip('-') for field in page.query.order_by])
+    return page
+
+
+class OffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination which can also paginate with the async ORM."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return list(slice_page(queryset, self.offset, self.offset + self.limit, view))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of paginate_queryset()."""
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return await afetch(slice_page(queryset, self.offset, self.offset + self.limit, view))
+
+
+class LimitedOffsetPagination(OffsetPagination):
+    """Limit/offset pagination capping the limit a client may request."""
+
+    max_limit = settings.API_MAX_PAGE_SIZE
+
+
+class RowComparison(Expression):
+    """
+    Comparison of the row of the columns of fields with a row of values, e.g. (created_time, issue_id) > (%s, %s),
+    which the database reads as a range of an index on these columns.
+    """
+
+    def __init__(self, fields, operator, values):
+        super().__init__(output_field=BooleanField())
+        self.columns = [F(field) for field in fields]
+        self.operator = operator
+        self.values = values
+
+    def get_source_expressions(self):
+        return self.columns
+
+    def set_source_expressions(self, exprs):
+        self.columns = exprs
+
+    def as_sql(self, compiler, connection):
+        columns, values, params = [], [], []
+        for column in self.columns:
+            sql, column_params = compiler.compile(column)
+            columns.append(sql)
+            params += column_params
+        for column, value in zip(self.columns, self.values):
+            sql, value_params = compiler.compile(Value(value, output_field=column.output_field))
+            values.append(sql)
+            params += value_params
+        return f"({', '.join(columns)}) {self.operator} ({', '.join(values)})", params
+
+
+class CreatedTimeCursorPagination(CursorPagination):
+    """
+    Keyset pagination in chronological order.
+    The cursors hold the values of every ordering field of the last item, the creation time and the id, and pages are
+    fetched by comparing these columns as a row, e.g. (created_time, issue_id) > (%s, %s), which an index ending with
+    them reads as a range, instead of filtering on the creation time alone and scanning an offset past the items
+    created at the same time. No count is performed, so that the cost of a page does not depend on its depth.
+    The ordering fields must all be ascending or all descending.
+    The page size can be chosen through the limit query parameter, up to settings.API_MAX_PAGE_SIZE.
+    """
+
+    page_size_query_param = 'limit'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of paginate_queryset()."""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(await afetch(page_queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Returns the queryset of the requested page, with an extra item telling whether a page follows, or None if
+        pagination is disabled.
+        This is the first half of CursorPagination.paginate_queryset, split from the second one so that the page can
+        be fetched either with the sync or with the async ORM.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (reverse, current_position) = (False, None)
+        else:
+            (reverse, current_position) = (self.cursor.reverse, self.cursor.position)
+
+        # Cursor pagination always enforces an ordering.
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # If we have a cursor then fetch the items following its position in the order of the queryset.
+        if current_position is not None:
+            is_reversed = self.ordering[0].startswith('-')
+            fields = [order.lstrip('-') for order in self.ordering]
+            values = self.get_position_values(queryset, fields, current_position)
+            queryset = queryset.filter(RowComparison(fields, '<' if reverse != is_reversed else '>', values))
+
+        # We always fetch an extra item in order to determine if there is a page following on from this one.
+        self.reverse, self.current_position = reverse, current_position
+        return self.slice_page(queryset, 0, self.page_size + 1, view)
+
+    def get_position_values(self, queryset, fields, position):
+        """Returns the values of the fields held by the position of a cursor, raising NotFound if it is invalid."""
+        values = position.split(POSITION_SEPARATOR)
+        if len(values) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [queryset.model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Returns the position of an item, made of the values of every ordering field."""
+        fields = [order.lstrip('-') for order in ordering]
+        if isinstance(instance, dict):
+            values = [instance[field] for field in fields]
+        else:
+            values = [getattr(instance, field) for field in fields]
+        return POSITION_SEPARATOR.join(str(value) for value in values)
+
+    def slice_page(self, queryset, start, stop, view=None):
+        """Returns the rows start to stop of the ordered queryset."""
+        return slice_page(queryset, start, stop, view)
+
+    def set_page(self, results):
+        """
+        Sets the page from the results of the page queryset and returns it.
+        This is the second half of CursorPagination.paginate_queryset.
+        """
+        reverse, current_position = self.reverse, self.current_position
+        self.page = list(results[:self.page_size])
+
+        # Determine the position of the final item following the page.
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            # If we have a reverse queryset, then the query ordering was in reverse
+            # so we need to reverse the items again before returning them to the user.
+            self.page = list(reversed(self.page))
+
+            # Determine next and previous positions for reverse cursors.
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            # Determine next and previous positions for forward cursors.
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        # Display page controls in the browsable API if there is more
+        # than one page.
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        """Returns the link to the items following the last one of the page."""
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.next_position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        """Returns the link to the items preceding the first one of the page."""
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.previous_position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class IssueCursorPagination(CreatedTimeCursorPagination):
+    """Cursor pagination of issues."""
+
+    ordering = ('created_time', 'issue_id')
+
+
+class UserIssueCursorPagination(IssueCursorPagination):
+    """
+    Cursor pagination of the issues matching any of the filters returned by view.get_branch_filters(), e.g. assigned
+    to or authored by a user.
+    A database cannot read the rows matching an OR of columns in the order of an index, so that it would sort all of
+    them to return a page. The page is instead selected, by the same query, among the first rows matching each
+    filter, each read in the order of an index.
+    """
+
+    def slice_page(self, queryset, start, stop, view=None):
+        branches = Q()
+        for branch_filter in view.get_branch_filters():
+            branches |= Q(pk__in=queryset.filter(branch_filter).values('pk')[:stop])
+        page = queryset.model._default_manager.filter(branches).order_by(*queryset.query.order_by)[start:stop]
+        return prepare_page(page, view)
+
+
+class CommentCursorPagination(CreatedTimeCursorPagination):
+    """Cursor pagination of comments."""
+
+    ordering = ('created_time', 'comment_id')
+
+
+class CursorOrOffsetPagination(BasePagination):
+    """
+    Pagination delegating to a cursor pagination, or to a limit/offset pagination when the offset query parameter
+    is given, so that clients relying on offsets keep working.
+    """
+
+    cursor_pagination_class = None
+    offset_pagination_class = LimitedOffsetPagination
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_paginator(self, request):
+        """Returns the pagination to delegate to for this request."""
+        if self.offset_pagination_class.offset_query_param in request.query_params:
+            return self.offset_pagination_class()
+        return self.cursor_pagination_class()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async counterpart of paginate_queryset()."""
+        self.paginator = self.get_paginator(request)
+        return await self.paginator.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor_pagination_class().get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_operation_parameters(self, view):
+        return self.cursor_pagination_class().get_schema_operation_parameters(view) + [
+            parameter
+            for parameter in self.offset_pagination_class().get_schema_operation_parameters(view)
+            if parameter['name'] == self.offset_pagination_class.offset_query_param
+        ]
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+
+class IssuePagination(CursorOrOffsetPagination):
+    """Pagination of issues."""
+
+    cursor_pagination_class = IssueCursorPagination
+
+
+class CommentPagination(CursorOrOffsetPagination):
+    """Pagination of comments."""
+
+    cursor_pagination_class = CommentCursorPagination
@@ -0,0 +1,22 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from api.jsonlib import get_backend
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser decoding with the backend of settings.API_JSON_BACKEND (see api.jsonlib), e.g. orjson.
+    Bodies in another encoding than UTF-8 are left to the parser of DRF, as is everything with the json backend.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        backend = get_backend()
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if backend.name == 'json' or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return backend.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,18 +1,33 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
-from api.models import Project, Contributor, Issue, Comment
+from api.access import aget_project_access, get_project_access
+from api.cache import membership_cache
+from api.models import Project, Contributor
 
 
 def contributor(user, project):
     """Verifies if a user is a contributor of the project."""
 
-    try:
-        Contributor.objects.get(user=user, project=project)
-    except Contributor.DoesNotExist:
-        return False
-    else:
-        return True
+    return membership_cache.get(user.pk).role(project.pk) is not None
+
+
+def get_view_project_access(request, view):
+    """Resolves the access of the request user to the project targeted by a view."""
+    from api.views import ProjectViewset
+
+    if isinstance(view, ProjectViewset):
+        return get_project_access(request, view.kwargs['pk'])
+    return get_project_access(request, view.kwargs['project_pk'])
+
+
+async def aget_view_project_access(request, view):
+    """Async counterpart of get_view_project_access()."""
+    from api.views import ProjectViewset
+
+    if isinstance(view, ProjectViewset):
+        return await aget_project_access(request, view.kwargs['pk'])
+    return await aget_project_access(request, view.kwargs['project_pk'])
 
 
 class IsAuthenticatedProjectAuthorOrContributor(BasePermission):
@@ -20,7 +35,7 @@ class IsAuthenticatedProjectAuthorOrContributor(BasePermission):
     Controls if the user has the right permissions to access the data.
     An authenticated user can create a project and access the list of projects.
     An authenticated user can access a project and its issues/contributors/comments only if he is a contributor
-    of the project.
+    of the project, the other projects being not found.
     An authenticated user can update and delete an object only if he is its author.
     """
 
@@ -41,44 +56,43 @@ class IsAuthenticatedProjectAuthorOrContributor(BasePermission):
             return True
 
         # Can access the whole project if user is author or contributor
-        if isinstance(view, ProjectViewset):
-            project = get_object_or_404(Project, pk=view.kwargs['pk'])
-        else:
-            project = get_object_or_404(Project, pk=view.kwargs['project_pk'])
+        access = get_view_project_access(request, view)
 
-        is_contributor = contributor(request.user, project)
-        is_project_author = (request.user == project.author_user)
+        # the projects of other users are left out of the list (see ProjectViewset.get_queryset), and are not found
+        if isinstance(view, ProjectViewset) and not access.has_access:
+            raise Http404
+        return access.has_access
 
-        if request.user and (is_contributor or is_project_author):
-            return True
-        return False
+    async def ahas_permission(self, request, view):
+        """
+        Async counterpart of has_permission: resolves the access of the user to the project with the async ORM, so
+        that has_permission finds it on the request.
+        """
+        from api.views import ProjectViewset
+
+        needs_project = not (isinstance(view, ProjectViewset) and view.action in ['list', 'create'])
+        if needs_project and request.user and request.user.is_authenticated:
+            await aget_view_project_access(request, view)
+        return self.has_permission(request, view)
 
     def has_object_permission(self, request, view, obj):
         """
         Controls who has object level permissions on the corresponding object.
         """
 
-        if isinstance(obj, Contributor) or isinstance(obj, Issue):
-            project = obj.project
-        elif isinstance(obj, Comment):
-            project = obj.issue.project
-        else:
-            project = obj
-
-        is_contributor = contributor(request.user, project)
-        is_project_author = (request.user == project.author_user)
+        # The viewsets' querysets only return objects belonging to the project of the url
+        access = get_view_project_access(request, view)
 
         # if user is authenticated and contributor or author, can access the whole project with safe methods
         if request.method in SAFE_METHODS \
                 and request.user \
                 and request.user.is_authenticated \
-                and (is_contributor or is_project_author):
+                and access.has_access:
             return True
 
         # if user is authenticated and author of an instance, can update or delete the instance
-        if isinstance(obj, Contributor):
-            instance = obj.project
+        if isinstance(obj, Project) or isinstance(obj, Contributor):
+            is_author = access.is_author
         else:
-            instance = obj
-        is_author = bool(instance.author_user == request.user)
+            is_author = bool(obj.author_user_id == request.user.pk)
         return bool(request.user and request.user.is_authenticated and is_author)
@@ -0,0 +1,38 @@
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+
+from api.instrumentation import timed
+from api.jsonlib import get_backend
+
+
+class TimedRendererMixin:
+    """Mixin recording the rendering time of sampled requests."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with the backend of settings.API_JSON_BACKEND (see api.jsonlib), e.g. orjson.
+    Indented JSON, e.g. for the browsable API, and ASCII-only JSON are left to the renderer of DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = get_backend().dumps(data, self.encoder_class().default)
+        # Like DRF, escapes U+2028 and U+2029 so that the JSON is a strict subset of JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class TimedJSONRenderer(TimedRendererMixin, FastJSONRenderer):
+    """JSON renderer recording its rendering time."""
+
+
+class TimedBrowsableAPIRenderer(TimedRendererMixin, BrowsableAPIRenderer):
+    """Browsable API renderer recording its rendering time."""
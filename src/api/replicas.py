@@ -0,0 +1,133 @@
+"""
+Routing of the reads of safe requests to the read replicas of the database.
+
+The viewsets serving projects, contributors, issues and comments call read_from_replica() once the user of a GET or
+HEAD request is authenticated: the queries of the request, including the permission checks, then read from one of
+settings.DATABASE_REPLICAS. Writes, and every query of the other requests, go to the primary. After a successful
+write, replica_middleware keeps the reads of the user on the primary for settings.DATABASE_READ_AFTER_WRITE_WINDOW
+seconds, so that users read their own writes even when the replicas lag behind.
+"""
+import asyncio
+import random
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+# Alias of the replica the queries of the current request read from, None for the primary
+_read_alias: ContextVar[Optional[str]] = ContextVar("read_alias", default=None)
+
+
+class ReplicaRouter:
+    """Database router sending the reads of the requests using a replica to it, and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Instances read from a replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replicas receive the schema of the primary through the replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReadAfterWrite:
+    """
+    Users who recently wrote to the database, stored in the cache settings.REPLICATION_CACHE_ALIAS, whose reads stay on
+    the primary until the replicas have caught up with their writes.
+    """
+
+    key_prefix = "wrote"
+
+    @property
+    def cache(self):
+        """Cache backend storing the recent writers."""
+        return caches[settings.REPLICATION_CACHE_ALIAS]
+
+    def key(self, user_id):
+        """Cache key of the last write of a user."""
+        return f"{self.key_prefix}:{user_id}"
+
+    def mark(self, user_id):
+        """Records that the user just wrote to the primary."""
+        self.cache.set(self.key(user_id), True, settings.DATABASE_READ_AFTER_WRITE_WINDOW)
+
+    async def amark(self, user_id):
+        """Async counterpart of mark()."""
+        await self.cache.aset(self.key(user_id), True, settings.DATABASE_READ_AFTER_WRITE_WINDOW)
+
+    def wrote_recently(self, user_id):
+        """Did the user write during the last settings.DATABASE_READ_AFTER_WRITE_WINDOW seconds?"""
+        return self.cache.get(self.key(user_id), False)
+
+    async def awrote_recently(self, user_id):
+        """Async counterpart of wrote_recently()."""
+        return await self.cache.aget(self.key(user_id), False)
+
+
+read_after_write = ReadAfterWrite()
+
+
+def read_from_replica(user_id):
+    """Sends the next reads of the request of the user to a replica, unless the user recently wrote."""
+    if settings.DATABASE_REPLICAS and not read_after_write.wrote_recently(user_id):
+        _read_alias.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+async def aread_from_replica(user_id):
+    """Async counterpart of read_from_replica()."""
+    if settings.DATABASE_REPLICAS and not await read_after_write.awrote_recently(user_id):
+        _read_alias.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    """
+    Reads from the primary unless a view sends the reads of the request to a replica, and keeps the reads of a user on
+    the primary for a while after a successful write of the user. Unused without replicas.
+    """
+    if not settings.DATABASE_REPLICAS:
+        raise MiddlewareNotUsed
+
+    def get_writer(request, response):
+        """Returns the pk of the user who wrote with the request, or None."""
+        user = getattr(request, "user", None)
+        if request.method in SAFE_METHODS or response.status_code >= 400 or user is None or not user.is_authenticated:
+            return None
+        return user.pk
+
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _read_alias.set(None)
+            try:
+                response = await get_response(request)
+            finally:
+                _read_alias.reset(token)
+            writer = get_writer(request, response)
+            if writer is not None:
+                await read_after_write.amark(writer)
+            return response
+    else:
+        def middleware(request):
+            token = _read_alias.set(None)
+            try:
+                response = get_response(request)
+            finally:
+                _read_alias.reset(token)
+            writer = get_writer(request, response)
+            if writer is not None:
+                read_after_write.mark(writer)
+            return response
+
+    return middleware
@@ -0,0 +1,127 @@
+"""
+Full-text search over the issues and comments of a project, ranked by relevance.
+
+SQLite searches the FTS5 table api_search, and PostgreSQL the GIN indexes on the tsvector of the issues and comments,
+both created by the migration 0010_search. Other databases fall back to unranked substring matches.
+
+The results are ranked in tiers: the issues whose title matches, then the issues matching by their description, then
+the comments, the latest first in each tier. Scores such as bm25 or ts_rank are computed for every match, and bm25
+also counts the rows of the whole table containing each word, so a word common to most rows would take hundreds of
+milliseconds on a million comments. The tiers are read in the order of the index and stop at the limit instead.
+"""
+import re
+from typing import NamedTuple, Optional
+
+from django.db import connection
+from django.db.models import Q
+
+from api.models import Comment, Issue
+
+# Longest query accepted, in characters
+MAX_SEARCH_QUERY_LENGTH = 256
+
+# Words of a query on SQLite, each one matched as a quoted string so that FTS5 operators are not interpreted
+WORD = re.compile(r"\w+")
+
+# The rowids of api_search are 2 * issue_id for the issues and 2 * comment_id + 1 for the comments, so a tier is read
+# from its latest issue or comment
+SQLITE_QUERY = """
+    SELECT issue_id, comment_id, title, description
+    FROM api_search
+    WHERE api_search MATCH %s
+    ORDER BY rowid DESC
+    LIMIT %s
+"""
+
+# The tsvector expressions must stay identical to the ones of the GIN indexes for the planner to use them
+POSTGRESQL_QUERY = """
+    WITH search AS (SELECT websearch_to_tsquery('english', %s) AS query)
+    SELECT issue_id, comment_id, title, description FROM (
+        SELECT issue.issue_id, NULL::bigint AS comment_id, issue.title, issue.description,
+               CASE WHEN to_tsvector('english'::regconfig, COALESCE(issue.title, '')) @@ search.query
+                    THEN 1 ELSE 2 END AS tier,
+               issue.issue_id AS id
+        FROM api_issue issue, search
+        WHERE issue.project_id = %s
+        AND to_tsvector('english'::regconfig, COALESCE(issue.title, '') || ' ' || COALESCE(issue.description, ''))
+            @@ search.query
+        UNION ALL
+        SELECT comment.issue_id, comment.comment_id, NULL, comment.description, 3, comment.comment_id
+        FROM api_comment comment JOIN api_issue issue ON issue.issue_id = comment.issue_id, search
+        WHERE issue.project_id = %s
+        AND to_tsvector('english'::regconfig, COALESCE(comment.description, '')) @@ search.query
+    ) results
+    ORDER BY tier, id DESC
+    LIMIT %s
+"""
+
+
+class SearchResult(NamedTuple):
+    """Issue, or comment of an issue, matching a search. Comments have no title."""
+
+    type: str
+    issue_id: int
+    comment_id: Optional[int]
+    title: Optional[str]
+    description: str
+
+
+def search_project(project, query, limit):
+    """Returns the limit issues and comments of the project most relevant to the query, as SearchResult."""
+    if connection.vendor == "sqlite":
+        return search_sqlite(project, query, limit)
+    if connection.vendor == "postgresql":
+        return fetch_results(POSTGRESQL_QUERY, [query, project.pk, project.pk, limit])
+    return search_substrings(project, query, limit)
+
+
+def search_sqlite(project, query, limit):
+    """
+    Searches the FTS5 table for the issues, then the comments, of the project containing every word of the query, a
+    tier after the other until the limit is reached.
+    """
+    words = WORD.findall(query)
+    if not words:
+        return []
+    terms = " ".join(f'"{word}"' for word in words)
+    issues, comments = f'project : "i{project.pk}"', f'project : "c{project.pk}"'
+    tiers = [
+        f"{issues} AND title : ({terms})",
+        f"{issues} AND ({{title description}} : ({terms}) NOT title : ({terms}))",
+        f"{comments} AND description : ({terms})",
+    ]
+    results = []
+    for match in tiers:
+        results += fetch_results(SQLITE_QUERY, [match, limit - len(results)])
+        if len(results) == limit:
+            break
+    return results
+
+
+def fetch_results(sql, params):
+    """Runs a search query returning (issue_id, comment_id, title, description) rows."""
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            SearchResult("issue" if comment_id is None else "comment", issue_id, comment_id, title, description)
+            for issue_id, comment_id, title, description in cursor.fetchall()
+        ]
+
+
+def search_substrings(project, query, limit):
+    """Returns the latest issues, then comments, containing every word of the query, without ranking them."""
+    words = query.split()
+    issue_filter, comment_filter = Q(), Q()
+    for word in words:
+        issue_filter &= Q(title__icontains=word) | Q(description__icontains=word)
+        comment_filter &= Q(description__icontains=word)
+
+    issues = Issue.objects.filter(issue_filter, project=project).order_by("-created_time") \
+        .values_list("issue_id", "title", "description")[:limit]
+    results = [SearchResult("issue", issue_id, None, title, description) for issue_id, title, description in issues]
+    comments = Comment.objects.filter(comment_filter, issue__project=project).order_by("-created_time") \
+        .values_list("issue_id", "comment_id", "description")[:limit - len(results)]
+    return results + [
+        SearchResult("comment", issue_id, comment_id, None, description)
+        for issue_id, comment_id, description in comments
+    ]
@@ -1,20 +1,195 @@
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ObjectDoesNotExist
-from rest_framework.serializers import ModelSerializer, SerializerMethodField, ValidationError, CharField
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-
+from django.db.models import Manager
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.serializers import (
+    BaseSerializer, ModelSerializer, ListSerializer, ManyRelatedField, RelatedField,
+    ValidationError, CharField, ChoiceField, IntegerField, ReadOnlyField,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.access import get_project_access
+from api.backends import aauthenticate
+from api.cache import membership_cache, token_denylist
+from api.fieldsets import PLAN_CACHE_SIZE, Expansion, FieldSelection
+from api.instrumentation import timed
 from api.models import Project, Issue, Comment, Contributor, CustomUser
 
 
 def contributor(user, project):
     """Verifies if a user is a contributor of the project."""
 
-    try:
-        Contributor.objects.get(user=user, project=project)
-    except Contributor.DoesNotExist:
-        return False
-    else:
-        return True
+    return membership_cache.get(user.pk).role(project.pk) is not None
+
+
+class TimedListSerializer(ListSerializer):
+    """List serializer recording the serialization time of sampled requests."""
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+# Fields whose representation of a non-null value read from the database is the value itself
+IDENTITY_FIELDS = (CharField, IntegerField, ReadOnlyField)
+
+# Fields reading related objects rather than a column
+RELATION_FIELDS = (BaseSerializer, RelatedField, ManyRelatedField)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def get_fast_fields(serializer_class, selection=None):
+    """
+    Returns the (field name, source, converter) of the readable fields of a serializer for the requested fields (see
+    api.fieldsets), or None if a field reads a relation, a property or calls a method. The converter is None when the
+    representation of a value is the value itself, and maps the choices of a field to their representations computed
+    once.
+    """
+    model = getattr(serializer_class.Meta, 'model', None)
+    columns = {field.attname for field in model._meta.concrete_fields} if model is not None else set()
+    serializer = serializer_class(selection=selection) if selection is not None else serializer_class()
+    fast_fields = []
+    for field in serializer._readable_fields:
+        if '.' in field.source or field.source == '*' or isinstance(field, RELATION_FIELDS):
+            return None
+        if isinstance(field, ReadOnlyField) and field.source not in columns:
+            return None
+        if type(field) is ChoiceField:
+            representations = {value: field.to_representation(value) for value in field.choices}
+            if all(value == representation for value, representation in representations.items()):
+                converter = None
+            else:
+                converter = partial(map_choice, representations)
+        elif isinstance(field, IDENTITY_FIELDS):
+            converter = None
+        else:
+            converter = field.to_representation
+        fast_fields.append((field.field_name, field.source, converter))
+    return fast_fields
+
+
+def map_choice(representations, value):
+    """Returns the representation of a choice, or the value if it is not a choice, like ChoiceField."""
+    return representations.get(value, value)
+
+
+def get_values_fields(serializer_class, selection=None):
+    """
+    Returns the fields to fetch with values() for a list serialized with the fast path of FastListSerializer, or None
+    if the serializer does not support it.
+    """
+    if not settings.API_FAST_LIST_SERIALIZERS:
+        return None
+    list_serializer_class = getattr(serializer_class.Meta, 'list_serializer_class', None)
+    if list_serializer_class is None or not issubclass(list_serializer_class, FastListSerializer):
+        return None
+    fast_fields = get_fast_fields(serializer_class, selection)
+    return None if fast_fields is None else [source for _, source, _ in fast_fields]
+
+
+class TimedSerializerMixin:
+    """Mixin recording the serialization time of sampled requests, for single objects and lists of objects."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, "Meta", None)
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class SparseFieldsMixin:
+    """
+    Mixin of the serializers whose fields can be chosen by the clients (see api.fieldsets).
+    The selection keyword argument restricts the fields to the requested ones and embeds the requested relations of
+    expandable_fields, a dict of Expansion by field name. The relations listed in Meta.fields are embedded by default.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, selection=None, **kwargs):
+        self.selection = selection
+        super().__init__(*args, **kwargs)
+
+    def get_field_names(self, declared_fields, info):
+        # The relations are built by get_fields()
+        return [
+            name for name in super().get_field_names(declared_fields, info) if name not in self.expandable_fields
+        ]
+
+    def get_fields(self):
+        """Returns the requested fields, in the order of Meta.fields followed by the other expandable relations."""
+        fields = super().get_fields()
+        names = [name for name in self.Meta.fields if name in fields or name in self.expandable_fields]
+        names += [name for name in self.expandable_fields if name not in names]
+        selection = self.selection or FieldSelection()
+        self.check_selection(selection, names)
+        requested = self.Meta.fields if selection.fields is None else selection.fields
+        return {
+            name: (
+                self.expandable_fields[name].build(name, selection.get_nested(name))
+                if name in self.expandable_fields else fields[name]
+            )
+            for name in names if name in requested or name in selection.expand
+        }
+
+    def check_selection(self, selection, names):
+        """Raises a ValidationError if the selection requests fields or relations the serializer does not have."""
+        unknown_fields = sorted((selection.fields or set()) - set(names))
+        if unknown_fields:
+            raise ValidationError(
+                {'fields': f"Unknown fields {', '.join(unknown_fields)}, expected some of {', '.join(names)}."}
+            )
+        unknown_relations = sorted(selection.expand - self.expandable_fields.keys())
+        if unknown_relations:
+            expected = ', '.join(self.expandable_fields) or 'none'
+            raise ValidationError(
+                {'expand': f"Unknown relations {', '.join(unknown_relations)}, expected some of {expected}."}
+            )
+
+
+class FastListSerializer(TimedListSerializer):
+    """
+    List serializer of read-only lists which, when settings.API_FAST_LIST_SERIALIZERS is set, produces the data of
+    the child serializer without running its fields for every row. The rows are model instances, or dicts fetched
+    with values() by the views (see get_values_fields()), and only the values of choices with another representation
+    are converted. Falls back to the child serializer when a field reads a relation or calls a method.
+    """
+
+    def to_representation(self, data):
+        fast_fields = None
+        if settings.API_FAST_LIST_SERIALIZERS:
+            fast_fields = get_fast_fields(type(self.child), getattr(self.child, 'selection', None))
+        if fast_fields is None:
+            return super().to_representation(data)
+
+        rows = data.all() if isinstance(data, Manager) else data
+        readers = None
+        representations = []
+        for row in rows:
+            if readers is None:
+                getter = itemgetter if isinstance(row, dict) else attrgetter
+                readers = [(name, getter(source), converter) for name, source, converter in fast_fields]
+            representation = {}
+            for name, read, converter in readers:
+                value = read(row)
+                representation[name] = value if value is None or converter is None else converter(value)
+            representations.append(representation)
+        return representations
 
 
 class RegisterSerializer(ModelSerializer):
@@ -39,33 +214,76 @@ class RegisterSerializer(ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        """Creates a custom user."""
+        """Creates a custom user with a single insert."""
+
+        user = self.build_user(validated_data)
+        user.set_password(validated_data['password'])
+        user.save()
+        return user
+
+    async def acreate(self, validated_data):
+        """Async counterpart of create(), which does not hold a thread while the password is hashed."""
+
+        user = self.build_user(validated_data)
+        await user.aset_password(validated_data['password'])
+        await sync_to_async(user.save)()
+        return user
+
+    @staticmethod
+    def build_user(validated_data):
+        """Returns the unsaved custom user, without password."""
 
-        user = CustomUser.objects.create(
+        return CustomUser(
             email=validated_data['email'],
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name']
         )
 
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
-
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
-    """Custom ObtainTokenPair Serializer from simple JWT to add a custom claim."""
+    """Custom ObtainTokenPair Serializer from simple JWT to add custom claims."""
 
     @classmethod
     def get_token(cls, user):
-        """Gets token and add a claim."""
+        """Gets token and add the claims the ClaimsUser of the authenticated requests is built from."""
         token = super(MyTokenObtainPairSerializer, cls).get_token(user)
 
-        # Add custom claim
+        # Add custom claims
         token['email'] = user.email
+        token['staff'] = user.staff
+        token['admin'] = user.admin
         return token
 
+    async def avalidate(self, attrs):
+        """
+        Async counterpart of validate(), fetching the user with the async ORM and checking the password in the
+        password hashing pool.
+        """
+        self.user = await aauthenticate(
+            self.context.get('request'),
+            **{self.username_field: attrs[self.username_field], 'password': attrs['password']},
+        )
+        if not jwt_settings.USER_AUTHENTICATION_RULE(self.user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        refresh = self.get_token(self.user)
+        data = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, self.user)
+        return data
+
 
-class UserSerializer(ModelSerializer):
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """Custom TokenRefresh Serializer from simple JWT refusing the refresh tokens revoked in the token denylist."""
+
+    def validate(self, attrs):
+        """Checks that the refresh token is not revoked before refreshing it."""
+        if token_denylist.is_revoked(self.token_class(attrs['refresh'])):
+            raise InvalidToken(_("Token has been revoked"))
+        return super().validate(attrs)
+
+
+class UserSerializer(SparseFieldsMixin, ModelSerializer):
     """User serializer"""
 
     class Meta:
@@ -73,43 +291,57 @@ class UserSerializer(ModelSerializer):
         fields = ["first_name", "last_name", "email"]
 
 
-class ContributorDetailSerializer(ModelSerializer):
+class ContributorDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Contributor serializer for a specific detailed contributor."""
 
-    user = UserSerializer()
+    expandable_fields = {"user": Expansion(UserSerializer, "user")}
 
     class Meta:
         model = Contributor
         fields = ["user_id", "project_id", "permission", "role", 'user']
 
 
-class ContributorListSerializer(ModelSerializer):
+class ContributorListSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Contributor serializer for a list of contributors."""
 
+    expandable_fields = ContributorDetailSerializer.expandable_fields
+
     class Meta:
         model = Contributor
         fields = ["id", "user_id", "permission", "role"]
+        list_serializer_class = FastListSerializer
 
 
-class CommentListSerializer(ModelSerializer):
+class CommentListSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Comment serializer for a list of comments."""
 
+    expandable_fields = {"author": Expansion(UserSerializer, "author_user")}
+
     class Meta:
         model = Comment
         fields = ["comment_id", "description", "author_user_id"]
+        list_serializer_class = FastListSerializer
 
 
-class CommentDetailSerializer(ModelSerializer):
+class CommentDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Comment serializer for a specific detailed comment."""
 
+    expandable_fields = CommentListSerializer.expandable_fields
+
     class Meta:
         model = Comment
         fields = ["comment_id", "description", "issue_id", "author_user_id", "created_time"]
 
 
-class IssueListSerializer(ModelSerializer):
+class IssueListSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Issue serializer for a list of issues."""
 
+    expandable_fields = {
+        "comments": Expansion(CommentListSerializer, "comments", many=True),
+        "author": Expansion(UserSerializer, "author_user"),
+        "assignee": Expansion(UserSerializer, "assignee_user"),
+    }
+
     class Meta:
         model = Issue
         fields = [
@@ -122,28 +354,71 @@ class IssueListSerializer(ModelSerializer):
             "author_user_id",
             "assignee_user_id",
         ]
+        list_serializer_class = FastListSerializer
 
     def validate(self, data):
         """
         Verifies if an assignee user is part of the project contributors.
         If he is not, returns an error.
+        Adds the assignee user to the validated data.
         """
 
         request = self.context.get("request")
-        project = Project.objects.get(pk=request.parser_context['kwargs']['project_pk'])
+        project = get_project_access(request, request.parser_context['kwargs']['project_pk']).project
         try:
             assignee_user = CustomUser.objects.get(pk=self._kwargs['data']['assignee_user'])
         except ObjectDoesNotExist:
             raise ValidationError(f"{self._kwargs['data']['assignee_user']} does not match any user id.")
-        if not (contributor(assignee_user, project) or assignee_user == project.author_user):
+        if not (contributor(assignee_user, project) or assignee_user.pk == project.author_user_id):
             raise ValidationError(f"assignee_user {assignee_user.user_id} is no author nor contributor of this project")
+        data['assignee_user'] = assignee_user
         return data
 
 
-class IssueDetailSerializer(ModelSerializer):
+class IssueBulkSerializer(ModelSerializer):
+    """
+    Issue serializer for an item of a bulk request.
+    The assignee user is validated against the member ids of the project given in the context, so that validating
+    many issues does not query the database.
+    """
+
+    assignee_user = IntegerField()
+
+    class Meta:
+        model = Issue
+        fields = [
+            "title",
+            "description",
+            "tag",
+            "priority",
+            "status",
+            "assignee_user",
+        ]
+
+    def validate_assignee_user(self, value):
+        """Verifies if an assignee user is the author or a contributor of the project."""
+
+        if value not in self.context["member_ids"]:
+            raise ValidationError(f"assignee_user {value} is no author nor contributor of this project")
+        return value
+
+
+class UserIssueSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
+    """Issue serializer for the issues of the user across projects."""
+
+    expandable_fields = IssueListSerializer.expandable_fields
+
+    class Meta:
+        model = Issue
+        fields = IssueListSerializer.Meta.fields + ["project_id", "created_time"]
+        read_only_fields = fields
+        list_serializer_class = FastListSerializer
+
+
+class IssueDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Issue serializer for a specific detailed issue."""
 
-    comments = SerializerMethodField()
+    expandable_fields = IssueListSerializer.expandable_fields
 
     class Meta:
         model = Issue
@@ -161,42 +436,37 @@ class IssueDetailSerializer(ModelSerializer):
             "comments"
         ]
 
-    def get_comments(self, instance):
-        """Gets a list of comments for a particular issue."""
-
-        queryset = instance.comments.all()
-        serializer = CommentListSerializer(queryset, many=True)
-        return serializer.data
 
-
-class ProjectListSerializer(ModelSerializer):
+class ProjectListSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
     """Project serializer for a list of projects."""
 
+    expandable_fields = {
+        "users": Expansion(ContributorListSerializer, "contributors", many=True),
+        "issues": Expansion(IssueListSerializer, "issues", many=True),
+        "author": Expansion(UserSerializer, "author_user"),
+    }
+
     class Meta:
         model = Project
         fields = ["project_id", "title", "description", "type", "author_user_id"]
+        list_serializer_class = FastListSerializer
 
 
-class ProjectDetailSerializer(ModelSerializer):
-    """Project serializer for a specific detailed project."""
+class ProjectCountsSerializer(ProjectListSerializer):
+    """Project serializer for a list of projects annotated with their number of issues and contributors."""
 
-    issues = SerializerMethodField()
-    users = SerializerMethodField()
+    issues_count = IntegerField(read_only=True)
+    users_count = IntegerField(read_only=True)
 
-    class Meta:
-        model = Project
-        fields = ["project_id", "title", "description", "type", "author_user_id", "users", "issues"]
+    class Meta(ProjectListSerializer.Meta):
+        fields = ProjectListSerializer.Meta.fields + ["issues_count", "users_count"]
 
-    def get_issues(self, instance):
-        """Gets a list of issues for a particular project."""
 
-        queryset = instance.issues.all()
-        serializer = IssueListSerializer(queryset, many=True)
-        return serializer.data
+class ProjectDetailSerializer(TimedSerializerMixin, SparseFieldsMixin, ModelSerializer):
+    """Project serializer for a specific detailed project."""
 
-    def get_users(self, instance):
-        """Gets a list of contributors for a particular project."""
+    expandable_fields = ProjectListSerializer.expandable_fields
 
-        queryset = instance.contributors.all()
-        serializer = ContributorListSerializer(queryset, many=True)
-        return serializer.data
+    class Meta:
+        model = Project
+        fields = ["project_id", "title", "description", "type", "author_user_id", "users", "issues"]
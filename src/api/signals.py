@@ -0,0 +1,77 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from api.cache import membership_cache, bump_project_versions_on_commit, token_denylist
+from api.models import Project, Contributor, Issue, Comment, CustomUser, users_updated
+from api.serializers import UserSerializer
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+@receiver([post_save, post_delete], sender=Project)
+def invalidate_memberships(sender, instance, **kwargs):
+    """
+    Invalidates the cached memberships of the user of a saved or deleted contributor, or of the author of a saved or
+    deleted project, and of the previous one if it changed, once the transaction is committed.
+    """
+    membership_cache.invalidate_on_commit(*instance.get_member_ids())
+    instance.loaded_member_id = getattr(instance, instance.member_field)
+
+
+@receiver([post_save, post_delete], sender=Contributor)
+@receiver([post_save, post_delete], sender=Issue)
+def bump_version_of_project(sender, instance, **kwargs):
+    """Bumps the version of the project of a saved or deleted contributor or issue."""
+    bump_project_versions_on_commit(project_id=instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_version_of_issue_project(sender, instance, **kwargs):
+    """Bumps the version of the project of the issue of a saved or deleted comment."""
+    bump_project_versions_on_commit(issue_id=instance.issue_id)
+
+
+@receiver(post_save, sender=Project)
+def bump_version_of_saved_project(sender, instance, created, **kwargs):
+    """Bumps the version of a modified project."""
+    if not created:
+        bump_project_versions_on_commit(project_id=instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_version_of_user_projects(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Bumps the versions of the projects whose responses can embed a modified user, e.g. with ?expand=author, unless
+    only fields the responses do not embed were saved, e.g. the last login.
+    """
+    if not created and (update_fields is None or set(update_fields) & set(UserSerializer.Meta.fields)):
+        bump_project_versions_on_commit(user_id=instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_tokens_of_updated_user(sender, instance, created, **kwargs):
+    """Revokes the tokens of a user who is deactivated or whose password changes."""
+    # AbstractBaseUser keeps the new raw password until the end of save()
+    if not created and (not instance.is_active or instance._password is not None):
+        token_denylist.revoke_user(instance.pk)
+
+
+@receiver(users_updated, sender=CustomUser)
+def handle_updated_users(sender, pks, values, **kwargs):
+    """
+    Counterpart of the post_save receivers of CustomUser for the users updated by a single query, e.g. deactivated
+    with CustomUser.objects.filter(...).update(is_active=False): revokes their tokens if they may be deactivated or
+    their password changes, and bumps the versions of the projects which can embed them.
+    """
+    # Values computed by the database, e.g. by bulk_update(), may deactivate the users
+    if "password" in values or values.get("is_active", True) is not True:
+        for pk in pks:
+            token_denylist.revoke_user(pk)
+    if set(values) & set(UserSerializer.Meta.fields):
+        for pk in pks:
+            bump_project_versions_on_commit(user_id=pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_tokens_of_deleted_user(sender, instance, **kwargs):
+    """Revokes the tokens of a deleted user."""
+    token_denylist.revoke_user(instance.pk)
@@ -0,0 +1,50 @@
+"""
+Base classes of the test cases of the API, which run with in-process caches emptied before each test, so that the
+tests neither depend on each other through the caches nor touch the caches of the working tree, e.g. the token
+denylist stored in BASE_DIR/.token-denylist.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework import test
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Backends whose entries only live in the memory of the process
+IN_PROCESS_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache", "api.cache.LRUCache")
+
+# The configured caches, the ones stored outside of the process being replaced by private in-memory caches
+TEST_CACHES = {
+    alias: config if config["BACKEND"] in IN_PROCESS_BACKENDS else {
+        **config, "BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": f"test-{alias}",
+    }
+    for alias, config in settings.CACHES.items()
+}
+
+
+def clear_caches():
+    """Empties the caches of the tests."""
+    for alias in TEST_CACHES:
+        caches[alias].clear()
+
+
+def authenticate(client, user):
+    """Authenticates the requests of the client as the user, with a new access token."""
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+
+class ClearCachesMixin:
+    """Mixin emptying the caches before each test."""
+
+    def setUp(self):
+        super().setUp()
+        clear_caches()
+
+
+@override_settings(CACHES=TEST_CACHES)
+class APITestCase(ClearCachesMixin, test.APITestCase):
+    """Test case of the API, run in a transaction rolled back after each test."""
+
+
+@override_settings(CACHES=TEST_CACHES)
+class APITransactionTestCase(ClearCachesMixin, test.APITransactionTestCase):
+    """Test case of the API whose transactions are committed, so that the transaction.on_commit() callbacks run."""
@@ -0,0 +1,81 @@
+"""
+Projects are only visible to their author and contributors: the list of the other users leaves them out, and their
+detail, issues, contributors and comments are not found.
+"""
+from api.models import Comment, Contributor, CustomUser, Issue, Project
+from api.tests.base import APITestCase, authenticate
+
+
+class ProjectAccessTests(APITestCase):
+    """Checks the projects a user reaches depending on whether they authored it, contribute to it or neither."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.contributor, cls.outsider = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("author", "contributor", "outsider")
+        ]
+        cls.project = Project.objects.create(
+            title="Project", description="Description", type=Project.Type.BACK_END, author_user=cls.author
+        )
+        cls.membership = Contributor.objects.create(
+            project=cls.project, user=cls.contributor, permission=Contributor.Permission.MEMBER,
+            role=Contributor.Role.DEVELOPER,
+        )
+        cls.issue = Issue.objects.create(
+            title="Issue", description="Description", tag=Issue.Tag.BUG, priority=Issue.Priority.LOW,
+            status=Issue.Status.TO_DO, project=cls.project, author_user=cls.author, assignee_user=cls.contributor,
+        )
+        cls.comment = Comment.objects.create(description="Comment", author_user=cls.contributor, issue=cls.issue)
+
+    def get(self, user, path):
+        """Returns the response of a GET request of the path by the user."""
+        authenticate(self.client, user)
+        return self.client.get(path)
+
+    def test_project_list(self):
+        for user, expected in ((self.author, [self.project.pk]), (self.contributor, [self.project.pk]),
+                               (self.outsider, [])):
+            with self.subTest(user=user.email):
+                response = self.get(user, "/projects/")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([project["project_id"] for project in response.data["results"]], expected)
+
+    def test_project_detail(self):
+        path = f"/projects/{self.project.pk}/"
+        for user in (self.author, self.contributor):
+            with self.subTest(user=user.email):
+                response = self.get(user, path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data["project_id"], self.project.pk)
+        self.assertEqual(self.get(self.outsider, path).status_code, 404)
+
+    def test_outsider_cannot_update_or_delete(self):
+        authenticate(self.client, self.outsider)
+        path = f"/projects/{self.project.pk}/"
+        self.assertEqual(self.client.patch(path, {"title": "Renamed"}).status_code, 404)
+        self.assertEqual(self.client.delete(path).status_code, 404)
+        self.assertEqual(Project.objects.get(pk=self.project.pk).title, "Project")
+
+    def test_contributor_cannot_update(self):
+        authenticate(self.client, self.contributor)
+        response = self.client.patch(f"/projects/{self.project.pk}/", {"title": "Renamed"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Project.objects.get(pk=self.project.pk).title, "Project")
+
+    def test_project_resources(self):
+        project_pk, issue_pk = self.project.pk, self.issue.pk
+        for path in (f"/projects/{project_pk}/users/", f"/projects/{project_pk}/users/{self.membership.pk}/",
+                     f"/projects/{project_pk}/issues/", f"/projects/{project_pk}/issues/{issue_pk}/",
+                     f"/projects/{project_pk}/issues/{issue_pk}/comments/",
+                     f"/projects/{project_pk}/issues/{issue_pk}/comments/{self.comment.pk}/"):
+            with self.subTest(path=path):
+                self.assertEqual(self.get(self.contributor, path).status_code, 200)
+                self.assertEqual(self.get(self.outsider, path).status_code, 403)
+
+    def test_unknown_project(self):
+        self.assertEqual(self.get(self.author, f"/projects/{self.project.pk + 1}/").status_code, 404)
+
+    def test_anonymous(self):
+        self.assertEqual(self.client.get("/projects/").status_code, 401)
+        self.assertEqual(self.client.get(f"/projects/{self.project.pk}/").status_code, 401)
@@ -0,0 +1,101 @@
+"""
+The JWTs of a user are revoked when their password changes and when they are deactivated or deleted, whether the user
+is saved or updated by a query, so that the authentication, which does not read the user, refuses them.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+
+from api.models import CustomUser
+from api.serializers import MyTokenObtainPairSerializer
+from api.tests.base import APITestCase
+
+
+def issue_tokens(user, age=10):
+    """
+    Returns the access and refresh tokens of a login of the user age seconds ago: tokens issued during the second of
+    a revocation stay valid (see TokenDenylist.revoke_user).
+    """
+    refresh = MyTokenObtainPairSerializer.get_token(user)
+    access = refresh.access_token
+    for token in (refresh, access):
+        token.set_iat(at_time=token.current_time - timedelta(seconds=age))
+    return str(access), str(refresh)
+
+
+class TokenRevocationTests(APITestCase):
+    """Checks that the tokens issued before a change of a user are refused, and only theirs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("user", "other")
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.access, self.refresh = issue_tokens(self.user)
+        self.other_access, _ = issue_tokens(self.other)
+
+    def get_projects(self, access):
+        """Returns the status code of the project list requested with the access token."""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return self.client.get("/projects/").status_code
+
+    def refresh_status(self, refresh):
+        """Returns the status code of the refresh of the refresh token."""
+        return self.client.post("/login/refresh/", {"refresh": refresh}).status_code
+
+    def assertRevoked(self):
+        """Asserts that the tokens of the user are refused, and that the ones of the other user are not."""
+        self.assertEqual(self.get_projects(self.access), 401)
+        self.assertEqual(self.refresh_status(self.refresh), 401)
+        self.assertEqual(self.get_projects(self.other_access), 200)
+
+    def assertNotRevoked(self):
+        """Asserts that the tokens of the user are accepted."""
+        self.assertEqual(self.get_projects(self.access), 200)
+        self.assertEqual(self.refresh_status(self.refresh), 200)
+
+    def test_password_change(self):
+        self.user.set_password("new password")
+        self.user.save()
+        self.assertRevoked()
+
+        # A login with the new password issues valid tokens
+        self.client.credentials()
+        response = self.client.post("/login/", {"email": self.user.email, "password": "new password"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_projects(response.data["access"]), 200)
+        self.assertEqual(self.refresh_status(response.data["refresh"]), 200)
+
+    def test_deactivation(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertRevoked()
+
+    def test_deletion(self):
+        self.user.delete()
+        self.assertEqual(self.get_projects(self.access), 401)
+        self.assertEqual(self.get_projects(self.other_access), 200)
+
+    def test_queryset_password_update(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(password=make_password("new password"))
+        self.assertRevoked()
+
+    def test_queryset_deactivation(self):
+        CustomUser.objects.filter(email__in=[self.user.email]).update(is_active=False)
+        self.assertRevoked()
+
+    def test_revoke_tokens_command(self):
+        call_command("revoke_tokens", user=[self.user.email], stdout=StringIO())
+        self.assertRevoked()
+
+    def test_other_changes(self):
+        self.user.first_name = "Renamed"
+        self.user.save()
+        CustomUser.objects.filter(pk=self.user.pk).update(last_name="Renamed")
+        self.assertNotRevoked()
@@ -0,0 +1,133 @@
+"""
+/projects/:project_id/issues/bulk/ validates every item before writing anything: a single invalid item answers 400
+with a result per item, and no issue is created, modified or deleted. Only their author can modify or delete issues.
+"""
+from django.test import override_settings
+
+from api.models import Contributor, CustomUser, Issue, Project
+from api.tests.base import APITestCase, authenticate
+
+
+class BulkIssueTests(APITestCase):
+    """Checks the results of the bulk creations, modifications and deletions of issues."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.contributor, cls.outsider = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("author", "contributor", "outsider")
+        ]
+        cls.project = Project.objects.create(
+            title="Project", description="Description", type=Project.Type.BACK_END, author_user=cls.author
+        )
+        Contributor.objects.create(
+            project=cls.project, user=cls.contributor, permission=Contributor.Permission.MEMBER,
+            role=Contributor.Role.DEVELOPER,
+        )
+        cls.issues = [
+            Issue.objects.create(
+                title=f"Issue {index}", description="Description", tag=Issue.Tag.BUG, priority=Issue.Priority.LOW,
+                status=Issue.Status.TO_DO, project=cls.project, author_user=author, assignee_user=cls.contributor,
+            )
+            for index, author in enumerate((cls.author, cls.author, cls.contributor))
+        ]
+        cls.path = f"/projects/{cls.project.pk}/issues/bulk/"
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.author)
+
+    def item(self, **kwargs):
+        """Returns the data of a valid issue, updated with kwargs."""
+        return {
+            "title": "New issue", "description": "Description", "tag": "T", "priority": "H", "status": "TD",
+            "assignee_user": self.contributor.pk, **kwargs,
+        }
+
+    def assertResults(self, response, status_code, statuses):
+        """Asserts the status of the response and of each of its results, and returns the results."""
+        self.assertEqual(response.status_code, status_code)
+        results = response.data["results"]
+        self.assertEqual([result["status"] for result in results], statuses)
+        return results
+
+    def assertUnchanged(self):
+        """Asserts that the issues of the project are the ones of the test data."""
+        issues = Issue.objects.filter(project=self.project).order_by("pk")
+        self.assertEqual([(issue.pk, issue.status) for issue in issues],
+                         [(issue.pk, Issue.Status.TO_DO) for issue in self.issues])
+
+    def test_create(self):
+        response = self.client.post(self.path, [self.item(title="First"), self.item(title="Second")], format="json")
+        results = self.assertResults(response, 201, [201, 201])
+        self.assertEqual([result["data"]["title"] for result in results], ["First", "Second"])
+        created = Issue.objects.filter(pk__in=[result["data"]["issue_id"] for result in results])
+        self.assertEqual({issue.author_user_id for issue in created}, {self.author.pk})
+
+    def test_create_invalid_item(self):
+        items = [self.item(), self.item(assignee_user=self.outsider.pk), self.item(tag="X")]
+        results = self.assertResults(self.client.post(self.path, items, format="json"), 400, [201, 400, 400])
+        self.assertNotIn("data", results[0])
+        self.assertIn("assignee_user", results[1]["errors"])
+        self.assertIn("tag", results[2]["errors"])
+        self.assertUnchanged()
+
+    def test_update(self):
+        items = [{"issue_id": issue.pk, "status": "C"} for issue in self.issues[:2]]
+        results = self.assertResults(self.client.patch(self.path, items, format="json"), 200, [200, 200])
+        self.assertEqual([result["data"]["status"] for result in results], ["C", "C"])
+        self.assertEqual(Issue.objects.filter(status=Issue.Status.COMPLETED).count(), 2)
+
+    def test_update_errors(self):
+        first, second, other = self.issues
+        items = [
+            {"issue_id": first.pk, "status": "C"},
+            {"issue_id": other.pk + 100, "status": "C"},
+            {"issue_id": True, "status": "C"},
+            {"issue_id": str(second.pk), "status": "C"},
+            {"issue_id": first.pk, "status": "IP"},
+            {"issue_id": other.pk, "status": "C"},
+            {"issue_id": second.pk, "status": "X"},
+        ]
+        results = self.assertResults(
+            self.client.patch(self.path, items, format="json"), 400, [200, 404, 400, 400, 400, 403, 400]
+        )
+        self.assertEqual(results[1]["errors"], f"Issue {other.pk + 100} not found.")
+        self.assertEqual(results[2]["errors"], {"issue_id": ["A valid integer is required."]})
+        self.assertEqual(results[4]["errors"], f"Duplicate issue {first.pk}.")
+        self.assertIn("status", results[6]["errors"])
+        self.assertUnchanged()
+
+    def test_update_by_contributor(self):
+        authenticate(self.client, self.contributor)
+        items = [{"issue_id": issue.pk, "status": "C"} for issue in self.issues]
+        self.assertResults(self.client.patch(self.path, items, format="json"), 400, [403, 403, 200])
+        self.assertUnchanged()
+
+    def test_delete(self):
+        ids = [issue.pk for issue in self.issues[:2]]
+        self.assertResults(self.client.delete(self.path, ids, format="json"), 200, [204, 204])
+        self.assertFalse(Issue.objects.filter(pk__in=ids).exists())
+
+    def test_delete_errors(self):
+        first, _, other = self.issues
+        items = [first.pk, other.pk, other.pk + 100, first.pk, False]
+        self.assertResults(self.client.delete(self.path, items, format="json"), 400, [204, 403, 404, 400, 400])
+        self.assertUnchanged()
+
+    def test_delete_by_contributor(self):
+        authenticate(self.client, self.contributor)
+        self.assertResults(self.client.delete(self.path, [self.issues[0].pk], format="json"), 400, [403])
+        self.assertUnchanged()
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.post(self.path, self.item(), format="json").status_code, 400)
+        with override_settings(API_BULK_MAX_ITEMS=1):
+            self.assertEqual(self.client.post(self.path, [self.item(), self.item()], format="json").status_code, 400)
+        self.assertUnchanged()
+
+    def test_outsider(self):
+        authenticate(self.client, self.outsider)
+        self.assertEqual(self.client.post(self.path, [self.item()], format="json").status_code, 403)
+        self.assertEqual(self.client.delete(self.path, [self.issues[0].pk], format="json").status_code, 403)
+        self.assertUnchanged()
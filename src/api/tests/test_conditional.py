@@ -0,0 +1,117 @@
+"""
+The ETag of the responses of a project changes with every write in the project, which bumps its version once the
+transaction commits: the tests commit their transactions, and a client sending back an ETag gets a 304 Not Modified
+response until then.
+"""
+from api.models import Comment, Contributor, CustomUser, Issue, Project
+from api.tests.base import APITransactionTestCase, authenticate
+
+
+class ConditionalRequestTests(APITransactionTestCase):
+    """Checks the ETag of the responses of a project before and after writes."""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.contributor = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("author", "contributor")
+        ]
+        self.project, self.other_project = [
+            Project.objects.create(
+                title=title, description="Description", type=Project.Type.BACK_END, author_user=self.author
+            )
+            for title in ("Project", "Other project")
+        ]
+        Contributor.objects.create(
+            project=self.project, user=self.contributor, permission=Contributor.Permission.MEMBER,
+            role=Contributor.Role.DEVELOPER,
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Description", tag=Issue.Tag.BUG, priority=Issue.Priority.LOW,
+            status=Issue.Status.TO_DO, project=self.project, author_user=self.author, assignee_user=self.contributor,
+        )
+        Comment.objects.create(description="Comment", author_user=self.author, issue=self.issue)
+        self.paths = [
+            f"/projects/{self.project.pk}/",
+            f"/projects/{self.project.pk}/users/",
+            f"/projects/{self.project.pk}/issues/",
+            f"/projects/{self.project.pk}/issues/?expand=assignee",
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/",
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/",
+        ]
+        authenticate(self.client, self.author)
+
+    def get_etags(self):
+        """Returns the ETag of the response of each path."""
+        etags = []
+        for path in self.paths:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            etags.append(response.headers["ETag"])
+        return etags
+
+    def assertNotModified(self, etags):
+        """Asserts that sending back the ETags gives 304 responses."""
+        for path, etag in zip(self.paths, etags):
+            with self.subTest(path=path):
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+
+    def assertModified(self, etags):
+        """Asserts that the ETags changed, and that sending them back gives the new responses, then returns them."""
+        new_etags = self.get_etags()
+        for path, etag, new_etag in zip(self.paths, etags, new_etags):
+            with self.subTest(path=path):
+                self.assertNotEqual(new_etag, etag)
+                self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertNotModified(new_etags)
+        return new_etags
+
+    def test_not_modified(self):
+        etags = self.get_etags()
+        self.assertEqual(self.get_etags(), etags)
+        self.assertNotModified(etags)
+
+    def test_project_update(self):
+        etags = self.get_etags()
+        response = self.client.patch(f"/projects/{self.project.pk}/", {"title": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertModified(etags)
+
+    def test_comment_creation(self):
+        etags = self.get_etags()
+        response = self.client.post(
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/", {"description": "New comment"}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertModified(etags)
+
+    def test_bulk_writes(self):
+        path = f"/projects/{self.project.pk}/issues/bulk/"
+        etags = self.get_etags()
+        response = self.client.patch(path, [{"issue_id": self.issue.pk, "status": "C"}], format="json")
+        self.assertEqual(response.status_code, 200)
+        etags = self.assertModified(etags)
+
+        item = {"title": "New issue", "description": "Description", "tag": "T", "priority": "H", "status": "TD",
+                "assignee_user": self.contributor.pk}
+        self.assertEqual(self.client.post(path, [item], format="json").status_code, 201)
+        etags = self.assertModified(etags)
+
+        new_issue = Issue.objects.get(title="New issue")
+        self.assertEqual(self.client.delete(path, [new_issue.pk], format="json").status_code, 200)
+        self.assertModified(etags)
+
+    def test_user_rename(self):
+        etags = self.get_etags()
+        self.contributor.first_name = "Renamed"
+        self.contributor.save()
+        self.assertModified(etags)
+
+    def test_write_in_another_project(self):
+        etags = self.get_etags()
+        response = self.client.patch(f"/projects/{self.other_project.pk}/", {"title": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_etags(), etags)
+        self.assertNotModified(etags)
@@ -0,0 +1,93 @@
+"""
+The list of the issues of a project accepts the combinations of filters backed by an index of Issue, and rejects the
+other ones with a 400 response listing the supported filters.
+"""
+from datetime import datetime, timedelta, timezone
+
+from api.models import CustomUser, Issue, Project
+from api.tests.base import APITestCase, authenticate
+
+
+class IssueFilterTests(APITestCase):
+    """Checks the issues listed with the filtering and ordering query parameters."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.assignee = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("author", "assignee")
+        ]
+        cls.project = Project.objects.create(
+            title="Project", description="Description", type=Project.Type.BACK_END, author_user=cls.author
+        )
+        # Every combination of status and priority, with the tag of the priority, assigned to one of the users in turn
+        issues = []
+        for status in Issue.Status.values:
+            for priority, tag in zip(Issue.Priority.values, Issue.Tag.values):
+                issues.append(Issue(
+                    title=f"{status} {priority}", description="Description", tag=tag, priority=priority,
+                    status=status, project=cls.project, author_user=cls.author,
+                    assignee_user=(cls.author, cls.assignee)[len(issues) % 2],
+                ))
+        issues = Issue.objects.bulk_create(issues)
+        start = datetime(2022, 1, 1, tzinfo=timezone.utc)
+        for index, issue in enumerate(issues):
+            issue.created_time = start + timedelta(days=index)
+        Issue.objects.bulk_update(issues, ["created_time"])
+        cls.issues = Issue.objects.filter(project=cls.project).order_by("created_time", "issue_id")
+        cls.path = f"/projects/{cls.project.pk}/issues/"
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.author)
+
+    def assertListed(self, query, issues):
+        """Asserts that the list filtered by the query string gives the issues, in their order."""
+        response = self.client.get(f"{self.path}?{query}&limit=100")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([issue["issue_id"] for issue in response.data["results"]], [issue.pk for issue in issues])
+
+    def test_supported_filters(self):
+        self.assertListed("", self.issues)
+        self.assertListed("status=IP", self.issues.filter(status="IP"))
+        self.assertListed("status__in=TD,C", self.issues.filter(status__in=["TD", "C"]))
+        self.assertListed("priority=H", self.issues.filter(priority="H"))
+        self.assertListed("tag=T", self.issues.filter(tag="T"))
+        self.assertListed(f"assignee_user={self.assignee.pk}", self.issues.filter(assignee_user=self.assignee))
+        self.assertListed(
+            f"assignee_user={self.assignee.pk}&status=TD", self.issues.filter(assignee_user=self.assignee, status="TD")
+        )
+
+    def test_ordering_and_range(self):
+        self.assertListed("ordering=-created_time", self.issues.reverse())
+        self.assertListed(
+            "status__in=TD,C&ordering=-created_time", self.issues.filter(status__in=["TD", "C"]).reverse()
+        )
+        self.assertListed(
+            "priority=L&created_time__gte=2022-01-03T00:00:00Z&created_time__lt=2022-01-08T00:00:00Z",
+            self.issues.filter(priority="L", created_time__gte=datetime(2022, 1, 3, tzinfo=timezone.utc),
+                               created_time__lt=datetime(2022, 1, 8, tzinfo=timezone.utc)),
+        )
+
+    def test_unsupported_combinations(self):
+        for query, fields in (("priority=H&tag=T", "priority and tag"), ("status=TD&priority=H", "priority and status"),
+                              (f"assignee_user={self.assignee.pk}&tag=B", "assignee_user and tag")):
+            with self.subTest(query=query):
+                response = self.client.get(f"{self.path}?{query}")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, [
+                    f"Filtering on {fields} together is not supported. Supported filters: assignee_user, "
+                    "assignee_user and status, priority, status, tag."
+                ])
+
+    def test_invalid_values(self):
+        for query in ("status=X", "status__in=TD,X", "status=TD&status__in=C", "priority=0", "assignee_user=a",
+                      "ordering=title", "created_time__gte=yesterday"):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f"{self.path}?{query}").status_code, 400)
+
+    def test_detail_ignores_filters(self):
+        issue = self.issues[0]
+        response = self.client.get(f"{self.path}{issue.pk}/?priority=H&tag=T")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["issue_id"], issue.pk)
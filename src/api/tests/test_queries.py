@@ -0,0 +1,94 @@
+"""
+Number of queries of the list and detail endpoints, which must not depend on the size of the data: each test case runs
+on two datasets, the second one with more projects, contributors, issues and comments, so that a query per row (an
+N+1 query) makes one of them fail.
+"""
+
+from api.tests.base import APITestCase, authenticate
+from benchmarks import data
+
+# Queries of each endpoint with empty caches. The JWT authentication does not query the user, and the endpoints of a
+# project fetch the project then the memberships of the user (see api.access.get_project_access).
+EXPECTED_QUERIES = {
+    # Count and page of the projects
+    "project-list": 2,
+    # Project, memberships, contributors and issues
+    "project-detail": 4,
+    # Project, memberships, count and page of the contributors
+    "project-users-list": 4,
+    # Project, memberships, contributor with its user
+    "project-users-detail": 3,
+    # Project, memberships, page of the issues
+    "project-issues-list": 3,
+    # Project, memberships, issue and its comments
+    "project-issues-detail": 4,
+    # Project, memberships, page of the comments
+    "issue-comments-list": 3,
+    # Project, memberships, comment
+    "issue-comments-detail": 3,
+}
+
+
+class QueryCountTestMixin:
+    """Checks the number of queries of each endpoint on the dataset generated with sizes."""
+
+    sizes = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = data.generate(cls.sizes)
+
+    def setUp(self):
+        # APITestCase empties the membership and response caches, which would otherwise save queries depending on the
+        # previous tests
+        super().setUp()
+        authenticate(self.client, self.dataset.user)
+
+    def assertNumQueriesOfGet(self, route, path):
+        """Asserts that a GET request of the path succeeds with the expected number of queries of the route."""
+        with self.assertNumQueries(EXPECTED_QUERIES[route]):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_list(self):
+        self.assertNumQueriesOfGet("project-list", "/projects/")
+
+    def test_project_detail(self):
+        self.assertNumQueriesOfGet("project-detail", f"/projects/{self.dataset.project.pk}/")
+
+    def test_contributor_list(self):
+        self.assertNumQueriesOfGet("project-users-list", f"/projects/{self.dataset.project.pk}/users/")
+
+    def test_contributor_detail(self):
+        contributor = self.dataset.contributor
+        self.assertNumQueriesOfGet(
+            "project-users-detail", f"/projects/{contributor.project_id}/users/{contributor.pk}/"
+        )
+
+    def test_issue_list(self):
+        self.assertNumQueriesOfGet("project-issues-list", f"/projects/{self.dataset.project.pk}/issues/")
+
+    def test_issue_detail(self):
+        issue = self.dataset.issue
+        self.assertNumQueriesOfGet("project-issues-detail", f"/projects/{issue.project_id}/issues/{issue.pk}/")
+
+    def test_comment_list(self):
+        issue = self.dataset.issue
+        self.assertNumQueriesOfGet(
+            "issue-comments-list", f"/projects/{issue.project_id}/issues/{issue.pk}/comments/"
+        )
+
+    def test_comment_detail(self):
+        comment = self.dataset.comment
+        self.assertNumQueriesOfGet(
+            "issue-comments-detail",
+            f"/projects/{comment.issue.project_id}/issues/{comment.issue_id}/comments/{comment.pk}/",
+        )
+
+
+class SmallDatasetQueryCountTests(QueryCountTestMixin, APITestCase):
+    sizes = {"users": 5, "projects": 2, "contributors_per_project": 2, "issues": 4, "comments_per_issue": 1}
+
+
+class LargeDatasetQueryCountTests(QueryCountTestMixin, APITestCase):
+    sizes = {"users": 30, "projects": 4, "contributors_per_project": 8, "issues": 60, "comments_per_issue": 5}
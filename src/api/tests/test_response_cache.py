@@ -0,0 +1,92 @@
+"""
+The rendered lists of a project are cached until the next write in the project, which bumps its version once the
+transaction commits: the tests commit their transactions.
+"""
+from api.models import Comment, Contributor, CustomUser, Issue, Project
+from api.tests.base import APITransactionTestCase, authenticate
+
+
+class ResponseCacheTests(APITransactionTestCase):
+    """Checks the X-Cache header of the lists of a project before and after writes."""
+
+    def setUp(self):
+        super().setUp()
+        self.author, self.contributor, self.outsider = [
+            CustomUser.objects.create_user(f"{name}@example.com", name.title(), "User", password="password")
+            for name in ("author", "contributor", "outsider")
+        ]
+        self.project = Project.objects.create(
+            title="Project", description="Description", type=Project.Type.BACK_END, author_user=self.author
+        )
+        Contributor.objects.create(
+            project=self.project, user=self.contributor, permission=Contributor.Permission.MEMBER,
+            role=Contributor.Role.DEVELOPER,
+        )
+        self.issue = Issue.objects.create(
+            title="Issue", description="Description", tag=Issue.Tag.BUG, priority=Issue.Priority.LOW,
+            status=Issue.Status.TO_DO, project=self.project, author_user=self.author, assignee_user=self.contributor,
+        )
+        Comment.objects.create(description="Comment", author_user=self.author, issue=self.issue)
+        self.paths = [
+            f"/projects/{self.project.pk}/users/",
+            f"/projects/{self.project.pk}/issues/",
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/comments/",
+        ]
+        authenticate(self.client, self.author)
+
+    def assertCache(self, expected, paths=None):
+        """Asserts the X-Cache header of the responses of the paths, and returns the responses."""
+        responses = []
+        for path in paths or self.paths:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers["X-Cache"], expected)
+                responses.append(response)
+        return responses
+
+    def test_hit_after_miss(self):
+        misses = self.assertCache("MISS")
+        hits = self.assertCache("HIT")
+        for miss, hit in zip(misses, hits):
+            self.assertEqual(hit.content, miss.content)
+            self.assertEqual(hit.headers["Content-Type"], miss.headers["Content-Type"])
+
+    def test_write_invalidates(self):
+        self.assertCache("MISS")
+        self.assertCache("HIT")
+        # IssueListSerializer validates the assignee of every modification, even partial ones
+        response = self.client.patch(
+            f"/projects/{self.project.pk}/issues/{self.issue.pk}/",
+            {"title": "Renamed", "assignee_user": self.contributor.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        misses = self.assertCache("MISS")
+        self.assertIn(b'"Renamed"', misses[1].content)
+        self.assertCache("HIT")
+
+    def test_bulk_write_invalidates(self):
+        self.assertCache("MISS")
+        response = self.client.patch(
+            f"/projects/{self.project.pk}/issues/bulk/", [{"issue_id": self.issue.pk, "status": "C"}], format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCache("MISS")
+        self.assertCache("HIT")
+
+    def test_query_string(self):
+        path = f"/projects/{self.project.pk}/issues/"
+        self.assertCache("MISS", [path])
+        self.assertCache("MISS", [f"{path}?status=TD", f"{path}?fields=title"])
+        self.assertCache("HIT", [path, f"{path}?status=TD", f"{path}?fields=title"])
+
+    def test_shared_by_members_only(self):
+        self.assertCache("MISS")
+        authenticate(self.client, self.contributor)
+        self.assertCache("HIT")
+        authenticate(self.client, self.outsider)
+        for path in self.paths:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 403)
+                self.assertNotIn("X-Cache", response.headers)
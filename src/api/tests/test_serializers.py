@@ -0,0 +1,179 @@
+"""
+The fast path of FastListSerializer must render the same JSON as the serializers it replaces, byte for byte, for
+model instances and for the rows the views fetch with values().
+"""
+import json
+from datetime import datetime, timezone
+
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api import serializers
+from api.fieldsets import parse_selection
+from api.models import Comment, Issue, Project
+from api.tests.base import APITestCase, authenticate, clear_caches
+from benchmarks import data
+
+SIZES = {"users": 8, "projects": 2, "contributors_per_project": 4, "issues": 24, "comments_per_issue": 3}
+
+
+def prepare_dataset():
+    """
+    Generates the dataset of the tests, with issues of every choice of tag, priority and status, and creation times
+    with and without microseconds.
+    """
+    dataset = data.generate(SIZES)
+    issues = list(Issue.objects.filter(project=dataset.project).order_by("issue_id"))
+    for index, issue in enumerate(issues):
+        issue.tag = Issue.Tag.values[index % len(Issue.Tag.values)]
+        issue.priority = Issue.Priority.values[index % len(Issue.Priority.values)]
+        issue.status = Issue.Status.values[index % len(Issue.Status.values)]
+        if index % 5 == 0:
+            issue.created_time = datetime(2022, 1, index + 1, tzinfo=timezone.utc)
+    Issue.objects.bulk_update(issues, ["tag", "priority", "status", "created_time"])
+    return dataset
+
+
+class FastListSerializerTests(TestCase):
+    """Compares the JSON of the list serializers with and without their fast path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = prepare_dataset()
+
+    def render(self, serializer_class, queryset, fast, selection=None):
+        """
+        Returns the JSON of the queryset serialized as a list, with the rows fetched by values() when the fast path
+        supports the serializer, as the views do.
+        """
+        with override_settings(API_FAST_LIST_SERIALIZERS=fast):
+            fields = serializers.get_values_fields(serializer_class, selection)
+            rows = queryset.values(*fields) if fields else queryset.all()
+            kwargs = {} if selection is None else {"selection": selection}
+            return JSONRenderer().render(serializer_class(list(rows), many=True, **kwargs).data)
+
+    def assertSameJSON(self, serializer_class, queryset, selection=None):
+        """Asserts that the fast path renders the queryset exactly as the serializer, and returns the JSON."""
+        rendered = self.render(serializer_class, queryset, False, selection)
+        self.assertEqual(self.render(serializer_class, queryset, True, selection), rendered)
+        # The fast path also serializes model instances, e.g. the nested lists of a detail
+        with override_settings(API_FAST_LIST_SERIALIZERS=True):
+            kwargs = {} if selection is None else {"selection": selection}
+            instances = serializer_class(list(queryset.all()), many=True, **kwargs).data
+        self.assertEqual(JSONRenderer().render(instances), rendered)
+        return rendered
+
+    def test_fast_path_is_used(self):
+        with override_settings(API_FAST_LIST_SERIALIZERS=True):
+            self.assertIsNotNone(serializers.get_values_fields(serializers.IssueListSerializer))
+            self.assertIsNotNone(serializers.get_values_fields(serializers.CommentListSerializer))
+            self.assertIsNotNone(serializers.get_values_fields(serializers.UserIssueSerializer))
+
+    def test_issue_list(self):
+        issues = Issue.objects.filter(project=self.dataset.project).order_by("created_time", "issue_id")
+        self.assertSameJSON(serializers.IssueListSerializer, issues)
+
+    def test_user_issue_list(self):
+        issues = Issue.objects.order_by("created_time", "issue_id")
+        rendered = self.assertSameJSON(serializers.UserIssueSerializer, issues)
+        self.assertIn(b'"created_time":"2022-01-01T00:00:00Z"', rendered)
+
+    def test_comment_list(self):
+        comments = Comment.objects.filter(issue=self.dataset.issue).order_by("created_time", "comment_id")
+        self.assertSameJSON(serializers.CommentListSerializer, comments)
+
+    def test_null_values(self):
+        # The columns of the database are not nullable, the rows of the fast path are built instead
+        issue = Issue(issue_id=1, title="Title", tag=Issue.Tag.BUG, priority=Issue.Priority.LOW, status=None,
+                      author_user_id=1, assignee_user_id=None, project_id=1, created_time=None)
+        with override_settings(API_FAST_LIST_SERIALIZERS=False):
+            rendered = JSONRenderer().render(serializers.UserIssueSerializer([issue], many=True).data)
+        with override_settings(API_FAST_LIST_SERIALIZERS=True):
+            fields = serializers.get_values_fields(serializers.UserIssueSerializer)
+            row = {field: getattr(issue, field) for field in fields}
+            for rows in ([issue], [row]):
+                fast = JSONRenderer().render(serializers.UserIssueSerializer(rows, many=True).data)
+                self.assertEqual(fast, rendered)
+        self.assertIn(b'"assignee_user_id":null', rendered)
+        self.assertIn(b'"created_time":null', rendered)
+
+    def test_sparse_fields(self):
+        issues = Issue.objects.order_by("created_time", "issue_id")
+        for fields in ("title", "status,assignee_user_id", "created_time,priority,tag,issue_id"):
+            with self.subTest(fields=fields):
+                self.assertSameJSON(serializers.UserIssueSerializer, issues, parse_selection(fields))
+
+    def test_expanded_relations(self):
+        issues = Issue.objects.filter(project=self.dataset.project).order_by("created_time", "issue_id")
+        self.assertSameJSON(serializers.IssueListSerializer, issues, parse_selection("title", "assignee"))
+
+    def test_project_detail(self):
+        for selection in (None, parse_selection("title,issues.status,issues.assignee_user_id,users.role")):
+            with self.subTest(selection=selection):
+                kwargs = {} if selection is None else {"selection": selection}
+                project = Project.objects.prefetch_related("issues", "contributors").get(pk=self.dataset.project.pk)
+                with override_settings(API_FAST_LIST_SERIALIZERS=False):
+                    rendered = JSONRenderer().render(serializers.ProjectDetailSerializer(project, **kwargs).data)
+                with override_settings(API_FAST_LIST_SERIALIZERS=True):
+                    fast = JSONRenderer().render(serializers.ProjectDetailSerializer(project, **kwargs).data)
+                self.assertEqual(fast, rendered)
+
+
+class FastListResponseTests(APITestCase):
+    """Compares the responses of the list endpoints with and without the fast path of the list serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = prepare_dataset()
+
+    def setUp(self):
+        super().setUp()
+        authenticate(self.client, self.dataset.user)
+
+    def get(self, path, fast):
+        """Returns the body of a GET request of the path, the response cache being emptied first."""
+        clear_caches()
+        with override_settings(API_FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assertSameResponse(self, path):
+        """Asserts that the fast path returns the same body, and returns the body."""
+        content = self.get(path, False)
+        self.assertEqual(self.get(path, True), content)
+        return content
+
+    def assertSamePages(self, path, pages=3):
+        """
+        Asserts that the fast path returns the same first pages, following the next links of the cursor pagination.
+        """
+        for _ in range(pages - 1):
+            path = json.loads(self.assertSameResponse(path))["next"]
+            self.assertIsNotNone(path)
+        self.assertSameResponse(path)
+
+    def test_issue_pages(self):
+        project = self.dataset.project
+        self.assertSamePages(f"/projects/{project.pk}/issues/?limit=4")
+        self.assertSamePages(f"/projects/{project.pk}/issues/?limit=4&ordering=-created_time")
+        self.assertSameResponse(f"/projects/{project.pk}/issues/?limit=4&offset=4")
+
+    def test_issue_sparse_fields(self):
+        project = self.dataset.project
+        self.assertSamePages(f"/projects/{project.pk}/issues/?limit=4&fields=title,assignee_user_id")
+        self.assertSameResponse(f"/projects/{project.pk}/issues/?limit=4&offset=4&fields=status,priority")
+
+    def test_comment_pages(self):
+        issue = self.dataset.issue
+        self.assertSamePages(f"/projects/{issue.project_id}/issues/{issue.pk}/comments/?limit=1")
+        self.assertSameResponse(f"/projects/{issue.project_id}/issues/{issue.pk}/comments/?limit=1&offset=1")
+
+    def test_user_issue_pages(self):
+        self.assertSamePages("/me/issues/?limit=4")
+        self.assertSamePages("/me/issues/?limit=4&fields=issue_id,created_time")
+
+    def test_project_detail(self):
+        project = self.dataset.project
+        self.assertSameResponse(f"/projects/{project.pk}/")
+        self.assertSameResponse(f"/projects/{project.pk}/?fields=title,issues.title,issues.assignee_user_id")
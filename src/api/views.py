@@ -1,31 +1,58 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import generics
-from rest_framework.permissions import AllowAny
-from rest_framework.viewsets import ModelViewSet
+from django.template.response import SimpleTemplateResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_safe
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework import generics, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotAcceptable, ValidationError
+from rest_framework.pagination import _positive_int
+from rest_framework.mixins import ListModelMixin
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from api.access import accessible_by, aget_project_access, get_project_access, get_member_ids
+from api.export import export_project
+from api.fieldsets import apply_plan, get_prefetch_lookups, get_query_plan, parse_selection
+from api.metrics import export as export_metrics
 from api.models import Project, Issue, Comment, Contributor, CustomUser
-from api.permissions import IsAuthenticatedProjectAuthorOrContributor
+from api.pagination import IssuePagination, UserIssueCursorPagination, CommentPagination, afetch
+from api.cache import bump_project_versions, response_cache
+from api.filters import IssueFilterBackend, UserIssueFilterBackend
+from api.permissions import IsAuthenticatedProjectAuthorOrContributor, get_view_project_access
+from api.replicas import aread_from_replica, read_from_replica
+from api.search import MAX_SEARCH_QUERY_LENGTH, search_project
 from api import serializers
 
 
-class RegisterView(generics.CreateAPIView):
+def count_related(model, field):
     """
-    Class managing the following endpoint:
-    /signup
+    Returns the number of objects of the model whose field references the annotated object, as a subquery counting
+    them through the index of the field, instead of joining and grouping the tables.
     """
-    queryset = CustomUser.objects.all()
-    permission_classes = (AllowAny,)
-    serializer_class = serializers.RegisterSerializer
+    related = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+    return Coalesce(Subquery(related.annotate(count=Count('*')).values('count')), 0)
 
 
-class MyObtainTokenPairView(TokenObtainPairView):
-    """
-    Class managing the following endpoint:
-    /login
-    """
-    permission_classes = (AllowAny,)
-    serializer_class = serializers.MyTokenObtainPairSerializer
+@require_safe
+def metrics_view(request):
+    """Exposes the metrics in the Prometheus text format, without querying the database."""
+    return HttpResponse(export_metrics(), content_type=CONTENT_TYPE_LATEST)
 
 
 class MultipleSerializerMixin:
@@ -33,17 +60,458 @@ class MultipleSerializerMixin:
     Mixin allowing the change of a serializer_class in ViewSets.
     """
     detail_serializer_class = None
+    list_serializer_class = None
 
     def get_serializer_class(self):
         """
-        Replaces standard serializer_class by a detail_serializer_class when viewing an object detail.
+        Replaces standard serializer_class by a detail_serializer_class when viewing an object detail, and by a
+        list_serializer_class when listing objects.
         """
         if self.action == 'retrieve' and self.detail_serializer_class is not None:
             return self.detail_serializer_class
+        if self.action == 'list' and self.list_serializer_class is not None:
+            return self.list_serializer_class
         return super().get_serializer_class()
 
+    def get_field_selection(self):
+        """
+        Returns the fields requested by the fields and expand query parameters of a list or a detail (see
+        api.fieldsets), or None for the default fields.
+        """
+        if self.request.method not in ('GET', 'HEAD') or self.action not in ('list', 'retrieve'):
+            return None
+        return parse_selection(self.request.query_params.get('fields'), self.request.query_params.get('expand'))
+
+    def get_serializer(self, *args, **kwargs):
+        selection = self.get_field_selection()
+        if selection is not None:
+            kwargs['selection'] = selection
+        return super().get_serializer(*args, **kwargs)
+
+    def get_query_plan(self):
+        """
+        Returns the columns and the relations read by the serializer in use for the requested fields.
+        """
+        return get_query_plan(self.get_serializer_class(), self.get_field_selection())
+
+    def get_page_values(self):
+        """
+        Returns the fields to fetch the rows of a listed page with values() instead of model instances, when the
+        fast list serialization is enabled and supported by the serializer (see serializers.FastListSerializer).
+        """
+        if self.action != 'list':
+            return None
+        return serializers.get_values_fields(self.get_serializer_class(), self.get_field_selection())
+
+    def optimize_queryset(self, queryset):
+        """
+        Restricts the queryset to the columns read by the serializer and adds the relations it embeds, so that
+        nested data is fetched with a fixed number of queries. The pages of lists are optimized by optimize_page().
+        """
+        if self.action == 'list':
+            return queryset
+        return apply_plan(queryset, self.get_query_plan())
+
+    def optimize_page(self, page, ordering=()):
+        """
+        Returns the queryset of a listed page restricted to the columns read by the serializer and to the ordering,
+        which the cursors are read from, and fetching the relations it embeds.
+        """
+        return apply_plan(page, self.get_query_plan(), ordering)
+
+
+class ConditionalGetMixin:
+    """
+    Mixin answering GET requests with 304 Not Modified when the project they belong to did not change.
+    The weak ETag and the Last-Modified date are derived from the version of the project, which is fetched by the
+    permission check, so that an unchanged resource is neither queried nor serialized.
+    """
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validators(self, request):
+        """
+        Returns the ETag and the Last-Modified date of the requested resource.
+        """
+        project = get_view_project_access(request, self).project
+        resource = f"{request.get_full_path()}|{request.accepted_renderer.format}"
+        digest = hashlib.md5(resource.encode(), usedforsecurity=False).hexdigest()
+        return f'W/"{project.pk}.{project.version}.{digest}"', project.modified_time
+
+    def init_validators(self, request):
+        """
+        Resolves the validators of the requested resource, if its action supports conditional requests.
+        """
+        self.validators = None
+        if request.method in ('GET', 'HEAD') and self.action in self.conditional_actions:
+            self.validators = self.get_validators(request)
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Resolves the validators of the requested resource once permissions are checked.
+        """
+        super().initial(request, *args, **kwargs)
+        self.init_validators(request)
+
+    async def ainitial(self, request, *args, **kwargs):
+        await super().ainitial(request, *args, **kwargs)
+        self.init_validators(request)
+
+    def handle_conditional_request(self, request):
+        """
+        Returns a 304 Not Modified response if the client's copy of the resource is up to date, else None.
+        """
+        etag, last_modified = self.validators or (None, None)
+        if etag is None:
+            return None
+        return get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+
+    def list(self, request, *args, **kwargs):
+        return self.handle_conditional_request(request) or super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.handle_conditional_request(request) or super().retrieve(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return self.handle_conditional_request(request) or await super().alist(request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return self.handle_conditional_request(request) or await super().aretrieve(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Adds the ETag and Last-Modified headers to successful responses.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'validators', None) and response.status_code in (200, 304):
+            etag, last_modified = self.validators
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Mixin caching the rendered responses of list actions.
+    Responses are keyed on the version of the project, the endpoint, the query parameters and the rendering format,
+    and only requests which passed the permission checks reach the cache, so that a response is shared by all the
+    users allowed to see it.
+    """
+
+    def get_response_cache_key(self, request):
+        """
+        Returns the cache key of the requested list, remembered to cache the response on a miss.
+        """
+        access = get_view_project_access(request, self)
+        self.response_cache_key = response_cache.key(
+            access.project, self.basename, self.action, request.get_full_path(), request.accepted_renderer.format
+        )
+        return self.response_cache_key
+
+    def get_cached_response(self, cached):
+        """
+        Returns the response of a cache hit, or None on a miss.
+        """
+        if cached is None:
+            return None
+        self.response_cache_key = None
+        content, content_type = cached
+        response = HttpResponse(content, content_type=content_type)
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        cached = response_cache.get(self.get_response_cache_key(request))
+        return self.get_cached_response(cached) or super().list(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        cached = await response_cache.aget(self.get_response_cache_key(request))
+        return self.get_cached_response(cached) or await super().alist(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Renders the successful responses of cache misses, to be cached once dispatched.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        self.response_cache_entry = None
+        key = getattr(self, 'response_cache_key', None)
+        if key is not None and response.status_code == 200:
+            response.render()
+            self.response_cache_entry = (key, response.content, response.headers['Content-Type'])
+            response.headers['X-Cache'] = 'MISS'
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if getattr(self, 'response_cache_entry', None):
+            response_cache.set(*self.response_cache_entry)
+        return response
+
+    async def adispatch(self, request, *args, **kwargs):
+        response = await super().adispatch(request, *args, **kwargs)
+        if getattr(self, 'response_cache_entry', None):
+            await response_cache.aset(*self.response_cache_entry)
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Mixin sending the queries of GET and HEAD requests, from the permission checks on, to a read replica once the
+    user is authenticated, unless the user recently wrote (see api.replicas).
+    """
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        if request.method in ('GET', 'HEAD'):
+            read_from_replica(request.user.pk)
+
+    async def aperform_authentication(self, request):
+        await super().aperform_authentication(request)
+        if request.method in ('GET', 'HEAD'):
+            await aread_from_replica(request.user.pk)
+
+
+class AsyncViewMixin:
+    """
+    Mixin serving requests natively when the view is mounted with as_async_view() under ASGI, with the async handler
+    of their method (e.g. apost() for POST requests): the user is authenticated and the permissions are checked in
+    the event loop, awaiting the authenticators and permissions which support it.
+    Requests of other methods, and responses rendered in another format than JSON, are served by the sync view in a
+    thread.
+    """
+    async_renderer_formats = ('json',)
+
+    @classmethod
+    def as_async_view(cls, **initkwargs):
+        """
+        Returns an async view, delegating the requests it does not serve to cls.as_view().
+        """
+        sync_view = sync_to_async(cls.as_view(**initkwargs))
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            return await self.aserve(sync_view, request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.csrf_exempt = True
+        return view
+
+    async def aserve(self, sync_view, request, *args, **kwargs):
+        """
+        Serves the request with adispatch() if it can be served by the async view, else with the sync view.
+        """
+        self.args, self.kwargs = args, kwargs
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        drf_request = self.initialize_request(request, *args, **kwargs)
+        if not self.is_async_request(drf_request):
+            return await sync_view(request, *args, **kwargs)
+        return await self.adispatch(drf_request, *args, **kwargs)
+
+    def is_async_request(self, request):
+        """
+        Can the request be served by the async view?
+        """
+        if not hasattr(self, f'a{request.method.lower()}'):
+            return False
+        try:
+            renderer, media_type = self.perform_content_negotiation(request)
+        except NotAcceptable:
+            return False
+        return renderer.format in self.async_renderer_formats
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async counterpart of dispatch(), given the already initialized request.
+        """
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f'a{request.method.lower()}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.render_response(self.response)
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        Async counterpart of initial().
+        """
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def aperform_authentication(self, request):
+        """
+        Async counterpart of perform_authentication(), awaiting the authenticators which support it.
+        """
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
 
-class ContributorViewset(MultipleSerializerMixin, ModelViewSet):
+        request._not_authenticated()
+
+    async def acheck_permissions(self, request):
+        """
+        Async counterpart of check_permissions(), awaiting the permissions which support it.
+        """
+        for permission in self.get_permissions():
+            if isinstance(permission, AllowAny):
+                continue
+            if hasattr(permission, 'ahas_permission'):
+                has_permission = await permission.ahas_permission(request, self)
+            else:
+                has_permission = await sync_to_async(permission.has_permission)(request, self)
+            if not has_permission:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None)
+                )
+
+    @staticmethod
+    def render_response(response):
+        """
+        Renders a response in the event loop, as a plain HttpResponse which Django does not render again in a thread.
+        """
+        if not isinstance(response, SimpleTemplateResponse):
+            return response
+        response.render()
+        return HttpResponse(response.content, status=response.status_code, headers=response.headers)
+
+
+class AsyncReadMixin(AsyncViewMixin):
+    """
+    Mixin serving the list and retrieve actions of a viewset natively when it is mounted with as_async_view() under
+    ASGI: the user, the access to the project, the page and the objects are fetched with the async ORM, then the
+    serializer runs in the event loop on objects whose relations are already fetched.
+    Other actions, and responses rendered in another format than JSON, are served by the sync viewset in a thread.
+    """
+    async_actions = ('list', 'retrieve')
+
+    @classmethod
+    def as_async_view(cls, actions, **initkwargs):
+        """
+        Returns an async view of the actions, delegating the requests it does not serve to cls.as_view().
+        """
+        sync_view = sync_to_async(cls.as_view(actions, **initkwargs))
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.action_map = dict(actions)
+            if 'get' in actions and 'head' not in actions:
+                self.action_map['head'] = actions['get']
+            for method, action_name in self.action_map.items():
+                setattr(self, method, getattr(self, action_name))
+                if action_name in self.async_actions:
+                    setattr(self, f'a{method}', getattr(self, f'a{action_name}'))
+            return await self.aserve(sync_view, request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        view.csrf_exempt = True
+        return view
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async counterpart of paginate_queryset().
+        """
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        """
+        Async counterpart of get_object().
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(await afetch(queryset), many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class RegisterView(AsyncViewMixin, generics.CreateAPIView):
+    """
+    Class managing the following endpoint:
+    /signup
+    """
+    queryset = CustomUser.objects.all()
+    permission_classes = (AllowAny,)
+    serializer_class = serializers.RegisterSerializer
+
+    async def apost(self, request, *args, **kwargs):
+        """Async counterpart of post(), which does not hold a thread while the password is hashed."""
+        serializer = self.get_serializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        serializer.instance = await serializer.acreate(serializer.validated_data)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+
+class MyObtainTokenPairView(AsyncViewMixin, TokenObtainPairView):
+    """
+    Class managing the following endpoint:
+    /login
+    """
+    permission_classes = (AllowAny,)
+    serializer_class = serializers.MyTokenObtainPairSerializer
+
+    async def apost(self, request, *args, **kwargs):
+        """Async counterpart of post(), which does not hold a thread while the password is checked."""
+        serializer = self.get_serializer(data=request.data)
+        attrs = serializer.to_internal_value(request.data)
+        try:
+            data = await serializer.avalidate(attrs)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ContributorViewset(
+    ConditionalGetMixin, ResponseCacheMixin, ReplicaReadMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     Class managing the following endpoints:
     /projects/:project_id/users/
@@ -58,7 +526,7 @@ class ContributorViewset(MultipleSerializerMixin, ModelViewSet):
         """
         Defines the queryset.
         """
-        return Contributor.objects.filter(project_id=self.kwargs['project_pk'])
+        return self.optimize_queryset(Contributor.objects.filter(project_id=self.kwargs['project_pk']))
 
     def perform_create(self, serializer):
         """
@@ -66,72 +534,305 @@ class ContributorViewset(MultipleSerializerMixin, ModelViewSet):
         Automatically saves the corresponding project and author of the contributor object.
         """
         user = get_object_or_404(CustomUser, pk=serializer._kwargs['data']['user_id'])
-        project = get_object_or_404(Project, pk=self.kwargs['project_pk'])
+        project = get_project_access(self.request, self.kwargs['project_pk']).project
         serializer.save(user=user, project=project)
 
 
-class ProjectViewset(MultipleSerializerMixin, ModelViewSet):
+class ProjectViewset(ConditionalGetMixin, ReplicaReadMixin, AsyncReadMixin, MultipleSerializerMixin, ModelViewSet):
     """
     Class managing the following endpoints:
     /projects
     /projects/:project_id
+    /projects/:project_id/export
+    /projects/:project_id/search
     """
 
     serializer_class = serializers.ProjectListSerializer
     detail_serializer_class = serializers.ProjectDetailSerializer
+    list_serializer_class = serializers.ProjectCountsSerializer
     permission_classes = [IsAuthenticatedProjectAuthorOrContributor]
+    conditional_actions = ('retrieve',)
 
     def get_queryset(self):
         """
-        Defines the queryset.
+        Defines the queryset: the projects the user authors or contributes to, selected by the database.
+        """
+        queryset = Project.objects.filter(accessible_by(self.request.user.pk, project=None)).order_by('project_id')
+        return self.optimize_queryset(queryset)
+
+    def annotate_page(self, page):
+        """
+        Annotates the listed projects with their number of issues and contributors, in the query of the page.
+        The projects of the page are selected by a subquery, so that only their issues and contributors are counted
+        instead of the ones of every project of the user. Counts left out by the fields query parameter are skipped.
+        """
+        counts = {'issues_count': count_related(Issue, 'project'), 'users_count': count_related(Contributor, 'project')}
+        selection = self.get_field_selection()
+        if selection is not None and selection.fields is not None:
+            counts = {name: count for name, count in counts.items() if name in selection.fields}
+        return Project.objects.filter(pk__in=page.values('pk')).annotate(**counts).order_by(*page.query.order_by)
+
+    def get_object(self):
+        """
+        Returns the project already fetched by the permission check instead of querying it again.
+        """
+        project = get_project_access(self.request, self.kwargs['pk']).project
+        self.check_object_permissions(self.request, project)
+        prefetch_related_objects([project], *get_prefetch_lookups(self.get_query_plan()))
+        return project
+
+    async def aget_object(self):
         """
-        return Project.objects.all()
+        Async counterpart of get_object().
+        """
+        project = (await aget_project_access(self.request, self.kwargs['pk'])).project
+        self.check_object_permissions(self.request, project)
+        await sync_to_async(prefetch_related_objects)([project], *get_prefetch_lookups(self.get_query_plan()))
+        return project
 
     def perform_create(self, serializer):
         """
         Defines the creation [POST] of a project.
         Automatically saves the corresponding author of the project.
         """
-        serializer.save(author_user=self.request.user)
+        serializer.save(author_user_id=self.request.user.pk)
+
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Manages the following endpoint:
+        /projects/:project_id/export
+        Streams the project, its contributors, issues and comments as NDJSON.
+        The since query parameter (ISO 8601 date and time) restricts issues and comments to those created after it.
+        """
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({'since': "Expected an ISO 8601 date and time."})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        project = self.get_object()
+        response = StreamingHttpResponse(export_project(project, since), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="project-{project.pk}.ndjson"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def search(self, request, pk=None):
+        """
+        Manages the following endpoint:
+        /projects/:project_id/search/?q=
+        Returns the issues and comments of the project containing every word of q, most relevant first. The limit
+        query parameter sets their number, 20 by default and up to settings.API_MAX_PAGE_SIZE.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': "This query parameter is required."})
+        if len(query) > MAX_SEARCH_QUERY_LENGTH:
+            raise ValidationError({'q': f"Ensure this value has at most {MAX_SEARCH_QUERY_LENGTH} characters."})
+        try:
+            limit = _positive_int(request.query_params.get('limit', 20), strict=True,
+                                  cutoff=settings.API_MAX_PAGE_SIZE)
+        except ValueError:
+            raise ValidationError({'limit': "Expected a positive integer."})
+
+        project = get_project_access(request, pk).project
+        return Response({'results': [result._asdict() for result in search_project(project, query, limit)]})
 
 
-class IssueViewset(MultipleSerializerMixin, ModelViewSet):
+class IssueViewset(
+    ConditionalGetMixin, ResponseCacheMixin, ReplicaReadMixin, AsyncReadMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     Class managing the following endpoints:
     /projects/:project_id/issues
     /projects/:project_id/issues/:issue_id
+    /projects/:project_id/issues/bulk
+    The list is filtered and ordered by the query parameters of api.filters.IssueFilterBackend.
     """
 
     serializer_class = serializers.IssueListSerializer
     detail_serializer_class = serializers.IssueDetailSerializer
     permission_classes = [IsAuthenticatedProjectAuthorOrContributor]
+    pagination_class = IssuePagination
+    filter_backends = [IssueFilterBackend]
 
     def get_queryset(self):
         """
         Defines the queryset.
         """
-        return Issue.objects.filter(project_id=self.kwargs['project_pk'])
+        return self.optimize_queryset(Issue.objects.filter(project_id=self.kwargs['project_pk']))
 
     def perform_create(self, serializer):
         """
         Defines the creation [POST] of an issue.
         Automatically saves the corresponding author and project of the issue.
-        Also assigns the specified assigner user Foreign Key.
+        The assignee user is resolved by the serializer validation.
+        """
+        project = get_project_access(self.request, self.kwargs['project_pk']).project
+        serializer.save(author_user_id=self.request.user.pk, project=project)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, project_pk=None):
+        """
+        Manages the following endpoint:
+        /projects/:project_id/issues/bulk
+        Creates [POST], modifies [PATCH] or deletes [DELETE] up to settings.API_BULK_MAX_ITEMS issues in a single
+        transaction. Every item is validated before any change is made, and the response gives a result per item.
         """
-        assignee_user = get_object_or_404(CustomUser, pk=serializer._kwargs['data']['assignee_user'])
-        project = get_object_or_404(Project, pk=self.kwargs['project_pk'])
-        serializer.save(author_user=self.request.user, assignee_user=assignee_user, project=project)
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError("Expected a list of items.")
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError(f"A bulk request cannot contain more than {settings.API_BULK_MAX_ITEMS} items.")
 
-    def perform_update(self, serializer):
+        project = get_project_access(request, project_pk).project
+        if request.method == 'POST':
+            return self.bulk_create(items, project)
+        if request.method == 'PATCH':
+            return self.bulk_update(items, project)
+        return self.bulk_destroy(items, project)
+
+    def get_bulk_issues(self, items, project, results):
+        """
+        Fetches with a single query the issues targeted by the issue_id of each item.
+        Adds an error to the results of the items whose issue_id is not an integer, whose issue does not exist or is
+        not authored by the user.
+        """
+        issue_ids = [item.get('issue_id') if isinstance(item, dict) else item for item in items]
+        # JSON booleans are Python bools, which isinstance(..., int) would take for the ids 0 and 1
+        valid_ids = [issue_id if type(issue_id) is int else None for issue_id in issue_ids]
+        issues = Issue.objects.filter(
+            project=project, pk__in=[issue_id for issue_id in valid_ids if issue_id is not None]
+        ).in_bulk()
+
+        seen_ids = set()
+        for index, (issue_id, valid_id) in enumerate(zip(issue_ids, valid_ids)):
+            if valid_id is None:
+                results[index] = {
+                    'status': status.HTTP_400_BAD_REQUEST, 'errors': {'issue_id': ["A valid integer is required."]}
+                }
+            elif issue_id not in issues:
+                results[index] = {'status': status.HTTP_404_NOT_FOUND, 'errors': f"Issue {issue_id} not found."}
+            elif issue_id in seen_ids:
+                results[index] = {'status': status.HTTP_400_BAD_REQUEST, 'errors': f"Duplicate issue {issue_id}."}
+            elif issues[issue_id].author_user_id != self.request.user.pk:
+                results[index] = {
+                    'status': status.HTTP_403_FORBIDDEN,
+                    'errors': "You do not have permission to perform this action."
+                }
+            seen_ids.add(valid_id)
+        return [issues.get(issue_id) for issue_id in valid_ids]
+
+    @staticmethod
+    def get_bulk_response(results, success_status):
+        """Returns the per-item results, with a 400 status if any item is invalid."""
+        if any(result['status'] >= 400 for result in results):
+            return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': results}, status=success_status)
+
+    def bulk_create(self, items, project):
+        """Creates the issues with a single insert."""
+        context = {**self.get_serializer_context(), 'member_ids': get_member_ids(project)}
+        item_serializers = [serializers.IssueBulkSerializer(data=item, context=context) for item in items]
+        results = [
+            {'status': status.HTTP_201_CREATED} if serializer.is_valid()
+            else {'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+            for serializer in item_serializers
+        ]
+        if any(result['status'] >= 400 for result in results):
+            return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+        issues = []
+        for serializer in item_serializers:
+            data = dict(serializer.validated_data)
+            data['assignee_user_id'] = data.pop('assignee_user')
+            issues.append(Issue(**data, project=project, author_user_id=self.request.user.pk))
+        with transaction.atomic():
+            issues = Issue.objects.bulk_create(issues)
+            bump_project_versions(pk=project.pk)
+        for result, issue in zip(results, issues):
+            result['data'] = serializers.IssueListSerializer(issue).data
+        return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+    def bulk_update(self, items, project):
+        """Modifies the issues with a single update query per batch."""
+        results = [{'status': status.HTTP_200_OK} for _ in items]
+        issues = self.get_bulk_issues(items, project, results)
+
+        context = {**self.get_serializer_context(), 'member_ids': get_member_ids(project)}
+        item_serializers = []
+        for index, item in enumerate(items):
+            serializer = serializers.IssueBulkSerializer(data=item, context=context, partial=True)
+            item_serializers.append(serializer)
+            if results[index]['status'] == status.HTTP_200_OK and not serializer.is_valid():
+                results[index] = {'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+        if any(result['status'] >= 400 for result in results):
+            return self.get_bulk_response(results, status.HTTP_200_OK)
+
+        fields = set()
+        for issue, serializer in zip(issues, item_serializers):
+            for field, value in serializer.validated_data.items():
+                field = 'assignee_user_id' if field == 'assignee_user' else field
+                setattr(issue, field, value)
+                fields.add(field)
+        if fields:
+            with transaction.atomic():
+                Issue.objects.bulk_update(issues, sorted(fields))
+                bump_project_versions(pk=project.pk)
+        for result, issue in zip(results, issues):
+            result['data'] = serializers.IssueListSerializer(issue).data
+        return self.get_bulk_response(results, status.HTTP_200_OK)
+
+    def bulk_destroy(self, items, project):
+        """Deletes the issues, and their comments, in a single transaction."""
+        results = [{'status': status.HTTP_204_NO_CONTENT} for _ in items]
+        issues = self.get_bulk_issues(items, project, results)
+        if any(result['status'] >= 400 for result in results):
+            return self.get_bulk_response(results, status.HTTP_200_OK)
+
+        with transaction.atomic():
+            Issue.objects.filter(pk__in=[issue.pk for issue in issues]).delete()
+        return self.get_bulk_response(results, status.HTTP_200_OK)
+
+
+class UserIssueViewset(ReplicaReadMixin, AsyncReadMixin, MultipleSerializerMixin, ListModelMixin, GenericViewSet):
+    """
+    Class managing the following endpoint:
+    /me/issues
+    Lists the issues assigned to or authored by the user in every project the user can access, with a single query
+    whose access check is part of the SQL. The list is filtered by status and ordered by the query parameters of
+    api.filters.UserIssueFilterBackend.
+    """
+
+    serializer_class = serializers.UserIssueSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = UserIssueCursorPagination
+    filter_backends = [UserIssueFilterBackend]
+
+    def get_branch_filters(self):
+        """
+        Returns the filters of the issues assigned to and authored by the user, each backed by an index in creation
+        order.
+        """
+        user_pk = self.request.user.pk
+        return [Q(assignee_user_id=user_pk), Q(author_user_id=user_pk)]
+
+    def get_queryset(self):
         """
-        Re-defines the modification [PUT] of an issue.
-        Allows the change of the specified assignee user Foreign Key.
+        Defines the queryset.
         """
-        assignee_user = get_object_or_404(CustomUser, pk=serializer._kwargs['data']['assignee_user'])
-        serializer.save(assignee_user=assignee_user)
+        assigned, authored = self.get_branch_filters()
+        return Issue.objects.filter(assigned | authored, accessible_by(self.request.user.pk))
 
 
-class CommentViewset(MultipleSerializerMixin, ModelViewSet):
+class CommentViewset(
+    ConditionalGetMixin, ResponseCacheMixin, ReplicaReadMixin, AsyncReadMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     Class managing the following endpoints:
     /projects/:project_id/issues/:issue_id/comments
@@ -141,12 +842,15 @@ class CommentViewset(MultipleSerializerMixin, ModelViewSet):
     serializer_class = serializers.CommentListSerializer
     detail_serializer_class = serializers.CommentDetailSerializer
     permission_classes = [IsAuthenticatedProjectAuthorOrContributor]
+    pagination_class = CommentPagination
 
     def get_queryset(self):
         """
         Defines the queryset.
         """
-        return Comment.objects.filter(issue_id=self.kwargs['issue_pk'])
+        return self.optimize_queryset(
+            Comment.objects.filter(issue_id=self.kwargs['issue_pk'], issue__project_id=self.kwargs['project_pk'])
+        )
 
     def perform_create(self, serializer):
         """
@@ -156,6 +860,6 @@ class CommentViewset(MultipleSerializerMixin, ModelViewSet):
         As the description is only shown in a comment details through a 'retrieve' action, description is added to the
         creation process.
         """
-        issue = get_object_or_404(Issue, pk=self.kwargs['issue_pk'])
+        issue = get_object_or_404(Issue, pk=self.kwargs['issue_pk'], project_id=self.kwargs['project_pk'])
         description = serializer._kwargs['data']['description']
-        serializer.save(author_user=self.request.user, issue=issue, description=description)
+        serializer.save(author_user_id=self.request.user.pk, issue=issue, description=description)
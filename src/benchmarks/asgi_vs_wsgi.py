@@ -0,0 +1,158 @@
+"""
+Compares the throughput of an endpoint served by uvicorn under ASGI, with the async views, and under WSGI, with the
+sync views, for increasing numbers of concurrent connections.
+
+Run it from the "src" folder, with the credentials of a user who can access the requested path:
+
+    python -m benchmarks.asgi_vs_wsgi --email user@example.com --password secret --path /projects/1/issues/
+
+Both servers are started by the script on the current database unless --asgi-url or --wsgi-url point to servers
+already running, e.g. a WSGI server like gunicorn.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+
+SERVERS = {
+    "asgi": {"app": "issuetracking.asgi:application", "interface": "asgi3", "env": {"API_ASYNC_VIEWS": "True"}},
+    "wsgi": {"app": "issuetracking.wsgi:application", "interface": "wsgi", "env": {"API_ASYNC_VIEWS": "False"}},
+}
+
+
+def start_server(name, port, workers):
+    """Starts uvicorn serving the ASGI or WSGI application and waits until it accepts requests."""
+    server = SERVERS[name]
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", server["app"],
+            "--interface", server["interface"],
+            "--port", str(port),
+            "--workers", str(workers),
+            "--no-access-log",
+            "--log-level", "warning",
+        ],
+        env={**os.environ, **server["env"]},
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{url}/login/", timeout=1)
+        except urllib.error.HTTPError:
+            return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"The {name} server did not start.")
+
+
+def login(url, email, password):
+    """Returns an access token of the user."""
+    request = urllib.request.Request(
+        f"{url}/login/",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["access"]
+
+
+async def read_response(reader):
+    """Reads an HTTP/1.1 response and returns its status code."""
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(status_line.split()[1])
+
+
+async def client(url, path, token, deadline, latencies, errors):
+    """Sends requests on a keep-alive connection until the deadline, recording their latencies."""
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {parts.netloc}\r\n"
+        f"Authorization: Bearer {token}\r\n"
+        f"Accept: application/json\r\n"
+        f"\r\n"
+    ).encode()
+    try:
+        while time.monotonic() < deadline:
+            start = time.monotonic()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.monotonic() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load(url, path, token, concurrency, duration):
+    """Runs concurrent clients for a duration, returns the latencies of their requests and their error statuses."""
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*[client(url, path, token, deadline, latencies, errors) for _ in range(concurrency)])
+    return latencies, errors
+
+
+def percentile(values, percent):
+    """Returns the percentile of a list of values, in milliseconds."""
+    return statistics.quantiles(values, n=100)[percent - 1] * 1000 if len(values) > 1 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", required=True, help="Email of the user sending the requests.")
+    parser.add_argument("--password", required=True, help="Password of the user.")
+    parser.add_argument("--path", required=True, help="Path of the endpoint, e.g. /projects/1/issues/.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100],
+                        help="Numbers of concurrent connections to measure.")
+    parser.add_argument("--duration", type=float, default=10, help="Duration of each measure, in seconds.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes of each server.")
+    parser.add_argument("--asgi-url", help="URL of an already running ASGI server.")
+    parser.add_argument("--wsgi-url", help="URL of an already running WSGI server.")
+    args = parser.parse_args()
+
+    processes, urls = [], {"asgi": args.asgi_url, "wsgi": args.wsgi_url}
+    try:
+        for port, name in enumerate(SERVERS, start=8101):
+            if urls[name] is None:
+                process, urls[name] = start_server(name, port, args.workers)
+                processes.append(process)
+
+        print(f"{'server':6} {'connections':>11} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for name, url in urls.items():
+            token = login(url, args.email, args.password)
+            for concurrency in args.concurrency:
+                latencies, errors = asyncio.run(load(url, args.path, token, concurrency, args.duration))
+                print(
+                    f"{name:6} {concurrency:>11} {len(latencies) / args.duration:>9.1f} "
+                    f"{percentile(latencies, 50):>8.1f} {percentile(latencies, 95):>8.1f} "
+                    f"{percentile(latencies, 99):>8.1f} {len(errors):>6}"
+                )
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
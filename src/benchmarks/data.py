@@ -0,0 +1,147 @@
+"""
+Deterministic generator of benchmark data: users, projects, contributors, issues and comments inserted with
+bulk_create, from a seeded random generator so that two runs at the same scale build the same dataset.
+"""
+import random
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.models import Comment, Contributor, CustomUser, Issue, Project
+
+
+# Number of rows of each kind, by scale. Issues are spread evenly over the projects.
+SCALES = {
+    "tiny": {"users": 50, "projects": 10, "contributors_per_project": 5, "issues": 1_000, "comments_per_issue": 2},
+    "small": {"users": 500, "projects": 100, "contributors_per_project": 10, "issues": 10_000, "comments_per_issue": 2},
+    "medium": {
+        "users": 5_000, "projects": 1_000, "contributors_per_project": 10, "issues": 100_000, "comments_per_issue": 2,
+    },
+    "large": {
+        "users": 50_000, "projects": 10_000, "contributors_per_project": 10, "issues": 1_000_000,
+        "comments_per_issue": 1,
+    },
+}
+
+PASSWORD = "benchmark-password"
+EMAIL = "user{}@benchmark.test"
+BATCH_SIZE = 5000
+
+
+class Dataset(NamedTuple):
+    """Objects the scenarios of a benchmark read. Scenarios writing objects create their own targets."""
+
+    user: CustomUser
+    other_user: CustomUser
+    project: Project
+    issue: Issue
+    comment: Comment
+    contributor: Contributor
+
+
+def generate(scale, seed=0, stdout=None):
+    """
+    Inserts the data of a scale (a key of SCALES or a dict of the same form) and returns the dataset.
+    The first user authors the first project, which the scenarios run on, and contributes to the other ones.
+    """
+    sizes = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed)
+    # Hashing is slow on purpose, every user shares the same hash
+    password = make_password(PASSWORD)
+
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(email=EMAIL.format(index), first_name=f"First{index}", last_name=f"Last{index}",
+                           password=password)
+                for index in range(sizes["users"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        user_ids = [user.pk for user in users]
+
+        projects = Project.objects.bulk_create(
+            [
+                Project(
+                    title=f"Project {index}",
+                    description=f"Description of project {index}",
+                    type=rng.choice(Project.Type.values),
+                    author_user_id=user_ids[0] if index == 0 else rng.choice(user_ids),
+                )
+                for index in range(sizes["projects"])
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        members = {}
+        contributors = []
+        for project in projects:
+            candidates = [user_id for user_id in user_ids if user_id != project.author_user_id]
+            sample = rng.sample(candidates, min(sizes["contributors_per_project"], len(candidates)))
+            if project.author_user_id != user_ids[0] and user_ids[0] not in sample:
+                sample[0] = user_ids[0]
+            members[project.pk] = [project.author_user_id, *sample]
+            contributors += [
+                Contributor(
+                    project=project,
+                    user_id=user_id,
+                    permission=rng.choice(Contributor.Permission.values),
+                    role=rng.choice(Contributor.Role.values),
+                )
+                for user_id in sample
+            ]
+        Contributor.objects.bulk_create(contributors, batch_size=BATCH_SIZE)
+        if stdout:
+            stdout.write(f"{len(users)} users, {len(projects)} projects, {len(contributors)} contributors")
+
+        issue_count = comment_count = 0
+        while issue_count < sizes["issues"]:
+            batch_size = min(BATCH_SIZE, sizes["issues"] - issue_count)
+            issues = []
+            for index in range(issue_count, issue_count + batch_size):
+                project = projects[index % len(projects)]
+                issues.append(Issue(
+                    title=f"Issue {index}",
+                    description=f"Description of issue {index}",
+                    tag=rng.choice(Issue.Tag.values),
+                    priority=rng.choice(Issue.Priority.values),
+                    status=rng.choice(Issue.Status.values),
+                    project=project,
+                    author_user_id=rng.choice(members[project.pk]),
+                    assignee_user_id=rng.choice(members[project.pk]),
+                ))
+            Issue.objects.bulk_create(issues)
+            issue_count += batch_size
+
+            comments = [
+                Comment(
+                    description=f"Comment {number} of issue {issue.pk}",
+                    issue=issue,
+                    author_user_id=rng.choice(members[issue.project_id]),
+                )
+                for issue in issues for number in range(sizes["comments_per_issue"])
+            ]
+            Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+            comment_count += len(comments)
+            if stdout:
+                stdout.write(f"{issue_count} issues, {comment_count} comments")
+
+    return load()
+
+
+def load():
+    """Returns the dataset of the data already generated in the database, or None."""
+    user = CustomUser.objects.filter(email=EMAIL.format(0)).first()
+    if user is None:
+        return None
+    project = Project.objects.filter(author_user=user).order_by("pk").first()
+    issue = Issue.objects.filter(project=project).order_by("pk").first()
+    return Dataset(
+        user=user,
+        other_user=CustomUser.objects.get(email=EMAIL.format(1)),
+        project=project,
+        issue=issue,
+        comment=Comment.objects.filter(issue=issue).order_by("pk").first(),
+        contributor=Contributor.objects.filter(project=project).order_by("pk").first(),
+    )
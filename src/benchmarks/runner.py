@@ -0,0 +1,285 @@
+"""
+Runs the scenarios of the benchmark with the Django test client, measuring the latency and the number of queries of
+each request, and compares the results with a baseline.
+"""
+import json
+import statistics
+import time
+from typing import Callable, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Comment, Contributor, CustomUser, Issue, Project
+from benchmarks import data
+
+
+class Scenario(NamedTuple):
+    """
+    Request sent at each iteration of a scenario.
+    The path is formatted with the dataset and, for scenarios writing objects, with the target of the iteration,
+    created by targets(dataset, count) before the scenario is timed. The payload is built by
+    payload(dataset, iteration, target).
+    """
+
+    name: str
+    method: str
+    path: str
+    status: int = 200
+    payload: Optional[Callable] = None
+    targets: Optional[Callable] = None
+
+
+def issue_payload(dataset, index, target):
+    return {
+        "title": f"Benchmark issue {index}",
+        "description": "Created by the benchmark",
+        "tag": Issue.Tag.BUG,
+        "priority": Issue.Priority.HIGH,
+        "status": Issue.Status.TO_DO,
+        "assignee_user": dataset.user.pk,
+    }
+
+
+def create_projects(dataset, count):
+    return [
+        project.pk for project in Project.objects.bulk_create([
+            Project(title=f"Target {index}", description="Target", type=Project.Type.BACK_END,
+                    author_user=dataset.user)
+            for index in range(count)
+        ])
+    ]
+
+
+def create_users(dataset, count):
+    offset = CustomUser.objects.count()
+    return [
+        user.pk for user in CustomUser.objects.bulk_create([
+            CustomUser(email=f"target{offset + index}@benchmark.test", first_name="Target", last_name="Target")
+            for index in range(count)
+        ])
+    ]
+
+
+def create_contributors(dataset, count):
+    return [
+        contributor.pk for contributor in Contributor.objects.bulk_create([
+            Contributor(project=dataset.project, user_id=user_id, permission=Contributor.Permission.MEMBER,
+                        role=Contributor.Role.DEVELOPER)
+            for user_id in create_users(dataset, count)
+        ])
+    ]
+
+
+def create_issues(dataset, count):
+    return [
+        issue.pk for issue in Issue.objects.bulk_create([
+            Issue(project=dataset.project, author_user=dataset.user, assignee_user=dataset.user, title="Target",
+                  description="Target", tag=Issue.Tag.TASK, priority=Issue.Priority.LOW, status=Issue.Status.TO_DO)
+            for _ in range(count)
+        ])
+    ]
+
+
+def create_comments(dataset, count):
+    return [
+        comment.pk for comment in Comment.objects.bulk_create([
+            Comment(issue=dataset.issue, author_user=dataset.user, description="Target") for _ in range(count)
+        ])
+    ]
+
+
+# Scenarios covering every route of issuetracking/urls.py, reads first so that writes do not change what they read
+SCENARIOS = [
+    Scenario("project-list", "get", "/projects/"),
+    Scenario("project-detail", "get", "/projects/{project}/"),
+    Scenario(
+        "project-detail-sparse", "get", "/projects/{project}/?fields=project_id,title,issues.issue_id,issues.status"
+    ),
+    Scenario("project-export", "get", "/projects/{project}/export/"),
+    # No issue holds "comment", so the search reads every tier of api.search
+    Scenario("project-search", "get", "/projects/{project}/search/?q=comment"),
+    Scenario("contributor-list", "get", "/projects/{project}/users/"),
+    Scenario("contributor-detail", "get", "/projects/{project}/users/{contributor}/"),
+    Scenario("issue-list", "get", "/projects/{project}/issues/"),
+    Scenario("issue-list-offset", "get", "/projects/{project}/issues/?offset=50&limit=20"),
+    Scenario("issue-list-filtered", "get", "/projects/{project}/issues/?status=TD&ordering=-created_time"),
+    Scenario(
+        "issue-list-assignee", "get",
+        "/projects/{project}/issues/?assignee_user={user}&status__in=TD,IP&created_time__gte=2022-01-01T00:00:00Z",
+    ),
+    Scenario("issue-list-sparse", "get", "/projects/{project}/issues/?fields=issue_id,title,status&expand=assignee"),
+    Scenario("issue-detail", "get", "/projects/{project}/issues/{issue}/"),
+    Scenario("me-issues", "get", "/me/issues/?ordering=-created_time"),
+    Scenario("comment-list", "get", "/projects/{project}/issues/{issue}/comments/"),
+    Scenario("comment-detail", "get", "/projects/{project}/issues/{issue}/comments/{comment}/"),
+    Scenario(
+        "signup", "post", "/signup/", 201,
+        payload=lambda dataset, index, target: {
+            "email": f"signup{index}-{time.monotonic_ns()}@benchmark.test",
+            "first_name": "Signup",
+            "last_name": "Signup",
+            "password": data.PASSWORD,
+            "password_confirmation": data.PASSWORD,
+        },
+    ),
+    Scenario(
+        "login", "post", "/login/",
+        payload=lambda dataset, index, target: {"email": dataset.user.email, "password": data.PASSWORD},
+    ),
+    Scenario(
+        "login-refresh", "post", "/login/refresh/",
+        payload=lambda dataset, index, target: {"refresh": str(RefreshToken.for_user(dataset.user))},
+    ),
+    Scenario(
+        "project-create", "post", "/projects/", 201,
+        payload=lambda dataset, index, target: {"title": f"Project {index}", "description": "New", "type": "BE"},
+    ),
+    Scenario(
+        "project-update", "put", "/projects/{target}/",
+        payload=lambda dataset, index, target: {"title": f"Project {index}", "description": "Edit", "type": "FE"},
+        targets=create_projects,
+    ),
+    Scenario(
+        "contributor-create", "post", "/projects/{project}/users/", 201,
+        payload=lambda dataset, index, target: {"user_id": target, "permission": "M", "role": "T"},
+        targets=create_users,
+    ),
+    Scenario(
+        "issue-create", "post", "/projects/{project}/issues/", 201,
+        payload=issue_payload,
+    ),
+    Scenario(
+        "issue-update", "put", "/projects/{project}/issues/{target}/",
+        payload=issue_payload,
+        targets=create_issues,
+    ),
+    Scenario(
+        "issue-bulk-create", "post", "/projects/{project}/issues/bulk/", 201,
+        payload=lambda dataset, index, target: [issue_payload(dataset, index, target) for _ in range(20)],
+    ),
+    Scenario(
+        "comment-create", "post", "/projects/{project}/issues/{issue}/comments/", 201,
+        payload=lambda dataset, index, target: {"description": f"Comment {index}"},
+    ),
+    Scenario(
+        "comment-update", "put", "/projects/{project}/issues/{issue}/comments/{target}/",
+        payload=lambda dataset, index, target: {"description": f"Updated {index}"},
+        targets=create_comments,
+    ),
+    Scenario("comment-delete", "delete", "/projects/{project}/issues/{issue}/comments/{target}/", 204,
+             targets=create_comments),
+    Scenario("issue-delete", "delete", "/projects/{project}/issues/{target}/", 204, targets=create_issues),
+    Scenario("contributor-delete", "delete", "/projects/{project}/users/{target}/", 204,
+             targets=create_contributors),
+    Scenario("project-delete", "delete", "/projects/{target}/", 204, targets=create_projects),
+]
+
+
+class BenchmarkFailure(Exception):
+    """Raised when a request of a scenario does not return the expected status."""
+
+
+def run_scenario(scenario, dataset, iterations):
+    """Runs the iterations of a scenario and returns their statistics."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(dataset.user).access_token}")
+    targets = scenario.targets(dataset, iterations) if scenario.targets else [None] * iterations
+
+    latencies, query_counts = [], []
+    for index in range(iterations):
+        path = scenario.path.format(
+            user=dataset.user.pk,
+            project=dataset.project.pk,
+            issue=dataset.issue.pk,
+            comment=dataset.comment.pk,
+            contributor=dataset.contributor.pk,
+            target=targets[index],
+        )
+        payload = scenario.payload(dataset, index, targets[index]) if scenario.payload else None
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, scenario.method)(path, payload, format="json")
+            if response.streaming:
+                b"".join(response.streaming_content)
+            latencies.append(time.perf_counter() - start)
+        query_counts.append(len(queries))
+
+        if response.status_code != scenario.status:
+            raise BenchmarkFailure(
+                f"{scenario.name}: {scenario.method.upper()} {path} returned {response.status_code} instead of "
+                f"{scenario.status}: {response.content[:500]!r}"
+            )
+
+    return {
+        "requests": iterations,
+        "p50": round(percentile(latencies, 50), 2),
+        "p95": round(percentile(latencies, 95), 2),
+        "p99": round(percentile(latencies, 99), 2),
+        "rps": round(iterations / sum(latencies), 1),
+        "queries": round(statistics.mean(query_counts), 2),
+    }
+
+
+def percentile(latencies, percent):
+    """Returns a percentile of latencies, in milliseconds."""
+    if len(latencies) == 1:
+        return latencies[0] * 1000
+    return statistics.quantiles(latencies, n=100, method="inclusive")[percent - 1] * 1000
+
+
+def run(dataset, iterations, names=None):
+    """Runs the scenarios, all of them or the given ones, and returns their statistics by name."""
+    for alias in (settings.MEMBERSHIP_CACHE_ALIAS, settings.RESPONSE_CACHE_ALIAS):
+        caches[alias].clear()
+    return {
+        scenario.name: run_scenario(scenario, dataset, iterations)
+        for scenario in SCENARIOS if names is None or scenario.name in names
+    }
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Returns the regressions of the results against the baseline: scenarios running more queries per request, or
+    whose p95 latency exceeds the one of the baseline by more than the tolerance (0.25 for 25%) and by more than
+    min_delta milliseconds, so that the noise of the fastest scenarios is not reported.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']:.1f} queries per request instead of {expected['queries']:.1f}"
+            )
+        if result["p95"] - expected["p95"] > max(expected["p95"] * tolerance, min_delta):
+            regressions.append(f"{name}: p95 of {result['p95']:.1f}ms instead of {expected['p95']:.1f}ms")
+    return regressions
+
+
+def read_baseline(path):
+    """Returns the content of a baseline file, or None if it does not exist."""
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def write_baseline(path, scale, iterations, results):
+    """
+    Stores results as the baseline of a scale. The results of the other scenarios of a baseline of the same scale
+    are kept.
+    """
+    baseline = read_baseline(path)
+    if baseline is not None and baseline["scale"] == scale:
+        results = {**baseline["results"], **results}
+    with open(path, "w") as file:
+        json.dump({"scale": scale, "iterations": iterations, "results": results}, file, indent=2, sort_keys=True)
+        file.write("\n")
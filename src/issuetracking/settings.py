@@ -15,6 +15,8 @@ from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -49,6 +51,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.instrumentation_middleware",
+    "api.middleware.compression_middleware",
+    "api.replicas.replica_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,13 +87,125 @@ WSGI_APPLICATION = "issuetracking.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Database profile: sqlite (a file next to the project by default) or postgresql
+DATABASE_ENGINE = os.getenv("DATABASE_ENGINE", "sqlite")
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DATABASE_NAME", "issuetracking"),
+            "USER": os.getenv("DATABASE_USER", ""),
+            "PASSWORD": os.getenv("DATABASE_PASSWORD", ""),
+            "HOST": os.getenv("DATABASE_HOST", ""),
+            "PORT": os.getenv("DATABASE_PORT", ""),
+            # Keeps the connection of each thread open between requests, checking it before reusing it
+            "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            # A pooler in transaction mode (e.g. PgBouncer) can hand each transaction to another server connection,
+            # which cannot keep the server-side cursors of the exports open
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DATABASE_POOLER", "False").lower() in ("true", "1"),
+        }
     }
+elif DATABASE_ENGINE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 0)),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_ENGINE {DATABASE_ENGINE!r}, expected sqlite or postgresql.")
+
+# Read replicas of the default database, comma separated: paths of SQLite files, or hosts of PostgreSQL servers. The
+# reads of the GET and HEAD requests of the API are sent to one of them (see api.replicas).
+_DATABASE_REPLICA_LOCATIONS = [location for location in os.getenv("DATABASE_REPLICAS", "").split(",") if location]
+
+DATABASE_REPLICAS = []
+for _index, _location in enumerate(_DATABASE_REPLICA_LOCATIONS, 1):
+    _location_key = "HOST" if DATABASE_ENGINE == "postgresql" else "NAME"
+    DATABASES[f"replica{_index}"] = {**DATABASES["default"], _location_key: _location, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica{_index}")
+
+DATABASE_ROUTERS = ["api.replicas.ReplicaRouter"]
+
+# Seconds during which the reads of a user stay on the primary after a write, longer than the lag of the replicas
+DATABASE_READ_AFTER_WRITE_WINDOW = int(os.getenv("DATABASE_READ_AFTER_WRITE_WINDOW", 5))
+
+# Pragmas run on every SQLite connection by api.database. Writers wait up to busy_timeout milliseconds for the lock
+# instead of failing with "database is locked". cache_size is in KiB when negative, per connection.
+# The journal mode is written into the database file, so it is only changed when SQLITE_JOURNAL_MODE is set, e.g. to
+# WAL, whose write-ahead log lets readers run during a write. With WAL, synchronous=NORMAL makes a commit only wait for
+# the log to be written, not for the database; with the default rollback journal, FULL keeps the database safe from a
+# power loss.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE")
+SQLITE_PRAGMAS = {
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+    **({"journal_mode": SQLITE_JOURNAL_MODE} if SQLITE_JOURNAL_MODE else {}),
+    "synchronous": os.getenv(
+        "SQLITE_SYNCHRONOUS", "NORMAL" if (SQLITE_JOURNAL_MODE or "").upper() == "WAL" else "FULL"
+    ),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64 * 1024)),
+}
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+# The membership and response caches default to an in-process LRU cache. Deployments running several worker processes
+# should switch the membership cache to a shared backend (file based or a cache server) so that invalidations reach
+# every worker.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "membership": {
+        "BACKEND": os.getenv("MEMBERSHIP_CACHE_BACKEND", "api.cache.LRUCache"),
+        "LOCATION": os.getenv("MEMBERSHIP_CACHE_LOCATION", "membership"),
+        "TIMEOUT": int(os.getenv("MEMBERSHIP_CACHE_TIMEOUT", 300)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("MEMBERSHIP_CACHE_MAX_ENTRIES", 10000)),
+        },
+    },
+    "responses": {
+        "BACKEND": os.getenv("RESPONSE_CACHE_BACKEND", "api.cache.LRUCache"),
+        "LOCATION": os.getenv("RESPONSE_CACHE_LOCATION", "responses"),
+        "TIMEOUT": int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1000)),
+        },
+    },
+    # Users who recently wrote, whose reads stay on the primary. Use a shared backend with several worker processes.
+    "replication": {
+        "BACKEND": os.getenv("REPLICATION_CACHE_BACKEND", "api.cache.LRUCache"),
+        "LOCATION": os.getenv("REPLICATION_CACHE_LOCATION", "replication"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("REPLICATION_CACHE_MAX_ENTRIES", 10000)),
+        },
+    },
+    # Shared by the workers of the server, so that a revocation applies to all of them
+    "denylist": {
+        "BACKEND": os.getenv("TOKEN_DENYLIST_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+        "LOCATION": os.getenv("TOKEN_DENYLIST_CACHE_LOCATION", BASE_DIR / ".token-denylist"),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("TOKEN_DENYLIST_CACHE_MAX_ENTRIES", 100000)),
+        },
+    },
 }
 
+MEMBERSHIP_CACHE_ALIAS = "membership"
+
+REPLICATION_CACHE_ALIAS = "replication"
+
+RESPONSE_CACHE_ALIAS = "responses"
+
+TOKEN_DENYLIST_CACHE_ALIAS = "denylist"
+
+# Responses larger than this size, in bytes, are not cached
+RESPONSE_CACHE_MAX_ITEM_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_ITEM_SIZE", 256 * 1024))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -108,6 +225,42 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.1/topics/auth/passwords/
+
+# Hasher of the new passwords: pbkdf2, scrypt or argon2 (which needs the argon2-cffi package). Passwords hashed by
+# another hasher or with another cost are still checked, and hashed again on the next login.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+
+_PASSWORD_HASHERS = {
+    "pbkdf2": "api.hashers.PBKDF2PasswordHasher",
+    "scrypt": "api.hashers.ScryptPasswordHasher",
+    "argon2": "api.hashers.Argon2PasswordHasher",
+}
+
+if PASSWORD_HASHER not in _PASSWORD_HASHERS:
+    raise ImproperlyConfigured(
+        f"Unknown PASSWORD_HASHER {PASSWORD_HASHER!r}, expected {', '.join(_PASSWORD_HASHERS)}."
+    )
+
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+]
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 390000))
+
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv("PASSWORD_SCRYPT_WORK_FACTOR", 2 ** 14))
+
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", 2))
+
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", 102400))
+
+# Number of threads of each process hashing passwords, 0 to hash them in the thread of the request
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", max((os.cpu_count() or 1) // 2, 1)))
+
+AUTHENTICATION_BACKENDS = ["api.backends.ModelBackend"]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
@@ -134,15 +287,83 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = 'api.CustomUser'
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OffsetPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'api.authentication.AsyncJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.TimedJSONRenderer',
+        'api.renderers.TimedBrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+# Library encoding and decoding the JSON of the API and of the exports: orjson, ujson, json (the standard library) or
+# auto, the first one installed in this order
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "auto")
+
+# Compress the responses with brotli (when the brotli package is installed) or gzip, as accepted by the client
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "True").lower() in ("true", "1")
+
+# Responses smaller than this size, in bytes, are not compressed. Streamed responses are always compressed.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+# Largest page size clients can request on paginated endpoints supporting the limit query parameter
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 100))
+
+# Largest number of items a bulk request can contain
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", 500))
+
+# Serialize the pages of the lists of projects, contributors, issues and comments from rows fetched with values()
+# instead of running the serializer fields on model instances
+API_FAST_LIST_SERIALIZERS = os.getenv("API_FAST_LIST_SERIALIZERS", "False").lower() in ("true", "1")
+
+# Number of rows fetched at once by the server-side cursors of project exports
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Serve the list and retrieve endpoints of projects, issues and comments with async views, when run under ASGI
+API_ASYNC_VIEWS = os.getenv("API_ASYNC_VIEWS", "False").lower() in ("true", "1")
+
+# Expose the /metrics endpoint and count and time every request in its metrics. The endpoint is not authenticated, so
+# it is disabled unless enabled explicitly, on a server whose /metrics path only the Prometheus scraper can reach
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").lower() in ("true", "1")
+
+# Fraction of the requests whose queries and timings are measured, between 0 (none) and 1 (all)
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv("INSTRUMENTATION_SAMPLE_RATE", 0))
+
+# Number of queries above which a measured request is logged as a warning
+INSTRUMENTATION_QUERY_BUDGET = int(os.getenv("INSTRUMENTATION_QUERY_BUDGET", 10))
+
+# Number of runs of the same SQL statement from which a measured request is logged as a warning (N+1 queries)
+INSTRUMENTATION_REPEATED_QUERY_THRESHOLD = int(os.getenv("INSTRUMENTATION_REPEATED_QUERY_THRESHOLD", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.instrumentation": {
+            "handlers": ["console"],
+            "level": os.getenv("INSTRUMENTATION_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
 }
 
 SIMPLE_JWT = {
     'USER_ID_FIELD': 'user_id',
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_REFRESH_SERIALIZER': 'api.serializers.MyTokenRefreshSerializer',
 }
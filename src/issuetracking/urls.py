@@ -13,8 +13,9 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import URLPattern, path, include
 from rest_framework_nested import routers
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -22,6 +23,7 @@ from api import views
 
 router = routers.SimpleRouter()
 router.register(r'projects', views.ProjectViewset, basename="project")
+router.register(r'me/issues', views.UserIssueViewset, basename="me-issues")
 
 projects_router = routers.NestedSimpleRouter(router, r'projects', lookup='project')
 projects_router.register(r'issues', views.IssueViewset, basename='project-issues')
@@ -32,13 +34,39 @@ users_router.register(r'users', views.ContributorViewset, basename='project-user
 issues_router = routers.NestedSimpleRouter(projects_router, r'issues', lookup='issue')
 issues_router.register(r'comments', views.CommentViewset, basename='issue-comments')
 
+
+def mount_async_views(urls):
+    """
+    Replaces the views of the viewsets and views which support it by their async view when settings.API_ASYNC_VIEWS
+    is set.
+    """
+    if not settings.API_ASYNC_VIEWS:
+        return urls
+    return [mount_async_view(url) if hasattr(url.callback.cls, 'as_async_view') else url for url in urls]
+
+
+def mount_async_view(url):
+    """Returns the URL pattern of a view replaced by its async view."""
+    callback = url.callback
+    if hasattr(callback, 'actions'):
+        view = callback.cls.as_async_view(callback.actions, **callback.initkwargs)
+    else:
+        view = callback.cls.as_async_view(**callback.initkwargs)
+    return URLPattern(url.pattern, view, url.default_args, url.name)
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path('signup/', views.RegisterView.as_view(), name='signup'),
-    path('login/', views.MyObtainTokenPairView.as_view(), name='token_obtain_pair'),
+    *mount_async_views([
+        path('signup/', views.RegisterView.as_view(), name='signup'),
+        path('login/', views.MyObtainTokenPairView.as_view(), name='token_obtain_pair'),
+    ]),
     path('login/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path(r'', include(router.urls)),
-    path(r'', include(projects_router.urls)),
-    path(r'', include(users_router.urls)),
-    path(r'', include(issues_router.urls))
+    path(r'', include(mount_async_views(router.urls))),
+    path(r'', include(mount_async_views(projects_router.urls))),
+    path(r'', include(mount_async_views(users_router.urls))),
+    path(r'', include(mount_async_views(issues_router.urls)))
 ]
+
+if settings.METRICS_ENABLED:
+    urlpatterns.append(path('metrics', views.metrics_view, name='metrics'))